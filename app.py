@@ -1,11 +1,33 @@
 # app.py
-from cv_extractor import extract_cv_text
+# Heavy libraries (google-genai, python-docx, fpdf2, Pillow, pdfplumber, numpy) are
+# loaded on first use, not at the top: after a cold start the sidebar is up
+# before they are, and preload_libraries() fetches them in the background.
+#
+# With BEWERBUNGSBOT_SERVICE_URL set, the app is a thin client: extraction,
+# generation and rendering run as jobs in service.py (see service_client.py).
+import importlib
+import threading
+from contextlib import closing
 import streamlit as st
-import tempfile
 import os
 from models import UserProfile
-from generator import generate_cv, generate_cover_letter
-from document_builder import create_cv_document, create_cover_letter_document
+
+SERVICE_MODE = bool(os.getenv("BEWERBUNGSBOT_SERVICE_URL"))
+if SERVICE_MODE:
+    from service_client import (
+        ServiceError, extract_cv_text, generate_cv, generate_application,
+        generate_cv_stream, generate_cover_letter_stream, generate_application_stream
+    )
+else:
+    from cv_extractor import extract_cv_text
+    from generator import (
+        response_cache_stats, cv_prompt_token_report, generate_cv, generate_application,
+        generate_cv_stream, generate_cover_letter_stream, generate_application_stream
+    )
+from document_model import (
+    parse_cv_text, parse_cover_letter_text, cv_document_from_generated, cv_text_from_generated
+)
+import metrics
 
 
 
@@ -15,6 +37,104 @@ st.set_page_config(
     layout="wide"
 )
 
+
+# Stage timings of this script run; kept for the debug panel if it did real work
+trace = metrics.start_trace("app")
+
+# BEWERBUNGSBOT_DEBUG=1 shows the stage breakdown of the last request below the documents
+DEBUG_PANEL = os.getenv("BEWERBUNGSBOT_DEBUG") == "1"
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server(port: int):
+    """Prometheus endpoint (GET /metrics) on METRICS_PORT — once per process, not per session."""
+    return metrics.serve(port)
+
+
+if os.getenv("METRICS_PORT"):
+    start_metrics_server(int(os.getenv("METRICS_PORT")))
+
+
+# In service mode Gemini and the document builders only run in service.py
+PRELOADED_MODULES = (
+    ("match_score", "photo", "httpx") if SERVICE_MODE
+    else ("match_score", "google.genai", "document_builder", "pdf_builder", "photo")
+)
+
+
+@st.cache_resource(show_spinner=False)
+def preload_libraries() -> threading.Thread:
+    """
+    Imports the lazily loaded libraries in a background thread, once per
+    process, so the first click doesn't wait for them either.
+    """
+    def import_all():
+        for name in PRELOADED_MODULES:
+            importlib.import_module(name)
+
+    thread = threading.Thread(target=import_all, name="preload-libraries", daemon=True)
+    thread.start()
+    return thread
+
+
+def stream_previews(slots: dict, tagged_chunks) -> dict:
+    """
+    Shows Gemini's output in the preview expanders while it is being written
+    (time-to-first-token instead of a 20 s spinner).
+
+    slots: {"cv": st.empty(), ...} — one preview slot per document
+    tagged_chunks: (key, chunk) pairs in arrival order
+    returns: {key: full text, or the "❌" error message if generation failed}
+    """
+    parts = {key: [] for key in slots}
+    errors = {}
+    live_texts = {}
+    for key, slot in slots.items():
+        with slot.container():
+            with st.expander("👁️ Preview (raw text)", expanded=True):
+                live_texts[key] = st.empty()
+
+    # A rerun can interrupt this loop: close the stream so its Gemini slots are freed now
+    with closing(tagged_chunks):
+        for key, chunk in tagged_chunks:
+            if key in errors:
+                continue
+            if chunk.startswith("❌"):
+                errors[key] = chunk
+                continue
+            parts[key].append(chunk)
+            live_texts[key].text("".join(parts[key]))
+
+    return {
+        key: errors.get(key) or "".join(parts[key]) or "❌ Gemini hat keinen Text zurückgegeben."
+        for key in slots
+    }
+
+
+def stream_preview(slot, chunks) -> str:
+    """Single-document version of stream_previews."""
+    with closing(chunks):
+        return stream_previews({"doc": slot}, (("doc", chunk) for chunk in chunks))["doc"]
+
+
+def store_generated(key: str, text) -> None:
+    """
+    Keeps the generated text (for the preview) and its parsed document
+    model (for the .docx) in session state — parsed once, rendered on
+    every rerun. key: "cv" or "cover_letter"; a CV from JSON mode
+    (GeneratedCV) is converted without any parsing.
+    """
+    if key == "cv" and not isinstance(text, str):
+        st.session_state["cv_text"] = cv_text_from_generated(text)
+        st.session_state["cv_doc"] = cv_document_from_generated(text)
+    elif key == "cv":
+        st.session_state["cv_text"] = text
+        st.session_state["cv_doc"] = parse_cv_text(text)
+    else:
+        st.session_state["cl_text"] = text
+        st.session_state["cl_doc"] = parse_cover_letter_text(text)
+
+
 st.title("🏗️ BewerbungsBot AEC")
 st.caption("Professional German application documents for the AEC industry — powered by Gemini AI")
 
@@ -89,18 +209,36 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("📄 CV (Lebenslauf)")
     generate_cv_btn = st.button("🚀 Generate CV", use_container_width=True, type="primary")
+    cv_preview_slot = st.empty()
 
 with col2:
     st.subheader("✉️ Cover Letter (Anschreiben)")
     generate_cl_btn = st.button("🚀 Generate Cover Letter", use_container_width=True, type="primary")
+    cl_preview_slot = st.empty()
+
+generate_both_btn = st.button("🚀 Generate CV + Cover Letter", use_container_width=True)
+
+regenerate = st.checkbox(
+    "🔄 Regenerate (ignore cached results)",
+    value=False,
+    help="Identical inputs are answered from the cache. Tick this to ask Gemini for a fresh version."
+)
+structured = st.checkbox(
+    "🧩 Structured CV (JSON mode)",
+    value=False,
+    help="Gemini fills a fixed CV schema instead of writing formatted text. No live preview while it writes."
+)
 
 
 # --- PHOTO HANDLING ---
-photo_path = None
+# Cropped + downsampled once per distinct upload, then served from memory
+photo = None
 if uploaded_photo is not None:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-        tmp.write(uploaded_photo.read())
-        photo_path = tmp.name
+    from photo import prepare_photo
+    try:
+        photo = prepare_photo(uploaded_photo.getvalue())
+    except ValueError as e:
+        st.warning(str(e))
 
 # --- UPLOADED FILE TEXT PLACEHOLDERS ---
 cv_extracted_text = None
@@ -139,6 +277,22 @@ profile = UserProfile(
     cover_letter_extracted_text=cl_extracted_text
 )
 
+if job_ad_text.strip():
+    from match_score import match_score  # numpy + the keyword regex, ~0.2 s on first import
+    keyword_match = match_score(profile)
+    st.sidebar.metric("🎯 Keyword match", f"{keyword_match.score:.0f} %")
+    if keyword_match.missing:
+        st.sidebar.caption("Missing from your profile: " + ", ".join(keyword_match.missing[:10]))
+
+# In service mode the CV prompt is built (and trimmed) in service.py
+if cv_extracted_text and job_ad_text.strip() and not SERVICE_MODE:
+    token_report = cv_prompt_token_report(profile)
+    if token_report["tokens_after"] < token_report["tokens_before"]:
+        st.sidebar.caption(
+            f"✂️ CV prompt trimmed to the most relevant entries: "
+            f"~{token_report['tokens_before']:,} → ~{token_report['tokens_after']:,} tokens"
+        )
+
 
 # ─────────────────────────────────────────────
 # CV GENERATION
@@ -148,33 +302,17 @@ if generate_cv_btn:
         st.error("❌ Please paste a job advertisement before generating.")
     else:
         with st.spinner("⏳ Gemini is generating your CV..."):
-            cv_text = generate_cv(profile)
+            if structured:
+                cv = generate_cv(profile, regenerate=regenerate, structured=True)
+            else:
+                cv = stream_preview(cv_preview_slot, generate_cv_stream(profile, regenerate=regenerate))
 
-        if cv_text.startswith("❌"):
-            st.error(cv_text)
+        if isinstance(cv, str) and cv.startswith("❌"):
+            st.error(cv)
         else:
-            st.session_state["cv_text"] = cv_text
+            store_generated("cv", cv)
             st.success("✅ CV generated successfully!")
 
-if "cv_text" in st.session_state:
-    with col1:
-        with st.expander("👁️ Preview (raw text)", expanded=False):
-            st.text(st.session_state["cv_text"][:1000] + "...")
-
-        cv_buffer = create_cv_document(
-            st.session_state["cv_text"],
-            profile.full_name,
-            photo_path=photo_path
-        )
-
-        st.download_button(
-            label="⬇️ Download CV as .docx",
-            data=cv_buffer,
-            file_name=f"Lebenslauf_{profile.full_name.replace(' ', '_')}.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            use_container_width=True
-        )
-
 
 # ─────────────────────────────────────────────
 # COVER LETTER GENERATION
@@ -184,35 +322,170 @@ if generate_cl_btn:
         st.error("❌ Please paste a job advertisement before generating.")
     else:
         with st.spinner("⏳ Gemini is writing your cover letter..."):
-            cl_text = generate_cover_letter(profile)
+            cl_text = stream_preview(cl_preview_slot, generate_cover_letter_stream(profile, regenerate=regenerate))
 
         if cl_text.startswith("❌"):
             st.error(cl_text)
         else:
-            st.session_state["cl_text"] = cl_text
+            store_generated("cover_letter", cl_text)
             st.success("✅ Cover letter generated successfully!")
 
-if "cl_text" in st.session_state:
-    with col2:
-        with st.expander("👁️ Preview (raw text)", expanded=False):
-            st.text(st.session_state["cl_text"][:1000] + "...")
 
-        cl_buffer = create_cover_letter_document(
-            st.session_state["cl_text"],
-            profile.full_name
-        )
+# ─────────────────────────────────────────────
+# BOTH AT ONCE — the two requests run concurrently,
+# so the wait is the slower call, not the sum of both
+# ─────────────────────────────────────────────
+if generate_both_btn:
+    if not job_ad_text.strip():
+        st.error("❌ Please paste a job advertisement before generating.")
+    else:
+        with st.spinner("⏳ Gemini is writing your CV and cover letter..."):
+            if structured:
+                cv, cl_text = generate_application(profile, regenerate=regenerate, structured=True)
+                texts = {"cv": cv, "cover_letter": cl_text}
+            else:
+                texts = stream_previews(
+                    {"cv": cv_preview_slot, "cover_letter": cl_preview_slot},
+                    generate_application_stream(profile, regenerate=regenerate)
+                )
+
+        for key, label in (("cv", "CV"), ("cover_letter", "Cover letter")):
+            if isinstance(texts[key], str) and texts[key].startswith("❌"):
+                st.error(texts[key])
+            else:
+                store_generated(key, texts[key])
+                st.success(f"✅ {label} generated successfully!")
+
 
-        st.download_button(
-            label="⬇️ Download Cover Letter as .docx",
-            data=cl_buffer,
-            file_name=f"Anschreiben_{profile.full_name.replace(' ', '_')}.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            use_container_width=True
+# ─────────────────────────────────────────────
+# DOCUMENTS — preview + download
+# ─────────────────────────────────────────────
+if ("cv_doc" in st.session_state or "cl_doc" in st.session_state) and SERVICE_MODE:
+    from service_client import (
+        cv_document_bytes, cover_letter_document_bytes, create_application_documents,
+        cv_pdf_bytes, cover_letter_pdf_bytes
+    )
+elif "cv_doc" in st.session_state or "cl_doc" in st.session_state:
+    from document_builder import cv_document_bytes, cover_letter_document_bytes, create_application_documents
+    from pdf_builder import cv_pdf_bytes, cover_letter_pdf_bytes
+
+# Rendering in service.py can fail (service down, slow, overloaded); the
+# local builders raise only on bugs, which should stay tracebacks
+RENDER_ERRORS = (ServiceError,) if SERVICE_MODE else ()
+
+# (docx, pdf) per document; None when it wasn't generated or couldn't be rendered
+cv_files = cl_files = None
+render_error = None
+try:
+    cv_buffer = cl_buffer = None
+    if "cv_text" in st.session_state and "cl_text" in st.session_state:
+        cv_buffer, cl_buffer = create_application_documents(
+            st.session_state["cv_doc"],
+            st.session_state["cl_doc"],
+            profile.full_name,
+            photo=photo
         )
+    if "cv_text" in st.session_state:
+        if cv_buffer is None:
+            cv_buffer = cv_document_bytes(
+                st.session_state["cv_doc"],
+                profile.full_name,
+                photo=photo
+            )
+        cv_files = (cv_buffer, cv_pdf_bytes(st.session_state["cv_doc"], profile.full_name, photo=photo))
+    if "cl_text" in st.session_state:
+        if cl_buffer is None:
+            cl_buffer = cover_letter_document_bytes(
+                st.session_state["cl_doc"],
+                profile.full_name
+            )
+        cl_files = (cl_buffer, cover_letter_pdf_bytes(st.session_state["cl_doc"], profile.full_name))
+except RENDER_ERRORS as e:
+    render_error = e
+
+if "cv_text" in st.session_state:
+    with col1:
+        with cv_preview_slot.container():
+            with st.expander("👁️ Preview (raw text)", expanded=generate_cv_btn or generate_both_btn):
+                st.text(st.session_state["cv_text"][:1000] + "...")
+
+        if cv_files is not None:
+            st.download_button(
+                label="⬇️ Download CV as .docx",
+                data=cv_files[0],
+                file_name=f"Lebenslauf_{profile.full_name.replace(' ', '_')}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True
+            )
+            st.download_button(
+                label="⬇️ Download CV as PDF",
+                data=cv_files[1],
+                file_name=f"Lebenslauf_{profile.full_name.replace(' ', '_')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+
+if "cl_text" in st.session_state:
+    with col2:
+        with cl_preview_slot.container():
+            with st.expander("👁️ Preview (raw text)", expanded=generate_cl_btn or generate_both_btn):
+                st.text(st.session_state["cl_text"][:1000] + "...")
+
+        if cl_files is not None:
+            st.download_button(
+                label="⬇️ Download Cover Letter as .docx",
+                data=cl_files[0],
+                file_name=f"Anschreiben_{profile.full_name.replace(' ', '_')}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True
+            )
+            st.download_button(
+                label="⬇️ Download Cover Letter as PDF",
+                data=cl_files[1],
+                file_name=f"Anschreiben_{profile.full_name.replace(' ', '_')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+
+if render_error is not None:
+    st.error(f"❌ Documents could not be rendered — please try again in a moment. ({render_error})")
 
 
 # ─────────────────────────────────────────────
 # FOOTER
 # ─────────────────────────────────────────────
 st.divider()
+# The response cache lives in service.py in service mode, not in this process
+cache_stats = {"hits": 0, "misses": 0} if SERVICE_MODE else response_cache_stats()
+if cache_stats["hits"] or cache_stats["misses"]:
+    st.caption(
+        f"⚡ Gemini cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+        f"— {cache_stats['saved_seconds']} s of generation time saved"
+    )
 st.caption("BewerbungsBot AEC • Powered by Google Gemini • Built with Python + Streamlit")
+
+# Generation or a fresh extraction counts as a request; plain reruns don't
+if generate_cv_btn or generate_cl_btn or generate_both_btn or trace.has("extract_cv_text"):
+    metrics.finish_trace(trace)
+    st.session_state["last_trace"] = trace
+
+if DEBUG_PANEL and "last_trace" in st.session_state:
+    with st.expander("🔧 Debug — last request"):
+        last_trace = st.session_state["last_trace"]
+        stage_summary = metrics.STAGE_SECONDS.summary()
+        rows = ["| Stage | ms | process p50 | process p95 | n |", "|---|---:|---:|---:|---:|"]
+        for stage, seconds in last_trace.stages:
+            process = stage_summary.get((stage,), {})
+            rows.append(
+                f"| {stage} | {seconds * 1000:.0f} | ≤ {process.get('p50', 0) * 1000:.0f} "
+                f"| ≤ {process.get('p95', 0) * 1000:.0f} | {process.get('count', 0)} |"
+            )
+        st.markdown("\n".join(rows))
+        st.caption(
+            f"Gemini tokens: {last_trace.tokens['prompt']:,} prompt / {last_trace.tokens['output']:,} output "
+            f"— process total {metrics.GEMINI_TOKENS.value(kind='prompt'):,.0f} / "
+            f"{metrics.GEMINI_TOKENS.value(kind='output'):,.0f}"
+        )
+
+# Last, so the first render of a cold process isn't held up by it
+preload_libraries()
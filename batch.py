@@ -0,0 +1,330 @@
+# batch.py
+# Batch generation: one base profile, many job ads — no Streamlit needed.
+#
+#   python batch.py --profile profile.json --jobs stellen/ --out bewerbungen/
+#
+# profile.json: UserProfile fields (name, contact, education, skills ...);
+#               the job-specific fields come from each job ad.
+# --jobs:       a directory of job ads (*.txt = plain ad text, *.json = job
+#               record) or a JSONL file with one job record per line.
+#               Job record: {"id", "job_ad_text", "target_job_title",
+#                            "target_company", "job_reference_number"}
+#
+# Every CV and cover letter is an independent task. Tasks run on a bounded
+# thread pool, share a requests-per-minute budget, retry 429/5xx answers
+# with exponential backoff (gemini_client.py), and are written to <out>/<job id>/ together
+# with <out>/manifest.json. Rerunning skips documents that already exist.
+# --dry-run output goes to <out>/dry-run/, so it never counts as done.
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from pydantic import BaseModel
+
+from models import UserProfile
+from match_score import JobAdIndex, profile_vector
+from generator import build_cv_prompt, build_cover_letter_prompt, generate_text
+from gemini_client import configure as configure_gemini
+from document_builder import create_cv_document, create_cover_letter_document
+from photo import prepare_photo
+import metrics
+
+MANIFEST_NAME = "manifest.json"
+# --dry-run writes here, below --out, with its own manifest
+DRY_RUN_DIR = "dry-run"
+
+
+class BatchJob(BaseModel):
+    id: str
+    job_ad_text: str
+    target_job_title: Optional[str] = None
+    target_company: Optional[str] = None
+    job_reference_number: Optional[str] = None
+
+
+class RateLimiter:
+    """
+    Spaces requests evenly so no more than requests_per_minute start in any
+    minute, no matter how many threads are asking. Thread-safe.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ─────────────────────────────────────────────
+# INPUT
+# ─────────────────────────────────────────────
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9ÄÖÜäöüß_-]+", "_", text).strip("_") or "job"
+
+
+def load_jobs(path: str) -> list[BatchJob]:
+    """Reads job ads from a directory (*.txt / *.json) or a JSONL file."""
+    jobs = []
+    if os.path.isdir(path):
+        for filename in sorted(os.listdir(path)):
+            file_path = os.path.join(path, filename)
+            stem, extension = os.path.splitext(filename)
+            if extension == ".txt":
+                with open(file_path, encoding="utf-8") as f:
+                    jobs.append(BatchJob(id=stem, job_ad_text=f.read()))
+            elif extension == ".json":
+                with open(file_path, encoding="utf-8") as f:
+                    jobs.append(BatchJob(**{"id": stem, **json.load(f)}))
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    jobs.append(BatchJob(**{"id": f"job-{line_number:04d}", **json.loads(line)}))
+
+    seen = set()
+    for job in jobs:
+        job.id = _slug(job.id)
+        if job.id in seen:
+            raise ValueError(f"Doppelte Job-ID: {job.id}")
+        seen.add(job.id)
+    return jobs
+
+
+def profile_for_job(base_profile: dict, job: BatchJob) -> UserProfile:
+    """Base profile + the job-specific fields of one ad."""
+    fields = dict(base_profile)
+    fields["job_ad_text"] = job.job_ad_text
+    for key in ("target_job_title", "target_company", "job_reference_number"):
+        if getattr(job, key):
+            fields[key] = getattr(job, key)
+    return UserProfile(**fields)
+
+
+# ─────────────────────────────────────────────
+# OUTPUT
+# ─────────────────────────────────────────────
+def _write_atomic(path: str, data: bytes) -> None:
+    # A half-written file must never count as "done" on the next run
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class Manifest:
+    """<out>/manifest.json — per job and document: status, file, timing, error."""
+
+    def __init__(self, out_dir: str):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.jobs = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.jobs = json.load(f).get("jobs", {})
+
+    def record(self, job: BatchJob, **fields) -> None:
+        """Updates the job's entry, e.g. record(job, cv={...}) or record(job, match_score=71.5)."""
+        with self._lock:
+            job_entry = self.jobs.setdefault(job.id, {})
+            job_entry["target_job_title"] = job.target_job_title
+            job_entry["target_company"] = job.target_company
+            job_entry.update(fields)
+            payload = {"updated": time.strftime("%Y-%m-%dT%H:%M:%S"), "jobs": self.jobs}
+            _write_atomic(self.path, json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+# ─────────────────────────────────────────────
+# ENGINE
+# ─────────────────────────────────────────────
+DOCUMENTS = {
+    # document key: (file prefix, prompt builder, docx builder)
+    "cv": ("Lebenslauf", build_cv_prompt, create_cv_document),
+    "cover_letter": ("Anschreiben", build_cover_letter_prompt, create_cover_letter_document),
+}
+
+
+def _generate_with_retry(prompt: str, limiter: RateLimiter, max_retries: int,
+                         regenerate: bool, gemini_client) -> tuple[str, int]:
+    """Returns (text, attempts); attempts is 0 for a cached answer. Every attempt waits for the rate limiter."""
+    attempts = 0
+
+    def before_attempt(attempt: int) -> None:
+        nonlocal attempts
+        attempts = attempt
+        limiter.acquire()
+
+    text = generate_text(prompt, regenerate=regenerate, gemini_client=gemini_client,
+                         max_retries=max_retries, on_attempt=before_attempt)
+    return text, attempts
+
+
+def _run_task(job: BatchJob, document: str, profile: UserProfile, out_path: str,
+              limiter: RateLimiter, max_retries: int, regenerate: bool,
+              gemini_client, photo: Optional[bytes]) -> dict:
+    _, build_prompt, build_document = DOCUMENTS[document]
+    trace = metrics.start_trace(f"{job.id} {document}")
+    start = time.perf_counter()
+    try:
+        text, attempts = _generate_with_retry(
+            build_prompt(profile), limiter, max_retries, regenerate, gemini_client
+        )
+        if not text:
+            raise ValueError("Gemini hat keinen Text zurückgegeben")
+        if document == "cv":
+            buffer = build_document(text, profile.full_name, photo=photo)
+        else:
+            buffer = build_document(text, profile.full_name)
+        _write_atomic(out_path, buffer.getvalue())
+    except Exception as e:
+        return {"status": "failed", "error": str(e), "seconds": round(time.perf_counter() - start, 2)}
+    finally:
+        metrics.finish_trace(trace)
+    return {
+        "status": "done",
+        "file": os.path.relpath(out_path, os.path.dirname(os.path.dirname(out_path))),
+        "attempts": attempts,
+        "seconds": round(time.perf_counter() - start, 2),
+        "tokens": dict(trace.tokens),
+    }
+
+
+def run_batch(base_profile: dict, jobs: list[BatchJob], out_dir: str,
+              concurrency: int = 4, requests_per_minute: float = 10,
+              max_retries: int = 5, regenerate: bool = False,
+              gemini_client=None, photo: Optional[bytes] = None,
+              progress=print) -> dict:
+    """
+    Generates CV + cover letter for every job and writes them to out_dir.
+
+    base_profile: UserProfile fields shared by all applications
+    concurrency: max. documents in flight at once
+    requests_per_minute: Gemini request budget shared by all workers
+    regenerate: redo documents that already exist (and skip the response cache)
+    gemini_client: e.g. fake_gemini.FakeClient() — defaults to the real client
+    photo: CV header photo, prepared once (photo.prepare_photo) for all jobs
+    returns: the manifest's job entries
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = Manifest(out_dir)
+    limiter = RateLimiter(requests_per_minute)
+
+    # Keyword coverage of every ad by the profile — one batched computation
+    if jobs:
+        scores = JobAdIndex([job.job_ad_text for job in jobs]).scores(
+            profile_vector(profile_for_job(base_profile, jobs[0]))
+        )
+        for job, score in zip(jobs, scores):
+            manifest.record(job, match_score=round(float(score), 1))
+
+    tasks = []
+    for job in jobs:
+        profile = profile_for_job(base_profile, job)
+        job_dir = os.path.join(out_dir, job.id)
+        os.makedirs(job_dir, exist_ok=True)
+        for document, (prefix, _, _) in DOCUMENTS.items():
+            out_path = os.path.join(job_dir, f"{prefix}_{profile.full_name.replace(' ', '_')}.docx")
+            if os.path.exists(out_path) and not regenerate:
+                progress(f"⏭️  {job.id} {document}: exists, skipped")
+                continue
+            tasks.append((job, document, profile, out_path))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(_run_task, job, document, profile, out_path, limiter,
+                        max_retries, regenerate, gemini_client, photo): (job, document)
+            for job, document, profile, out_path in tasks
+        }
+        for future in as_completed(futures):
+            job, document = futures[future]
+            entry = future.result()
+            manifest.record(job, **{document: entry})
+            if entry["status"] == "done":
+                progress(f"✅ {job.id} {document}: {entry['seconds']} s, {entry['attempts']} attempt(s)")
+            else:
+                progress(f"❌ {job.id} {document}: {entry['error']}")
+
+    return manifest.jobs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Batch-generate applications for many job ads")
+    arg_parser.add_argument("--profile", required=True, help="JSON file with UserProfile fields")
+    arg_parser.add_argument("--jobs", required=True, help="directory of job ads or JSONL file")
+    arg_parser.add_argument("--out", required=True, help="output directory")
+    arg_parser.add_argument("--cv", help="existing CV (PDF/DOCX) to extract experience from")
+    arg_parser.add_argument("--photo", help="profile photo for the CV header")
+    arg_parser.add_argument("--concurrency", type=int, default=4)
+    arg_parser.add_argument("--rpm", type=float, default=10, help="Gemini requests per minute")
+    arg_parser.add_argument("--retries", type=int, default=5)
+    arg_parser.add_argument("--regenerate", action="store_true", help="redo existing documents")
+    arg_parser.add_argument("--dry-run", action="store_true",
+                            help="use the local fake Gemini client instead of the API; "
+                                 "writes to <out>/dry-run/")
+    args = arg_parser.parse_args()
+
+    with open(args.profile, encoding="utf-8") as f:
+        base_profile = json.load(f)
+
+    if args.cv:
+        from cv_extractor import extract_text
+        with open(args.cv, "rb") as f:
+            base_profile["cv_extracted_text"] = extract_text(f.read(), args.cv)
+
+    # Fail fast on an invalid profile instead of once per job
+    profile_for_job(base_profile, BatchJob(id="check", job_ad_text="-",
+                                           target_job_title="-", target_company="-"))
+
+    photo = None
+    if args.photo:
+        with open(args.photo, "rb") as f:
+            photo = prepare_photo(f.read())
+
+    # The worker pool is the concurrency limit of this process
+    configure_gemini(max_concurrency=args.concurrency)
+
+    gemini_client = None
+    out_dir = args.out
+    if args.dry_run:
+        from fake_gemini import FakeClient
+        gemini_client = FakeClient()
+        # Placeholder documents must never count as finished for a real run
+        out_dir = os.path.join(args.out, DRY_RUN_DIR)
+
+    jobs = load_jobs(args.jobs)
+    print(f"📋 {len(jobs)} job ads → {out_dir}")
+    results = run_batch(
+        base_profile, jobs, out_dir,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        max_retries=args.retries,
+        regenerate=args.regenerate,
+        gemini_client=gemini_client,
+        photo=photo,
+    )
+    for (stage,), summary in sorted(metrics.STAGE_SECONDS.summary().items()):
+        print(f"⏱️  {stage}: {summary['count']}× — mean {summary['mean'] * 1000:.0f} ms, "
+              f"p95 ≤ {summary['p95'] * 1000:.0f} ms")
+    failed = [job_id for job_id, entry in results.items()
+              if any(isinstance(doc, dict) and doc.get("status") == "failed" for doc in entry.values())]
+    print(f"🏁 {len(results) - len(failed)}/{len(results)} jobs complete"
+          + (f" — failed: {', '.join(failed)}" if failed else ""))
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+# benchmarks/
+# Standalone performance scripts. Run from the project root, e.g.
+#   python -m benchmarks.pdf_extraction
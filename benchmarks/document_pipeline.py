@@ -0,0 +1,46 @@
+# benchmarks/document_pipeline.py
+# The document pipeline stage by stage, for CVs of growing length:
+#   parse  — document_model.parse_cv_text (once per generation)
+#   render — document_builder.build_cv_document from the parsed model
+#   save   — serializing the .docx
+#   key    — memo key of the parsed model (paid on every rerun)
+#
+# Usage:  python -m benchmarks.document_pipeline [--entries 5 12 40] [--repeats 20]
+
+import argparse
+import io
+import time
+
+from benchmarks.fixtures import sample_cv_text
+from document_builder import build_cv_document
+from document_model import document_hash, parse_cv_text
+
+
+def best_ms(repeats: int, fn) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parse / render / save timings of the CV pipeline")
+    arg_parser.add_argument("--entries", type=int, nargs="+", default=[5, 12, 40])
+    arg_parser.add_argument("--repeats", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    print(f"best of {args.repeats}")
+    print(f"{'entries':>7}  {'parse ms':>8}  {'render ms':>9}  {'save ms':>8}  {'key ms':>7}")
+    for n_entries in args.entries:
+        cv_text = sample_cv_text(n_entries)
+        parse_ms, cv = best_ms(args.repeats, lambda: parse_cv_text(cv_text))
+        render_ms, doc = best_ms(args.repeats, lambda: build_cv_document(cv, "Max Mustermann"))
+        save_ms, _ = best_ms(args.repeats, lambda: doc.save(io.BytesIO()))
+        key_ms, _ = best_ms(args.repeats, lambda: document_hash(cv))
+        print(f"{n_entries:>7}  {parse_ms:>8.2f}  {render_ms:>9.2f}  {save_ms:>8.2f}  {key_ms:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/docx_extraction.py
+# DOCX text extraction for CVs of growing length:
+#   python-docx — the previous approach: Document(...) object model, then
+#                 all paragraphs, then all tables
+#   iterparse   — cv_extractor.extract_text_from_docx, one streaming pass
+#                 over word/document.xml
+# Reported: best-of time, peak Python memory (tracemalloc) and the share
+# of python-docx's output lines that the streaming pass also finds.
+#
+# Usage:  python -m benchmarks.docx_extraction [--entries 40 200 1000] [--repeats 5] [--file cv.docx ...]
+
+import argparse
+import io
+import time
+import tracemalloc
+
+from benchmarks.fixtures import sample_cv_docx
+from cv_extractor import extract_text_from_docx
+
+
+def python_docx_text(file_bytes: bytes) -> str:
+    from docx import Document
+
+    doc = Document(io.BytesIO(file_bytes))
+    chunks = [para.text for para in doc.paragraphs if para.text.strip()]
+    for table in doc.tables:
+        for row in table.rows:
+            cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+            if cells:
+                chunks.append(" | ".join(cells))
+    return "\n".join(chunks)
+
+
+def best_ms(repeats: int, fn) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def peak_kb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="python-docx vs. streaming DOCX text extraction")
+    arg_parser.add_argument("--entries", type=int, nargs="+", default=[40, 200, 1000])
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    arg_parser.add_argument("--file", nargs="*", default=[], help="real .docx files to include")
+    args = arg_parser.parse_args()
+
+    fixtures = [(f"{n} entries", sample_cv_docx(n)) for n in args.entries]
+    for path in args.file:
+        with open(path, "rb") as f:
+            fixtures.append((path, f.read()))
+
+    python_docx_text(fixtures[0][1])  # warm-up: imports
+    print(f"best of {args.repeats}")
+    print(f"{'document':>14}  {'KB':>6}  {'python-docx ms':>14}  {'iterparse ms':>12}  "
+          f"{'python-docx peak KB':>19}  {'iterparse peak KB':>17}  {'lines found':>11}")
+    for label, file_bytes in fixtures:
+        old_ms, old_text = best_ms(args.repeats, lambda: python_docx_text(file_bytes))
+        new_ms, new_text = best_ms(args.repeats, lambda: extract_text_from_docx(file_bytes))
+        old_peak = peak_kb(lambda: python_docx_text(file_bytes))
+        new_peak = peak_kb(lambda: extract_text_from_docx(file_bytes))
+        new_lines = set(new_text.splitlines())
+        old_lines = [line for line in old_text.splitlines() if line.strip()]
+        found = 100 * sum(line in new_lines for line in old_lines) / max(len(old_lines), 1)
+        print(f"{label[-14:]:>14}  {len(file_bytes) / 1024:>6.0f}  {old_ms:>14.1f}  {new_ms:>12.1f}  "
+              f"{old_peak:>19.0f}  {new_peak:>17.0f}  {found:>10.0f}%")
+
+
+if __name__ == "__main__":
+    main()
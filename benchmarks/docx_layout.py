@@ -0,0 +1,56 @@
+# benchmarks/docx_layout.py
+# CV layout modes of document_builder on a long synthetic CV:
+#   per_entry — one 1x2 table per "date | content" line, per-cell border XML
+#   table     — one table per section, borders from a single table style
+# Reports build time, save time, number of tables and document.xml size.
+#
+# Usage:  python -m benchmarks.docx_layout [--entries 40] [--repeats 5]
+
+import argparse
+import io
+import time
+import zipfile
+
+from benchmarks.fixtures import sample_cv_text
+from document_builder import CV_LAYOUTS, build_cv_document
+
+
+def measure(cv_text: str, layout: str, repeats: int) -> dict:
+    build_ms, save_ms = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        doc = build_cv_document(cv_text, "Max Mustermann", layout=layout)
+        built = time.perf_counter()
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        build_ms.append((built - start) * 1000)
+        save_ms.append((time.perf_counter() - built) * 1000)
+
+    with zipfile.ZipFile(buffer) as docx:
+        xml_size = docx.getinfo("word/document.xml").file_size
+    return {
+        "build_ms": min(build_ms),
+        "save_ms": min(save_ms),
+        "tables": len(doc.tables),
+        "xml_kb": xml_size / 1024,
+        "docx_kb": buffer.tell() / 1024,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="CV layout modes: build/save time and size")
+    arg_parser.add_argument("--entries", type=int, default=40)
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    cv_text = sample_cv_text(args.entries)
+    print(f"CV: {args.entries} entries, {len(cv_text)} characters (best of {args.repeats})")
+    print(f"{'layout':>9}  {'build ms':>9}  {'save ms':>8}  {'tables':>6}  {'document.xml KB':>15}  {'.docx KB':>8}")
+    for layout in reversed(CV_LAYOUTS):
+        r = measure(cv_text, layout, args.repeats)
+        print(f"{layout:>9}  {r['build_ms']:>9.1f}  {r['save_ms']:>8.1f}  {r['tables']:>6}"
+              f"  {r['xml_kb']:>15.1f}  {r['docx_kb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/docx_render.py
+# Document rendering cost per Streamlit rerun. Every widget click reruns
+# app.py, which used to rebuild both .docx files from scratch each time.
+#   rebuild  — create_cv_document + create_cover_letter_document every rerun
+#   memoized — cv_document_bytes + cover_letter_document_bytes (first rerun
+#              renders, the rest are cache hits)
+#
+# Usage:  python -m benchmarks.docx_render [--entries 12] [--reruns 20]
+
+import argparse
+import time
+
+from benchmarks.fixtures import sample_cv_text
+from document_builder import (
+    create_cv_document, create_cover_letter_document,
+    cv_document_bytes, cover_letter_document_bytes, _rendered_documents,
+)
+
+COVER_LETTER = "\n\n".join([
+    "Sehr geehrte Damen und Herren,",
+    "mit großem Interesse habe ich Ihre Ausschreibung als BIM-Koordinator gelesen. "
+    "In den letzten Jahren habe ich Fachmodelle nach ISO 19650 koordiniert, "
+    "Kollisionsprüfungen geleitet und BIM-Abwicklungspläne aufgesetzt.",
+    "Besonders reizt mich an Ihrem Haus die Verbindung von Planung und Ausführung. "
+    "Meine Erfahrung mit Revit, Solibri und Dynamo bringe ich gern in Ihr Team ein.",
+    "Über eine Einladung zu einem persönlichen Gespräch freue ich mich sehr.",
+    "Mit freundlichen Grüßen",
+])
+
+
+def per_rerun(reruns: int, render) -> tuple[float, float]:
+    """Returns (first rerun ms, mean ms of the following reruns)."""
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    rest = timings[1:] or timings
+    return timings[0], sum(rest) / len(rest)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Document render time per rerun")
+    arg_parser.add_argument("--entries", type=int, default=12, help="CV entries (12 ≈ two pages)")
+    arg_parser.add_argument("--reruns", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    cv_text = sample_cv_text(args.entries)
+    full_name = "Max Mustermann"
+
+    def rebuild():
+        create_cv_document(cv_text, full_name).getvalue()
+        create_cover_letter_document(COVER_LETTER, full_name).getvalue()
+
+    def memoized():
+        cv_document_bytes(cv_text, full_name)
+        cover_letter_document_bytes(COVER_LETTER, full_name)
+
+    _rendered_documents.clear()
+    print(f"CV: {args.entries} entries, {len(cv_text)} characters; {args.reruns} reruns")
+    print(f"{'variant':>9}  {'first ms':>9}  {'rerun ms':>9}")
+    for name, render in (("rebuild", rebuild), ("memoized", memoized)):
+        first, rest = per_rerun(args.reruns, render)
+        print(f"{name:>9}  {first:>9.2f}  {rest:>9.3f}")
+    print(f"cache: {len(_rendered_documents)} documents, {_rendered_documents.size_bytes / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# benchmarks/end_to_end.py
+# The whole pipeline of one application, with fake_gemini.FakeClient in
+# place of the API (deterministic answers, --latency seconds per call):
+#   extract_pdf / extract_docx   — cv_extractor on generated uploads (uncached)
+#   build_cv_prompt / build_cover_letter_prompt
+#   gemini_cv / gemini_cover_letter — generator.generate_text, regenerate=True
+#   create_cv_document / create_cover_letter_document — .docx, saved
+#   end_to_end                   — all of the above for one applicant
+# For small / medium / large uploads and each stage: p50 / p95 / mean ms,
+# ops/s and peak memory. Memory is measured with tracemalloc (Python
+# allocations only) in a separate pass, so tracing doesn't slow down the
+# timed runs. Throughput: --applicants pipelines on --concurrency threads.
+#
+# --out writes the results as JSON (with commit, Python and arguments);
+# --compare diffs a run against such a file and exits with status 1 when a
+# stage got slower or hungrier than --threshold percent, e.g. in CI:
+#   python -m benchmarks.end_to_end --out base.json          # on main
+#   python -m benchmarks.end_to_end --compare base.json      # on the branch
+#
+# Usage:  python -m benchmarks.end_to_end [--sizes small medium large] [--repeats 5]
+#                                         [--latency 0.05] [--concurrency 4] [--applicants 16]
+#                                         [--out results.json] [--compare baseline.json]
+#                                         [--threshold 15] [--min-ms 1]
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.fixtures import sample_cv_docx, sample_cv_pdf, sample_profile
+from cv_extractor import extract_text_from_docx, extract_text_from_pdf
+from document_builder import create_cover_letter_document, create_cv_document
+from fake_gemini import FakeClient
+from generator import build_cover_letter_prompt, build_cv_prompt, generate_text
+
+# PDF pages, DOCX entries, positions in the fake CV answer
+SIZES = {
+    "small": (2, 5, 4),
+    "medium": (6, 12, 10),
+    "large": (20, 40, 30),
+}
+
+STAGES = (
+    "extract_pdf", "extract_docx", "build_cv_prompt", "build_cover_letter_prompt",
+    "gemini_cv", "gemini_cover_letter", "create_cv_document", "create_cover_letter_document",
+)
+
+# Memory changes below this are noise (allocator, interned strings), not regressions
+MIN_COMPARE_KB = 256
+
+
+def run_application(fixture: dict, fake: FakeClient, run_stage) -> None:
+    """One applicant through all STAGES; run_stage(stage, fn, *args, **kwargs) calls fn and measures it."""
+    cv_upload_text = run_stage("extract_pdf", extract_text_from_pdf, fixture["pdf"])
+    run_stage("extract_docx", extract_text_from_docx, fixture["docx"])
+    profile = sample_profile(cv_extracted_text=cv_upload_text)
+
+    cv_prompt = run_stage("build_cv_prompt", build_cv_prompt, profile)
+    cl_prompt = run_stage("build_cover_letter_prompt", build_cover_letter_prompt, profile)
+
+    cv_text = run_stage("gemini_cv", generate_text, cv_prompt, regenerate=True, gemini_client=fake)
+    cl_text = run_stage("gemini_cover_letter", generate_text, cl_prompt, regenerate=True, gemini_client=fake)
+
+    run_stage("create_cv_document", create_cv_document, cv_text, profile.full_name)
+    run_stage("create_cover_letter_document", create_cover_letter_document, cl_text, profile.full_name)
+
+
+def plain_stage(stage, fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def time_stages(fixture: dict, fake: FakeClient, repeats: int) -> dict[str, list[float]]:
+    """Milliseconds per stage and run, plus "end_to_end"."""
+    timings = {stage: [] for stage in STAGES + ("end_to_end",)}
+
+    def timed_stage(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage].append((time.perf_counter() - start) * 1000)
+        return result
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run_application(fixture, fake, timed_stage)
+        timings["end_to_end"].append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def peak_memory_kb(fixture: dict, fake: FakeClient) -> dict[str, float]:
+    """Peak traced allocation per stage above what was allocated before it, in KB."""
+    peaks = {}
+
+    def traced_stage(stage, fn, *args, **kwargs):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn(*args, **kwargs)
+        peaks[stage] = (tracemalloc.get_traced_memory()[1] - before) / 1024
+        return result
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        run_application(fixture, fake, traced_stage)
+        peaks["end_to_end"] = (tracemalloc.get_traced_memory()[1] - before) / 1024
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def throughput(fixture: dict, fake: FakeClient, applicants: int, concurrency: int) -> dict:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: run_application(fixture, fake, plain_stage), range(applicants)))
+    seconds = time.perf_counter() - start
+    return {"applicants": applicants, "concurrency": concurrency,
+            "seconds": round(seconds, 3), "applications_per_s": round(applicants / seconds, 2)}
+
+
+def benchmark_size(size: str, args) -> dict:
+    pdf_pages, docx_entries, cv_entries = SIZES[size]
+    fixture = {"pdf": sample_cv_pdf(pdf_pages), "docx": sample_cv_docx(docx_entries)}
+    fake = FakeClient(latency=args.latency, cv_entries=cv_entries)
+
+    run_application(fixture, fake, plain_stage)  # warm-up: lazy imports, template, compiled regexes
+    timings = time_stages(fixture, fake, args.repeats)
+    peaks = peak_memory_kb(fixture, fake)
+
+    stages = {}
+    for stage, values in timings.items():
+        mean = statistics.mean(values)
+        stages[stage] = {
+            "p50_ms": round(statistics.median(values), 3),
+            "p95_ms": round(percentile(values, 0.95), 3),
+            "mean_ms": round(mean, 3),
+            "ops_per_s": round(1000 / mean, 2) if mean else None,
+            "peak_kb": round(peaks[stage], 1),
+        }
+    return {
+        "fixture": {"pdf_pages": pdf_pages, "pdf_kb": round(len(fixture["pdf"]) / 1024, 1),
+                    "docx_entries": docx_entries, "docx_kb": round(len(fixture["docx"]) / 1024, 1),
+                    "cv_entries": cv_entries},
+        "stages": stages,
+        "throughput": throughput(fixture, fake, args.applicants, args.concurrency),
+    }
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict) -> None:
+    for size, result in results.items():
+        fixture = result["fixture"]
+        print(f"\n{size}: PDF {fixture['pdf_pages']} pages ({fixture['pdf_kb']:.0f} KB), "
+              f"DOCX {fixture['docx_entries']} entries ({fixture['docx_kb']:.0f} KB), "
+              f"fake CV {fixture['cv_entries']} positions")
+        print(f"  {'stage':<29}  {'p50 ms':>8}  {'p95 ms':>8}  {'mean ms':>8}  {'ops/s':>8}  {'peak KB':>8}")
+        for stage, row in result["stages"].items():
+            print(f"  {stage:<29}  {row['p50_ms']:>8.2f}  {row['p95_ms']:>8.2f}  {row['mean_ms']:>8.2f}  "
+                  f"{row['ops_per_s']:>8.1f}  {row['peak_kb']:>8.0f}")
+        rate = result["throughput"]
+        print(f"  throughput: {rate['applicants']} applicants on {rate['concurrency']} threads in "
+              f"{rate['seconds']:.2f} s → {rate['applications_per_s']:.1f} applications/s")
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_ms: float) -> list[str]:
+    """Prints the change per stage against the baseline; returns the regressions."""
+    regressions = []
+    print(f"\ncompared with {baseline['meta'].get('commit') or 'baseline'} "
+          f"({baseline['meta'].get('timestamp', '?')}), threshold {threshold:.0f} %")
+    for key in ("latency", "repeats"):
+        if baseline["meta"]["args"].get(key) != results["meta"]["args"].get(key):
+            print(f"⚠️ --{key} differs from the baseline run — the numbers aren't comparable 1:1")
+
+    print(f"  {'size':<7}  {'stage':<29}  {'p50 ms':>17}  {'Δ':>7}  {'peak KB':>15}  {'Δ':>7}")
+    for size, result in results["results"].items():
+        old_stages = baseline["results"].get(size, {}).get("stages", {})
+        for stage, row in result["stages"].items():
+            old = old_stages.get(stage)
+            if old is None:
+                continue
+            time_delta = 100 * (row["p50_ms"] - old["p50_ms"]) / old["p50_ms"] if old["p50_ms"] else 0.0
+            memory_delta = 100 * (row["peak_kb"] - old["peak_kb"]) / old["peak_kb"] if old["peak_kb"] else 0.0
+            flags = []
+            if time_delta > threshold and row["p50_ms"] >= min_ms:
+                flags.append("time")
+                regressions.append(f"{size}/{stage}: p50 {old['p50_ms']:.2f} → {row['p50_ms']:.2f} ms "
+                                   f"(+{time_delta:.0f} %)")
+            if memory_delta > threshold and row["peak_kb"] >= MIN_COMPARE_KB:
+                flags.append("memory")
+                regressions.append(f"{size}/{stage}: peak {old['peak_kb']:.0f} → {row['peak_kb']:.0f} KB "
+                                   f"(+{memory_delta:.0f} %)")
+            print(f"  {size:<7}  {stage:<29}  {old['p50_ms']:>7.2f} → {row['p50_ms']:>7.2f}  {time_delta:>+6.0f}%  "
+                  f"{old['peak_kb']:>6.0f} → {row['peak_kb']:>6.0f}  {memory_delta:>+6.0f}%"
+                  + ("  ❌ " + ", ".join(flags) if flags else ""))
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark against a fake Gemini")
+    arg_parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="fake Gemini latency per call, seconds")
+    arg_parser.add_argument("--concurrency", type=int, default=4)
+    arg_parser.add_argument("--applicants", type=int, default=16, help="pipelines in the throughput run")
+    arg_parser.add_argument("--out", help="write the results to this JSON file")
+    arg_parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=15.0,
+                            help="percent slower / more memory that counts as a regression")
+    arg_parser.add_argument("--min-ms", type=float, default=1.0,
+                            help="stages faster than this are never flagged (timer noise)")
+    args = arg_parser.parse_args()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("out", "compare")},
+        },
+        "results": {},
+    }
+    print(f"{args.repeats} runs per size after a warm-up, fake Gemini latency {args.latency * 1000:.0f} ms")
+    for size in args.sizes:
+        results["results"][size] = benchmark_size(size, args)
+    print_results(results["results"])
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nresults written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
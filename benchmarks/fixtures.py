@@ -0,0 +1,230 @@
+# benchmarks/fixtures.py
+# Deterministic sample CVs for the benchmarks — no real applicant data.
+# PDFs are written by hand (Helvetica, WinAnsiEncoding) so generating a
+# fixture needs no extra library and always yields the same bytes.
+
+import io
+
+COMPANIES = [
+    ("Ed. Züblin AG", "Stuttgart"),
+    ("HOCHTIEF Infrastructure GmbH", "Essen"),
+    ("STRABAG SE", "Köln"),
+    ("Drees & Sommer SE", "Leipzig"),
+    ("DB Netz AG", "Frankfurt am Main"),
+    ("Bauhaus-Universität Weimar", "Weimar"),
+]
+
+ROLES = ["BIM Manager", "BIM Koordinator", "BIM Modeler", "Tragwerksplaner", "Projektingenieur"]
+
+TASKS = [
+    "Erstellung und Pflege der BIM-Abwicklungspläne (BAP) nach ISO 19650",
+    "Koordination der Fachmodelle Architektur, TGA und Tragwerk in Solibri",
+    "Kollisionsprüfung und Qualitätssicherung der IFC-Modelle",
+    "Automatisierung von Prüfroutinen mit Python und IfcOpenShell",
+    "Mengenermittlung und Kostenkontrolle nach HOAI-Leistungsphasen 2–5",
+    "Ausschreibung und Vergabe nach VOB/A, Nachtragsmanagement nach VOB/B",
+    "Schulung der Projektteams in Revit, Dynamo und BIM 360",
+]
+
+
+def sample_cv_entries(n_entries: int) -> list[tuple[str, str, list[str]]]:
+    """(date range, title line, bullets) for n synthetic positions, newest first."""
+    entries = []
+    for i in range(n_entries):
+        year = 2025 - 2 * (i % 20)
+        company, city = COMPANIES[i % len(COMPANIES)]
+        role = ROLES[i % len(ROLES)]
+        start, end = year - 2, year
+        date = f"{(i % 12) + 1:02d}/{start} – {(i % 12) + 1:02d}/{end}"
+        bullets = [TASKS[(i + k) % len(TASKS)] for k in range(3)]
+        entries.append((date, f"**{role}**, {company}, {city}", bullets))
+    return entries
+
+
+def sample_cv_text(n_entries: int = 8) -> str:
+    """CV text in the format generator.build_cv_prompt asks Gemini for."""
+    lines = [
+        "**PERSÖNLICHE DATEN**",
+        "Geburtsdatum: 15.09.1988",
+        "Nationalität: Deutsch",
+        "Wohnort: Chemnitz",
+        "",
+        "**BERUFSERFAHRUNG**",
+    ]
+    for date, title, bullets in sample_cv_entries(n_entries):
+        lines.append(f"{date} | {title}")
+        lines.extend(f"• {b}" for b in bullets)
+        lines.append("")
+    lines += [
+        "**AUSBILDUNG**",
+        "10/2008 – 09/2013 | **M.Sc. Bauingenieurwesen**, Bauhaus-Universität Weimar, Weimar",
+        "Abschlussarbeit: Automatisierte Modellprüfung mit IFC",
+        "",
+        "**SPRACHEN**",
+        "Deutsch – Muttersprache",
+        "Englisch – Verhandlungssicher",
+    ]
+    return "\n".join(lines)
+
+
+# ─────────────────────────────────────────────
+# Minimal PDF writer
+# ─────────────────────────────────────────────
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def build_pdf(pages: list[list[tuple[float, float, str, bool]]]) -> bytes:
+    """
+    Writes an A4 PDF with one text layer per page.
+    pages: per page a list of (x, y, text, bold) placements in points
+    """
+    objects: list[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree id is known
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    tree = add(b"")
+
+    page_ids = []
+    for placements in pages:
+        ops = [b"BT"]
+        for x, y, text, is_bold in placements:
+            ops.append(b"/F%d 10 Tf 1 0 0 1 %.2f %.2f Tm %s Tj" % (2 if is_bold else 1, x, y, _pdf_string(text)))
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595.28 841.89] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+            % (tree, font, bold, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % tree
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, obj))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def sample_cv_pdf(n_pages: int, two_column: bool = True) -> bytes:
+    """
+    A CV-like PDF of exactly n_pages pages, filled with dated entries.
+    two_column=True places dates and details side by side like a German
+    tabellarischer Lebenslauf (the slow case for pdfplumber's layout analysis).
+    """
+    entry_iter = iter(sample_cv_entries(n_pages * 12))
+    pages = []
+    for _ in range(n_pages):
+        placements = []
+        y = 780.0
+        while y > 120:
+            date, title, bullets = next(entry_iter)
+            if two_column:
+                placements.append((70, y, date, False))
+                placements.append((200, y, title.replace("**", ""), True))
+            else:
+                placements.append((70, y, f"{date} {title.replace('**', '')}", True))
+            y -= 14
+            for bullet in bullets:
+                placements.append((210 if two_column else 80, y, f"• {bullet}", False))
+                y -= 12
+            y -= 8
+        pages.append(placements)
+    return build_pdf(pages)
+
+
+def sample_cv_docx(n_entries: int = 8) -> bytes:
+    """A two-column DOCX CV (dates | details in tables), as users upload them."""
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading("Lebenslauf", level=1)
+    doc.add_paragraph("BERUFSERFAHRUNG")
+    table = doc.add_table(rows=0, cols=2)
+    for date, title, bullets in sample_cv_entries(n_entries):
+        cells = table.add_row().cells
+        cells[0].text = date
+        cells[1].text = title.replace("**", "")
+        for bullet in bullets:
+            cells[1].add_paragraph(f"• {bullet}")
+    doc.add_paragraph("SPRACHEN")
+    doc.add_paragraph("Deutsch – Muttersprache")
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# ─────────────────────────────────────────────
+# Applicant profile
+# ─────────────────────────────────────────────
+
+SAMPLE_JOB_AD = """BIM Manager (m/w/d) – Infrastrukturprojekte, Leipzig
+
+Ihre Aufgaben:
+- Einführung und Weiterentwicklung der BIM-Methodik nach ISO 19650 und VDI 2552
+- Erstellung von Auftraggeber-Informationsanforderungen (AIA) und BIM-Abwicklungsplänen (BAP)
+- Koordination der Fachmodelle, Kollisionsprüfung und Qualitätssicherung (Solibri, BIMcollab)
+- Automatisierung von Prüfroutinen mit Python, Dynamo oder IfcOpenShell
+- Schulung und Beratung der Projektteams
+
+Ihr Profil:
+- Abgeschlossenes Studium im Bauingenieurwesen oder der Architektur
+- Mehrjährige Erfahrung im BIM-Management, idealerweise bei Infrastrukturprojekten
+- Sicherer Umgang mit Revit, Navisworks und IFC
+- Verhandlungssichere Deutsch- und gute Englischkenntnisse
+"""
+
+
+def sample_profile(cv_extracted_text: str = None):
+    """A complete UserProfile for the prompt builders; cv_extracted_text as an upload would give it."""
+    from models import UserProfile
+
+    return UserProfile(
+        full_name="Max Mustermann",
+        date_of_birth="15.09.1988",
+        nationality="Deutsch",
+        city="Chemnitz",
+        email="max.mustermann@example.de",
+        phone="+49 371 123456",
+        university="Bauhaus-Universität Weimar",
+        degree="M.Sc. Bauingenieurwesen",
+        thesis_title="Automatisierte Modellprüfung mit IFC",
+        bim_roles=["BIM Manager", "BIM Koordinator"],
+        software_skills=["Revit", "Solibri", "Navisworks", "Dynamo", "Python", "IfcOpenShell"],
+        years_experience=12,
+        target_job_title="BIM Manager",
+        target_company="Drees & Sommer SE",
+        job_ad_text=SAMPLE_JOB_AD,
+        cv_extracted_text=cv_extracted_text,
+    )
+
+
+def sample_scanned_pdf(n_pages: int, dpi: int = 200) -> bytes:
+    """sample_cv_pdf rasterized at `dpi` into an image-only PDF — like a scan, no text layer."""
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(sample_cv_pdf(n_pages))
+    images = [document[i].render(scale=dpi / 72, grayscale=True).to_pil() for i in range(n_pages)]
+    document.close()
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:], resolution=dpi)
+    return buffer.getvalue()
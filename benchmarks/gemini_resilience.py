@@ -0,0 +1,82 @@
+# benchmarks/gemini_resilience.py
+# gemini_client.GeminiClientManager against fake_gemini.StubServer — the real
+# google-genai client over local HTTP, with injected latency and errors.
+# For each scenario (share of requests the "API" fails with 429/503) and
+# retry policy, --requests calls run on --concurrency threads; reported:
+#   ok %      — requests that got an answer
+#   upstream  — HTTP requests the stub received (retry traffic included)
+#   p50 / p95 — request latency, in ms, including backoff
+#   rejected  — requests the open circuit breaker failed fast
+#
+# Usage:  python -m benchmarks.gemini_resilience [--requests 80] [--concurrency 8] [--latency 0.05]
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_gemini import StubServer
+from gemini_client import ClientSettings, GeminiClientManager
+
+SCENARIOS = [("healthy", 0.0), ("flaky 20 %", 0.2), ("degraded 60 %", 0.6), ("outage", 1.0)]
+
+POLICIES = {
+    # Backoff scaled down so the benchmark runs in seconds
+    "no retry": dict(max_retries=0, breaker_threshold=0),
+    "retry": dict(max_retries=3, breaker_threshold=0, backoff_base=0.05),
+    "retry + breaker": dict(max_retries=3, breaker_threshold=5, breaker_cooldown=1.0, backoff_base=0.05),
+}
+
+
+def run(server: StubServer, policy: dict, n_requests: int, concurrency: int) -> dict:
+    manager = GeminiClientManager(ClientSettings(base_url=server.url, timeout=10, deadline=30,
+                                                 max_concurrency=concurrency, **policy))
+    client = manager.client
+
+    def one_request(i: int):
+        start = time.perf_counter()
+        try:
+            manager.generate_content(client, model="gemini-2.5-flash", contents=f"Anschreiben Nr. {i}")
+            ok = True
+        except Exception:
+            ok = False
+        return ok, (time.perf_counter() - start) * 1000
+
+    upstream_before = server.requests
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one_request, range(n_requests)))
+    latencies = sorted(ms for _, ms in results)
+    return {
+        "ok": 100 * sum(ok for ok, _ in results) / n_requests,
+        "upstream": server.requests - upstream_before,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "rejected": manager.stats()["rejected"],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Retry / circuit breaker behaviour against a stub Gemini API")
+    arg_parser.add_argument("--requests", type=int, default=80)
+    arg_parser.add_argument("--concurrency", type=int, default=8)
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="stub latency per request, seconds")
+    args = arg_parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    server = StubServer(latency=args.latency, seed=1).start()
+    print(f"{args.requests} requests, {args.concurrency} threads, stub latency {args.latency * 1000:.0f} ms")
+    print(f"{'scenario':<14}  {'policy':<16}  {'ok %':>5}  {'upstream':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'rejected':>8}")
+    try:
+        for scenario, error_rate in SCENARIOS:
+            server.error_rate = error_rate
+            for policy_name, policy in POLICIES.items():
+                row = run(server, policy, args.requests, args.concurrency)
+                print(f"{scenario:<14}  {policy_name:<16}  {row['ok']:>5.0f}  {row['upstream']:>8}  "
+                      f"{row['p50']:>7.0f}  {row['p95']:>7.0f}  {row['rejected']:>8}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/import_time.py
+# Cold-start import cost, the way a freshly woken Streamlit Cloud app pays it:
+# every module is imported in a NEW interpreter with `python -X importtime`,
+# and the report shows
+#   - the cumulative import time per module (best of --repeats)
+#   - the heaviest packages pulled in by the first module (default: app)
+# The third-party libraries the app loads lazily are listed as well, so a
+# change that imports one of them at the top again shows up as a jump in
+# the app row.
+#
+# No API key needed — the Gemini client is only created on first use.
+#
+# Usage:  python -m benchmarks.import_time [--modules app generator ...]
+#                                          [--repeats 3] [--top 10] [--max-ms 1500]
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    # our modules
+    "app", "generator", "cv_extractor", "match_score", "document_builder", "pdf_builder", "photo", "batch",
+    # libraries app.py defers until they are needed
+    "google.genai", "docx", "fpdf", "pdfplumber", "PIL.Image",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def import_profile(module: str) -> list[tuple[str, float]]:
+    """
+    (name, cumulative ms) per imported module, in the order -X importtime
+    reports them: a module right after everything it imported.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("GEMINI_API_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    profile = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative_us, name = match.groups()
+            profile.append((name, int(cumulative_us) / 1000))
+    return profile
+
+
+def module_ms(profile: list[tuple[str, float]], module: str) -> float:
+    return next(ms for name, ms in profile if name == module)
+
+
+def heaviest_packages(profile: list[tuple[str, float]], module: str, top: int) -> list[tuple[str, float]]:
+    """Top-level packages by cumulative time, counting only what `module` itself pulled in."""
+    packages = {}
+    for name, ms in profile:
+        if name == module:
+            break  # later lines come from background threads (app.preload_libraries)
+        package = name.split(".")[0]
+        if package != module:
+            packages[package] = max(packages.get(package, 0.0), ms)
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Cold-start import time per module (-X importtime)")
+    arg_parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    arg_parser.add_argument("--repeats", type=int, default=3)
+    arg_parser.add_argument("--top", type=int, default=10)
+    arg_parser.add_argument("--max-ms", type=float, default=None,
+                            help="exit with status 1 if the first module takes longer than this")
+    args = arg_parser.parse_args()
+
+    print(f"fresh interpreter per import, best of {args.repeats}")
+    print(f"{'module':<18}  {'import ms':>9}")
+    first_profile = first_ms = None
+    for module in args.modules:
+        best, best_profile = float("inf"), None
+        for _ in range(args.repeats):
+            profile = import_profile(module)
+            if module_ms(profile, module) < best:
+                best, best_profile = module_ms(profile, module), profile
+        print(f"{module:<18}  {best:>9.1f}")
+        if first_profile is None:
+            first_profile, first_ms = best_profile, best
+
+    first = args.modules[0]
+    print(f"\nheaviest packages imported by {first}:")
+    for package, ms in heaviest_packages(first_profile, first, args.top):
+        print(f"  {package:<24}  {ms:>7.1f} ms")
+
+    if args.max_ms is not None and first_ms > args.max_ms:
+        print(f"\n❌ import {first} took {first_ms:.0f} ms, budget {args.max_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/keyword_scan.py
+# How the keyword scan scales with dictionary size.
+#   trie     — keywords.KeywordMatcher (one trie-shaped regex)
+#   flat     — one regex with a plain "a|b|c|..." alternation
+#   per-term — one regex per variant, text scanned once per keyword
+#
+# Usage:  python -m benchmarks.keyword_scan [--sizes 100 1000 5000]
+
+import argparse
+import random
+import re
+import time
+
+from keywords import AEC_KEYWORDS, KeywordMatcher
+
+JOB_AD = """
+Für unsere Niederlassung in Leipzig suchen wir eine:n BIM-Koordinator*in (m/w/d).
+Ihre Aufgaben: Koordination der Fachmodelle nach ISO 19650, Erstellung des
+BIM-Abwicklungsplans, Kollisionsprüfungen in Solibri und Navisworks, Mengenermittlung
+nach DIN 276 sowie Ausschreibung und Vergabe nach VOB/A. Ihr Profil: abgeschlossenes
+Studium Bauingenieurwesen oder Architektur, sicherer Umgang mit Autodesk Revit,
+Dynamo und BIM 360, Kenntnisse in IFC, BCF und Python wünschenswert, Erfahrung in
+den Leistungsphasen 2–5 der HOAI.
+""" * 4
+
+
+def synthetic_keywords(n_terms: int, seed: int = 0) -> dict:
+    """The real dictionary plus random made-up AEC-ish terms up to n_terms."""
+    rng = random.Random(seed)
+    syllables = ["bau", "plan", "tech", "werk", "modell", "norm", "cad", "bim", "statik",
+                 "netz", "hoch", "tief", "trag", "last", "daten", "prüf", "soft", "ware"]
+    keywords = dict(AEC_KEYWORDS)
+    while len(keywords) < n_terms:
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        keywords[word.capitalize()] = {"category": "software", "variants": [word, f"{word} pro"]}
+    return keywords
+
+
+def time_per_scan(scan, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        scan(JOB_AD)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Keyword scan scaling")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    arg_parser.add_argument("--repeats", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    print(f"job ad: {len(JOB_AD)} characters")
+    print(f"{'terms':>6}  {'compile ms':>10}  {'trie ms':>8}  {'flat ms':>8}  {'per-term ms':>11}")
+    for size in args.sizes:
+        keywords = synthetic_keywords(size)
+        variants = sorted({v for term, spec in keywords.items() for v in [term, *spec["variants"]]},
+                          key=len, reverse=True)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        flat = re.compile(r"(?<!\w)(?:" + "|".join(re.escape(v) for v in variants) + r")(?!\w)", re.IGNORECASE)
+        per_term = [re.compile(rf"(?<!\w){re.escape(v)}(?!\w)", re.IGNORECASE) for v in variants]
+
+        trie_ms = time_per_scan(matcher.scan, args.repeats)
+        flat_ms = time_per_scan(lambda text: flat.findall(text), args.repeats)
+        per_term_ms = time_per_scan(lambda text: [p.findall(text) for p in per_term], max(1, args.repeats // 4))
+        print(f"{size:>6}  {compile_ms:>10.1f}  {trie_ms:>8.2f}  {flat_ms:>8.2f}  {per_term_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
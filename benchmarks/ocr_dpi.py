@@ -0,0 +1,57 @@
+# benchmarks/ocr_dpi.py
+# OCR_DPI tuning: a scanned CV (sample_cv_pdf rasterized at --scan-dpi, no
+# text layer) read with ocr.ocr_pages at several render DPIs. Per DPI:
+#   s/page    — render + Tesseract per page, mean and max (cache cleared)
+#   accuracy  — similarity of the OCR text to the original text layer
+#               (difflib ratio on whitespace-normalized text, 100 = identical)
+#   wall      — all pages, with --workers processes
+# Needs Tesseract with the deu and eng language packs (see ocr.py).
+#
+# Usage:  python -m benchmarks.ocr_dpi [--pages 3] [--dpi 150 200 300 400] [--scan-dpi 200] [--workers 4]
+
+import argparse
+import difflib
+import re
+import sys
+import time
+
+from benchmarks.fixtures import sample_cv_pdf, sample_scanned_pdf
+from cv_extractor import extract_text_from_pdf
+from ocr import OCR_WORKERS, _ocr_cache, ocr_available, ocr_languages, ocr_pages
+
+
+def normalized(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="OCR time per page and accuracy per render DPI")
+    arg_parser.add_argument("--pages", type=int, default=3)
+    arg_parser.add_argument("--dpi", type=int, nargs="+", default=[150, 200, 300, 400])
+    arg_parser.add_argument("--scan-dpi", type=int, default=200, help="resolution of the simulated scan")
+    arg_parser.add_argument("--workers", type=int, default=OCR_WORKERS)
+    args = arg_parser.parse_args()
+
+    if not ocr_available():
+        print("❌ OCR not available — install pytesseract and Tesseract with the deu/eng language packs")
+        sys.exit(1)
+
+    expected = normalized(extract_text_from_pdf(sample_cv_pdf(args.pages), ocr=False))
+    scanned = sample_scanned_pdf(args.pages, dpi=args.scan_dpi)
+    pages = list(range(1, args.pages + 1))
+
+    print(f"{args.pages} pages scanned at {args.scan_dpi} dpi, languages {ocr_languages()}, {args.workers} workers")
+    print(f"{'dpi':>5}  {'mean s/page':>11}  {'max s/page':>10}  {'wall s':>7}  {'accuracy %':>10}")
+    for dpi in args.dpi:
+        _ocr_cache.clear()
+        start = time.perf_counter()
+        results = ocr_pages(scanned, pages, dpi=dpi, workers=args.workers)
+        wall = time.perf_counter() - start
+        seconds = [result.seconds for result in results]
+        text = normalized("\n".join(result.text for result in results))
+        accuracy = 100 * difflib.SequenceMatcher(None, expected, text, autojunk=False).ratio()
+        print(f"{dpi:>5}  {sum(seconds) / len(seconds):>11.2f}  {max(seconds):>10.2f}  {wall:>7.2f}  {accuracy:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
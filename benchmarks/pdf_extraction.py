@@ -0,0 +1,77 @@
+# benchmarks/pdf_extraction.py
+# Per-page extraction time and peak RSS: the old parser.extract_from_pdf
+# (extract_text() called twice per page, pages never released) against
+# the single-pass engine cv_extractor.iter_pdf_pages.
+#
+# Every measurement runs in a fresh process so peak RSS isn't polluted by
+# earlier runs.   Usage:  python -m benchmarks.pdf_extraction [--pages 5 15 30]
+
+import argparse
+import io
+import multiprocessing
+import resource
+import sys
+import time
+
+from benchmarks.fixtures import sample_cv_pdf
+
+
+def _legacy_extract(file_bytes: bytes) -> str:
+    """Reference copy of the pre-refactor parser.extract_from_pdf."""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        return "\n".join(
+            page.extract_text() for page in pdf.pages
+            if page.extract_text() is not None
+        )
+
+
+def _single_pass_extract(file_bytes: bytes) -> str:
+    from cv_extractor import iter_pdf_pages
+
+    return "\n".join(iter_pdf_pages(io.BytesIO(file_bytes)))
+
+
+VARIANTS = {
+    "before": _legacy_extract,
+    "after": _single_pass_extract,
+}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(variant: str, n_pages: int) -> tuple[float, float, float]:
+    file_bytes = sample_cv_pdf(n_pages)
+    import pdfplumber  # noqa: F401 — keep import cost out of the timing
+
+    baseline_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    VARIANTS[variant](file_bytes)
+    elapsed = time.perf_counter() - start
+    return elapsed, baseline_rss, _peak_rss_mb()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="PDF extraction: per-page time and peak RSS")
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[5, 15, 30])
+    args = arg_parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'pages':>5}  {'variant':<7}  {'total s':>8}  {'ms/page':>8}  {'peak RSS MB':>11}  {'+RSS MB':>8}")
+    for n_pages in args.pages:
+        for variant in VARIANTS:
+            with ctx.Pool(1) as pool:
+                elapsed, base_rss, peak_rss = pool.apply(_measure, (variant, n_pages))
+            print(
+                f"{n_pages:>5}  {variant:<7}  {elapsed:>8.3f}  {elapsed / n_pages * 1000:>8.1f}"
+                f"  {peak_rss:>11.1f}  {peak_rss - base_rss:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/pdf_parallel.py
+# Serial vs. process-pool PDF extraction across document sizes.
+#   serial   — workers=1
+#   parallel — workers=N, threshold disabled (always uses the pool)
+#   auto     — workers=N, default PARALLEL_MIN_PAGES threshold
+#
+# Usage:  python -m benchmarks.pdf_parallel [--pages 1 5 30] [--workers 4]
+
+import argparse
+import os
+import time
+
+from benchmarks.fixtures import sample_cv_pdf
+from cv_extractor import PARALLEL_MIN_PAGES, extract_text_from_pdf
+
+
+def best_of(repeats: int, fn) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serial vs. parallel PDF extraction")
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 30])
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument("--repeats", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    variants = {
+        "serial": dict(workers=1),
+        "parallel": dict(workers=args.workers, parallel_min_pages=0),
+        "auto": dict(workers=args.workers, parallel_min_pages=PARALLEL_MIN_PAGES),
+    }
+
+    print(f"workers={args.workers}  threshold={PARALLEL_MIN_PAGES} pages  (best of {args.repeats})")
+    print(f"{'pages':>5}  " + "  ".join(f"{name:>10}" for name in variants) + "  speed-up")
+    for n_pages in args.pages:
+        file_bytes = sample_cv_pdf(n_pages)
+        reference = extract_text_from_pdf(file_bytes)
+        timings = {}
+        for name, kwargs in variants.items():
+            assert extract_text_from_pdf(file_bytes, **kwargs) == reference, name
+            timings[name] = best_of(args.repeats, lambda: extract_text_from_pdf(file_bytes, **kwargs))
+        print(
+            f"{n_pages:>5}  " + "  ".join(f"{timings[name]:>9.3f}s" for name in variants)
+            + f"  {timings['serial'] / timings['auto']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/pdf_render.py
+# PDF export per CV:
+#   native      — pdf_builder.render_cv_pdf, straight from the document model
+#   libreoffice — document_builder .docx + `soffice --headless --convert-to pdf`
+#                 (only if soffice/libreoffice is on PATH; one process per file,
+#                 the way docx2pdf-style conversion works on Linux)
+#
+# Usage:  python -m benchmarks.pdf_render [--entries 5 12 40] [--repeats 10]
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from benchmarks.fixtures import sample_cv_text
+from document_builder import create_cv_document
+from document_model import parse_cv_text
+from pdf_builder import render_cv_pdf
+
+
+def native_ms(cv_text: str, repeats: int) -> tuple[float, int]:
+    cv = parse_cv_text(cv_text)
+    render_cv_pdf(cv, "Max Mustermann")  # first call pays for imports
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pdf = render_cv_pdf(cv, "Max Mustermann")
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), len(pdf)
+
+
+def libreoffice_ms(soffice: str, cv_text: str, repeats: int) -> tuple[float, int]:
+    timings, size = [], 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(repeats):
+            start = time.perf_counter()
+            docx_path = os.path.join(tmp, f"cv{i}.docx")
+            with open(docx_path, "wb") as f:
+                f.write(create_cv_document(cv_text, "Max Mustermann").getvalue())
+            subprocess.run([soffice, "--headless", "--convert-to", "pdf", "--outdir", tmp, docx_path],
+                           check=True, capture_output=True)
+            timings.append((time.perf_counter() - start) * 1000)
+            size = os.path.getsize(os.path.join(tmp, f"cv{i}.pdf"))
+    return min(timings), size
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Native PDF export vs. LibreOffice conversion")
+    arg_parser.add_argument("--entries", type=int, nargs="+", default=[5, 12, 40])
+    arg_parser.add_argument("--repeats", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    print(f"best of {args.repeats}; LibreOffice: {soffice or 'not installed — skipped'}")
+    print(f"{'entries':>7}  {'native ms':>9}  {'native KB':>9}  {'soffice ms':>10}  {'soffice KB':>10}")
+    for n_entries in args.entries:
+        cv_text = sample_cv_text(n_entries)
+        ms, size = native_ms(cv_text, args.repeats)
+        row = f"{n_entries:>7}  {ms:>9.1f}  {size / 1024:>9.1f}"
+        if soffice:
+            lo_ms, lo_size = libreoffice_ms(soffice, cv_text, max(1, args.repeats // 5))
+            row += f"  {lo_ms:>10.1f}  {lo_size / 1024:>10.1f}"
+        else:
+            row += f"  {'—':>10}  {'—':>10}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
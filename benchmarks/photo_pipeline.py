@@ -0,0 +1,73 @@
+# benchmarks/photo_pipeline.py
+# Profile photo in the CV header, with a phone-sized upload (12 MP JPEG):
+#   prepare — photo.prepare_photo, first call and cached
+#   docx    — document_builder.build_cv_document + save, raw vs. prepared photo
+#   pdf     — pdf_builder.render_cv_pdf, raw vs. prepared photo
+#
+# Usage:  python -m benchmarks.photo_pipeline [--megapixels 12] [--repeats 5]
+
+import argparse
+import io
+import time
+
+from PIL import Image
+
+from benchmarks.fixtures import sample_cv_text
+from document_builder import build_cv_document
+from document_model import parse_cv_text
+from pdf_builder import render_cv_pdf
+from photo import _prepared_photos, prepare_photo
+
+
+def sample_photo(megapixels: float) -> bytes:
+    """Noisy 3:4 JPEG, so it compresses about as badly as a real photo."""
+    width = int((megapixels * 1_000_000 * 3 / 4) ** 0.5)
+    height = width * 4 // 3
+    image = Image.effect_noise((width, height), 60).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def best_ms(repeats: int, fn) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def docx_bytes(cv, photo: bytes) -> bytes:
+    buffer = io.BytesIO()
+    build_cv_document(cv, "Max Mustermann", photo=photo).save(buffer)
+    return buffer.getvalue()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Photo preprocessing and its effect on CV export")
+    arg_parser.add_argument("--megapixels", type=float, default=12)
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    raw = sample_photo(args.megapixels)
+    cv = parse_cv_text(sample_cv_text(12))
+
+    def prepare_uncached():
+        _prepared_photos.clear()
+        return prepare_photo(raw)
+
+    first_ms, prepared = best_ms(args.repeats, prepare_uncached)
+    cached_ms, _ = best_ms(args.repeats, lambda: prepare_photo(raw))
+    print(f"upload {len(raw) / 1024:.0f} KB → prepared {len(prepared) / 1024:.0f} KB; best of {args.repeats}")
+    print(f"prepare: first {first_ms:.1f} ms, cached {cached_ms:.3f} ms")
+
+    print(f"{'photo':>8}  {'docx ms':>8}  {'docx KB':>8}  {'pdf ms':>8}  {'pdf KB':>8}")
+    for label, photo in (("raw", raw), ("prepared", prepared)):
+        docx_ms, docx = best_ms(args.repeats, lambda: docx_bytes(cv, photo))
+        pdf_ms, pdf = best_ms(args.repeats, lambda: render_cv_pdf(cv, "Max Mustermann", photo=photo))
+        print(f"{label:>8}  {docx_ms:>8.1f}  {len(docx) / 1024:>8.0f}  {pdf_ms:>8.1f}  {len(pdf) / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
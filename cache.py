@@ -0,0 +1,245 @@
+# cache.py
+# Small in-process caches shared by every Streamlit session of one worker.
+# Streamlit reruns app.py from top to bottom on every widget change, so
+# anything expensive (PDF parsing, Gemini calls, .docx rendering) should
+# only be done once per distinct input and then served from here.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+
+CacheValue = Union[bytes, str]
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest — the same bytes always map to the same key."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _sizeof(value: CacheValue) -> int:
+    if isinstance(value, bytes):
+        return len(value)
+    return len(value.encode("utf-8"))
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by the TOTAL SIZE of its values
+    (not by the number of entries), so one huge CV can't be kept alongside
+    hundreds of others and blow up worker memory.
+
+    max_bytes: upper bound for the summed size of all cached values
+    disk_dir: optional directory — entries are also written there and read
+              back after a restart, so a fresh worker doesn't redo the work
+    ttl: optional lifetime in seconds of in-memory entries (None = forever)
+
+    Thread-safe: Streamlit serves each session from its own thread.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None,
+                 ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, size, expires_at)
+        self._items: "OrderedDict[str, tuple[CacheValue, int, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[CacheValue]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[2] < time.monotonic():
+                self._remove(key)
+                item = None
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def set(self, key: str, value: CacheValue) -> None:
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    # --- internals (caller holds the lock) ---
+
+    def _store(self, key: str, value: CacheValue) -> None:
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return  # would evict everything else — don't keep it in memory
+
+        self._remove(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        self._items[key] = (value, size, expires_at)
+        self._size += size
+
+        while self._size > self.max_bytes:
+            _, (_, evicted_size, _) = self._items.popitem(last=False)
+            self._size -= evicted_size
+
+    def _remove(self, key: str) -> None:
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+
+    # --- optional on-disk store: one file per key ---
+    # Text and binary values get different suffixes so a cached str comes
+    # back as str and cached bytes come back as bytes.
+
+    def _disk_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}{suffix}")
+
+    def _read_disk(self, key: str) -> Optional[CacheValue]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key, ".txt"), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        try:
+            with open(self._disk_path(key, ".bin"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, value: CacheValue) -> None:
+        if not self.disk_dir:
+            return
+        is_text = isinstance(value, str)
+        path = self._disk_path(key, ".txt" if is_text else ".bin")
+        # Write to a temp file first, then rename: a crash mid-write must
+        # never leave a truncated entry that later reads as a valid hit.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if is_text:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(value)
+            else:
+                with open(tmp_path, "wb") as f:
+                    f.write(value)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Disk persistence is best effort — the in-memory copy still works
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class SQLiteCache:
+    """
+    Same interface as LRUCache, but stored in a local SQLite file, so the
+    entries survive restarts and can be shared by several worker processes
+    on one machine.
+
+    path: database file (created if missing)
+    max_bytes: least-recently-used entries are deleted beyond this total size
+    ttl: entries older than this many seconds are treated as missing
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by all threads; the lock serialises access
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, is_text INTEGER NOT NULL,"
+            " size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CacheValue]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, is_text, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and row[2] < now - self.ttl:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        value, is_text, _ = row
+        return value.decode("utf-8") if is_text else bytes(value)
+
+    def set(self, key: str, value: CacheValue) -> None:
+        is_text = isinstance(value, str)
+        blob = value.encode("utf-8") if is_text else value
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, int(is_text), len(blob), now, now),
+            )
+            self._evict(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+
+    def _evict(self, now: float) -> None:
+        if self.ttl:
+            self._db.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Walk from least recently used and delete until we're under budget
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
@@ -0,0 +1,182 @@
+# cv_context.py
+# Shrinks the extracted CV text before it goes into the Gemini prompt.
+# A 5-page CV pasted in full costs thousands of input tokens, most of it
+# irrelevant to the job at hand. Here the CV is split into entries (one per
+# dated position / section), every entry is scored against the job ad with
+# BM25 — plain token statistics, no external service — and only the most
+# relevant entries are kept in full, within a token budget.
+#
+# Entries without room for details keep their first line (dates + title),
+# so the timeline stays gap-free — the prompt forbids gaps in the CV.
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Small stop-word list: German + English filler that says nothing about fit
+STOPWORDS = frozenset("""
+aber als am an auch auf aus bei bin bis bzw da damit das dass dem den der des die
+dies diese diesem diesen dieser du durch ein eine einem einen einer eines er es
+für hat haben ich ihr ihre im in ist ja kann mit nach nicht noch nur oder sich sie
+sind so über um und uns unser unsere unter vom von vor war wie wir wird wo zu zum zur
+sowie sehr gute guter gutes mw d m w
+a an and are as at be by for from has have in is it of on or that the to was with you your
+""".split())
+
+# "01/2019 – 12/2021", "2019 - heute", "09.2015 bis 03.2017", "03/2020"
+DATE_START = re.compile(
+    r"^\s*(?:\d{1,2}[./])?(?:19|20)\d{2}\b"
+    r"(?:\s*(?:–|-|bis)\s*(?:(?:\d{1,2}[./])?(?:19|20)\d{2}|heute|jetzt|today|present))?",
+    re.IGNORECASE,
+)
+
+TOKEN = re.compile(r"[a-zäöüß0-9]+(?:[./][a-zäöüß0-9]+)*")
+
+_SUFFIXES = ("ungen", "ung", "en", "er", "es", "e", "n", "s")
+
+
+class CVContext(NamedTuple):
+    text: str               # what goes into the prompt
+    tokens_before: int      # estimated tokens of the full extracted text
+    tokens_after: int       # estimated tokens of `text`
+    entries_total: int
+    entries_in_full: int    # entries kept with all their details
+
+
+def estimate_tokens(text: str) -> int:
+    """Local estimate — Gemini averages ~4 characters per token."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def _stem(token: str) -> str:
+    # Crude German suffix stripping so "Koordination"/"Koordinationen"
+    # and "Planer"/"Planung" land closer together
+    if len(token) > 5:
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix):
+                return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased, stemmed terms without stop words."""
+    return [
+        _stem(token) for token in TOKEN.findall(text.lower())
+        if token not in STOPWORDS and len(token) > 1
+    ]
+
+
+def _is_section_header(line: str) -> bool:
+    bare = line.replace("*", "").strip().rstrip(":")
+    return 2 < len(bare) <= 40 and bare.isupper()
+
+
+def segment_cv(cv_text: str) -> list[tuple[Optional[str], str]]:
+    """
+    Splits CV text into (section header, entry text) pairs, in order.
+    A new entry starts at every section header and every line that begins
+    with a date; lines before the first header get header None.
+    """
+    entries = []
+    section = None
+    current: list[str] = []
+
+    def flush():
+        if current:
+            entries.append((section, "\n".join(current)))
+            current.clear()
+
+    for line in cv_text.split("\n"):
+        if not line.strip():
+            continue
+        if _is_section_header(line):
+            flush()
+            section = line.strip()
+        elif DATE_START.match(line):
+            flush()
+            current.append(line)
+        else:
+            current.append(line)
+    flush()
+    return entries
+
+
+def bm25_scores(documents: list[list[str]], query: list[str],
+                k1: float = 1.5, b: float = 0.75) -> list[float]:
+    """Okapi BM25 score of every tokenized document for the query terms."""
+    if not documents:
+        return []
+    n_docs = len(documents)
+    avg_len = sum(len(doc) for doc in documents) / n_docs or 1.0
+    doc_freq = Counter(term for doc in documents for term in set(doc))
+    query_terms = set(query)
+    idf = {
+        term: math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+        for term in query_terms if term in doc_freq
+    }
+
+    scores = []
+    for doc in documents:
+        term_freq = Counter(doc)
+        norm = k1 * (1 - b + b * len(doc) / avg_len)
+        scores.append(sum(
+            weight * term_freq[term] * (k1 + 1) / (term_freq[term] + norm)
+            for term, weight in idf.items() if term in term_freq
+        ))
+    return scores
+
+
+@lru_cache(maxsize=64)
+def select_cv_context(cv_text: str, job_ad_text: str, token_budget: int) -> CVContext:
+    """
+    Keeps the CV entries most relevant to the job ad within token_budget.
+    Cached, so the app can show the report on every rerun for free.
+
+    Budget order, always most relevant entries first:
+    1. full details, until half of the budget is used
+    2. the first line (dates + title) of every other entry
+    3. whatever room is left upgrades more entries to full details
+    """
+    tokens_before = estimate_tokens(cv_text)
+    entries = segment_cv(cv_text)
+    if tokens_before <= token_budget or not entries:
+        return CVContext(cv_text, tokens_before, tokens_before, len(entries), len(entries))
+
+    scores = bm25_scores([tokenize(text) for _, text in entries], tokenize(job_ad_text or ""))
+    by_relevance = sorted(range(len(entries)), key=lambda i: scores[i], reverse=True)
+
+    headlines = [text.split("\n", 1)[0] for _, text in entries]
+    full_costs = [estimate_tokens(text) for _, text in entries]
+    headline_costs = [estimate_tokens(line) for line in headlines]
+    used = sum(estimate_tokens(section) for section in {s for s, _ in entries if s})
+
+    kept, in_full = set(), set()
+    for i in by_relevance:
+        if used + full_costs[i] <= token_budget // 2:
+            kept.add(i)
+            in_full.add(i)
+            used += full_costs[i]
+    for i in by_relevance:
+        if i not in kept and used + headline_costs[i] <= token_budget:
+            kept.add(i)
+            used += headline_costs[i]
+    for i in by_relevance:
+        extra = full_costs[i] - headline_costs[i]
+        if i in kept and i not in in_full and used + extra <= token_budget:
+            in_full.add(i)
+            used += extra
+
+    lines = []
+    last_section = None
+    for i, (section, text) in enumerate(entries):
+        if i not in kept:
+            continue
+        if section and section != last_section:
+            lines.append(section)
+            last_section = section
+        lines.append(text if i in in_full else headlines[i])
+
+    text = "\n".join(lines)
+    return CVContext(text, tokens_before, estimate_tokens(text), len(entries), len(in_full))
@@ -2,30 +2,218 @@
 # Extracts raw text from uploaded PDF or DOCX files.
 # This extracted text is fed directly into the Gemini prompt so it
 # uses REAL data from the user's CV instead of hallucinating.
+#
+# pdfplumber is imported inside the functions that need it: it takes
+# ~0.2 s to import, which the app would otherwise pay on every cold start,
+# upload or not. DOCX files are read straight from their XML (standard
+# library only), without python-docx. Scanned PDF pages (no text layer)
+# go to the OCR fallback in ocr.py, page by page.
 
-import pdfplumber
 import io
-from docx import Document
+import os
+from cache import LRUCache, content_hash
+from metrics import timed
 
+# Bump when extraction logic changes so stale (on-disk) cache entries are ignored
+EXTRACTOR_VERSION = 4
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+# Process-wide cache of extracted text, keyed by the SHA-256 of the uploaded
+# bytes. Shared by all Streamlit sessions; set CV_CACHE_DIR to also keep the
+# results on disk across worker restarts.
+_text_cache = LRUCache(
+    max_bytes=int(os.getenv("CV_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+    disk_dir=os.getenv("CV_CACHE_DIR") or None,
+)
+
+
+# Below this many pages, starting worker processes costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+
+def _page_range_texts(source, first_page: int, last_page: int) -> list[str]:
+    """
+    Extracts pages first_page..last_page (1-based, inclusive), one string
+    per page ("" when the page has no text layer). Each page's text is
+    extracted exactly ONCE and its cached layout objects are released right
+    after, so memory stays flat on long PDFs.
+
+    Also the unit of work for the process pool: a worker gets the raw
+    bytes, opens its own copy of the PDF and only parses its page range.
+    """
+    import pdfplumber
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    texts = []
+    # pages=... keeps pdfplumber from creating Page objects we'd never read
+    with pdfplumber.open(source, pages=range(first_page, last_page + 1)) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            page.close()
+    return texts
+
+
+def _iter_page_texts(source, max_pages: int = None):
+    """Serial version of _page_range_texts that streams page by page."""
+    import pdfplumber
+
+    pages_to_parse = range(1, max_pages + 1) if max_pages else None
+    with pdfplumber.open(source, pages=pages_to_parse) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            page.close()
+            yield page_text
+
+
+def _stop_early(page_texts, stop_after_blank_pages: int = None):
+    """Drops blank pages and stops after N blank pages in a row."""
+    blank_streak = 0
+    for page_text in page_texts:
+        if page_text.strip():
+            blank_streak = 0
+            yield page_text
+        else:
+            blank_streak += 1
+            if stop_after_blank_pages and blank_streak >= stop_after_blank_pages:
+                return
+
+
+def iter_pdf_pages(source, max_pages: int = None, stop_after_blank_pages: int = None):
+    """
+    Shared PDF extraction engine — parser.py routes through this too.
+    Yields the text of each page that has a text layer, in page order,
+    extracting every page exactly once.
+
+    source: path or binary file-like object (BytesIO, Streamlit UploadedFile)
+    max_pages: only look at the first N pages (None = all)
+    stop_after_blank_pages: stop once this many pages in a row have no
+                            text layer, e.g. scanned certificates appended
+                            after the actual CV (None = never stop early)
+    """
+    yield from _stop_early(_iter_page_texts(source, max_pages), stop_after_blank_pages)
+
+
+def _count_pages(file_bytes: bytes) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pages_parallel(file_bytes: bytes, page_count: int, workers: int) -> list[str]:
+    """
+    Splits the pages into contiguous ranges, one per worker, and
+    reassembles the per-page texts in page order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk = -(-page_count // workers)  # ceiling division
+    ranges = [(first, min(first + chunk - 1, page_count))
+              for first in range(1, page_count + 1, chunk)]
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [pool.submit(_page_range_texts, file_bytes, first, last)
+                   for first, last in ranges]
+        # Collected in submission order, so page order is preserved
+        return [text for future in futures for text in future.result()]
+
+
+def _trailing_blank_pages(page_texts: list[str]) -> int:
+    count = 0
+    for page_text in reversed(page_texts):
+        if page_text.strip():
+            break
+        count += 1
+    return count
+
+
+def _ocr_pages_until_blank_streak(file_bytes: bytes, page_texts, stop_after_blank_pages: int = None,
+                                  ocr_workers: int = None) -> list[str]:
+    """
+    Page texts with the pages without a text layer read by OCR, still
+    stopping early: pages are read up to a blank streak, the blank pages
+    so far go to OCR together, and only if the streak is still blank
+    afterwards does reading stop (the streak itself is left out). So a
+    fully scanned CV is read to the end, while pages behind appended
+    blank scans are never parsed.
+    """
+    page_texts = iter(page_texts)
+    texts = []
+    while True:
+        first_unread = len(texts)
+        exhausted = True
+        for page_text in page_texts:
+            texts.append(page_text)
+            if stop_after_blank_pages and _trailing_blank_pages(texts) >= stop_after_blank_pages:
+                exhausted = False
+                break
+        texts = _fill_blank_pages(file_bytes, texts, ocr_workers, first_page=first_unread + 1)
+        blank_streak = _trailing_blank_pages(texts)
+        if stop_after_blank_pages and blank_streak >= stop_after_blank_pages:
+            return texts[:-blank_streak]
+        if exhausted:
+            return texts
+
+
+def _fill_blank_pages(file_bytes: bytes, page_texts: list[str], ocr_workers: int = None,
+                      first_page: int = 1) -> list[str]:
+    """OCR text (ocr.py) for the pages without a text layer, from first_page (1-based) on."""
+    blank_pages = [index + 1 for index, page_text in enumerate(page_texts)
+                   if index + 1 >= first_page and not page_text.strip()]
+    if not blank_pages:
+        return page_texts
+
+    from ocr import OCR_WORKERS, ocr_pages
+
+    texts = list(page_texts)
+    for result in ocr_pages(file_bytes, blank_pages, workers=ocr_workers or OCR_WORKERS):
+        texts[result.page - 1] = result.text
+    return texts
+
+
+def extract_text_from_pdf(file_bytes: bytes, max_pages: int = None,
+                          stop_after_blank_pages: int = None,
+                          workers: int = 1,
+                          parallel_min_pages: int = PARALLEL_MIN_PAGES,
+                          ocr: bool = True, ocr_workers: int = None) -> str:
     """
     Extracts all text from a PDF file.
     pdfplumber is more accurate than PyPDF2 for German text with umlauts.
 
     file_bytes: raw bytes of the uploaded file (from Streamlit's uploader)
+    max_pages / stop_after_blank_pages: early-stop options, see iter_pdf_pages
+    workers: >1 spreads pages over that many processes (opt-in, meant for
+             batch imports — layout analysis is CPU-bound pure Python)
+    parallel_min_pages: documents with fewer pages are always extracted
+                        serially, since pool start-up would dominate
+    ocr: read pages without a text layer with Tesseract, if installed (ocr.py)
+    ocr_workers: processes for OCR (default OCR_WORKERS)
     returns: full text as a single string
     """
-    text_chunks = []
+    if ocr:
+        from ocr import ocr_available  # light; checks for Tesseract once per process
+        ocr = ocr_available()
+    # OCR needs the blank pages' numbers, so only then are pages collected
+    # (and the early stop decided on the OCR text); otherwise they stream
+    # straight into _stop_early, which stops reading at the blank streak
 
-    # BytesIO wraps the bytes so pdfplumber can treat it like an open file
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        for page_number, page in enumerate(pdf.pages):
-            page_text = page.extract_text()
-            if page_text:
-                text_chunks.append(page_text)
+    page_texts = None
+    if workers and workers > 1:
+        page_count = _count_pages(file_bytes)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+        if page_count >= max(parallel_min_pages, 2):
+            page_texts = _extract_pages_parallel(file_bytes, page_count, workers)
 
-    full_text = "\n".join(text_chunks)
+    if page_texts is None:
+        # BytesIO wraps the bytes so pdfplumber can treat it like an open file
+        page_texts = _iter_page_texts(io.BytesIO(file_bytes), max_pages)
+
+    if ocr:
+        page_texts = _ocr_pages_until_blank_streak(file_bytes, page_texts, stop_after_blank_pages, ocr_workers)
+
+    full_text = "\n".join(_stop_early(page_texts, stop_after_blank_pages))
 
     if not full_text.strip():
         return "⚠️ Could not extract text from PDF. It may be a scanned image."
@@ -33,33 +221,130 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     return full_text
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
+# ─────────────────────────────────────────────
+# DOCX — one streaming pass over the XML parts
+# ─────────────────────────────────────────────
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RUN_CHARS = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+
+
+def _iter_part_lines(stream):
+    """
+    Lines of one WordprocessingML part (document, header) in reading order:
+    paragraphs as they are, table rows as "cell | cell", nested tables as
+    rows inside their cell, text boxes (w:txbxContent) right where they are
+    anchored. Parsed with iterparse; every finished block is dropped from
+    the tree, so memory doesn't grow with the document.
     """
-    Extracts all text from a DOCX file paragraph by paragraph.
-    Also extracts text from tables (for two-column CV layouts).
+    from xml.etree.ElementTree import iterparse
 
-    file_bytes: raw bytes of the uploaded file
-    returns: full text as a single string
+    elements = []       # open elements, root first
+    paragraphs = []     # text parts per open w:p (text boxes nest paragraphs)
+    sinks = []          # lines per open table cell; empty = top level
+    rows = []           # cell texts per open w:tr
+    skip_depth = 0      # inside mc:Fallback — the same text box again, as VML
+    finished = []
+
+    def emit(line: str) -> None:
+        (sinks[-1] if sinks else finished).append(line)
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            elements.append(elem)
+            if tag == MC_FALLBACK:
+                skip_depth += 1
+            elif skip_depth:
+                continue
+            elif tag == W + "p":
+                paragraphs.append([])
+            elif tag == W + "tr":
+                rows.append([])
+            elif tag == W + "tc":
+                sinks.append([])
+            continue
+
+        elements.pop()
+        if tag == MC_FALLBACK:
+            skip_depth -= 1
+            continue
+        if skip_depth:
+            continue
+
+        parent = elements[-1].tag if elements else None
+        if tag == W + "t" and paragraphs:
+            paragraphs[-1].append(elem.text or "")
+        elif tag in _RUN_CHARS and parent == W + "r" and paragraphs:
+            paragraphs[-1].append(_RUN_CHARS[tag])
+        elif tag == W + "br" and paragraphs and elem.get(W + "type") in (None, "textWrapping"):
+            paragraphs[-1].append("\n")
+        elif tag == W + "p":
+            text = "".join(paragraphs.pop())
+            if text.strip():
+                emit(text)
+        elif tag == W + "tc":
+            cell_text = "\n".join(sinks.pop()).strip()
+            if cell_text:
+                rows[-1].append(cell_text)
+        elif tag == W + "tr":
+            cells = rows.pop()
+            if cells:
+                emit(" | ".join(cells))
+        else:
+            continue
+
+        # A top-level block is done: hand out its lines, free its subtree
+        if not paragraphs and not sinks and tag in (W + "p", W + "tr"):
+            yield from finished
+            finished.clear()
+            if elements:
+                elements[-1].clear()
+    yield from finished
+
+
+def _header_parts(archive) -> list[str]:
+    names = [name for name in archive.namelist() if name.startswith("word/header") and name.endswith(".xml")]
+    return sorted(names, key=lambda name: int("0" + "".join(filter(str.isdigit, name))))
+
+
+def iter_docx_lines(source):
     """
-    doc = Document(io.BytesIO(file_bytes))
-    text_chunks = []
+    Shared DOCX extraction engine — parser.py routes through this too.
+    Yields the text lines of a .docx in reading order: page headers first
+    (name and contact details often live there; each distinct line once),
+    then the body with paragraphs, tables (row by row, cells joined by
+    " | "), nested tables and text boxes where they appear.
+    Streams word/document.xml straight out of the ZIP instead of building
+    python-docx's object model.
 
-    # Extract regular paragraphs
-    for para in doc.paragraphs:
-        if para.text.strip():
-            text_chunks.append(para.text)
+    source: path, raw bytes or binary file-like object (BytesIO, Streamlit UploadedFile)
+    """
+    import zipfile
 
-    # Extract text from tables (important: two-column CVs store data in tables)
-    for table in doc.tables:
-        for row in table.rows:
-            row_text = []
-            for cell in row.cells:
-                if cell.text.strip():
-                    row_text.append(cell.text.strip())
-            if row_text:
-                text_chunks.append(" | ".join(row_text))
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with zipfile.ZipFile(source) as archive:
+        seen = set()
+        for name in _header_parts(archive):
+            with archive.open(name) as part:
+                for line in _iter_part_lines(part):
+                    if line not in seen:
+                        seen.add(line)
+                        yield line
+        with archive.open("word/document.xml") as part:
+            yield from _iter_part_lines(part)
+
+
+def extract_text_from_docx(file_bytes: bytes) -> str:
+    """
+    Extracts all text from a DOCX file in reading order (see iter_docx_lines),
+    so the dates and details of two-column CV tables stay together.
 
-    full_text = "\n".join(text_chunks)
+    file_bytes: raw bytes of the uploaded file
+    returns: full text as a single string
+    """
+    full_text = "\n".join(iter_docx_lines(file_bytes))
 
     if not full_text.strip():
         return "⚠️ Could not extract text from DOCX file."
@@ -70,21 +355,49 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
 def extract_cv_text(uploaded_file) -> str:
     """
     Main entry point — detects file type and routes to correct extractor.
+    Results are cached by file content, so Streamlit reruns with the same
+    upload cost a dictionary lookup instead of a full re-parse.
 
     uploaded_file: Streamlit UploadedFile object
     returns: extracted text string
     """
     if uploaded_file is None:
         return None
+    return extract_text(uploaded_file.read(), uploaded_file.name)
 
-    file_bytes = uploaded_file.read()
-    filename = uploaded_file.name.lower()
 
+def extract_text(file_bytes: bytes, filename: str) -> str:
+    """
+    extract_cv_text for raw bytes (batch imports, the generation service).
+    filename: only its extension picks the extractor
+    """
+    extension = os.path.splitext(filename.lower())[1].lstrip(".") or "none"
+    if extension == "pdf":
+        # What a scanned PDF yields depends on the installed OCR languages, so
+        # installing Tesseract later mustn't keep serving the old "⚠️" text
+        from ocr import ocr_languages
+        extension = f"pdf-ocr:{ocr_languages() or 'none'}"
+    cache_key = f"v{EXTRACTOR_VERSION}-{extension}-{content_hash(file_bytes)}"
+    cached_text = _text_cache.get(cache_key)
+    if cached_text is not None:
+        return cached_text
+
+    text = _extract_by_type(file_bytes, filename.lower(), filename)
+    _text_cache.set(cache_key, text)
+    return text
+
+
+@timed("extract_cv_text")  # cache misses only
+def _extract_by_type(file_bytes: bytes, filename: str, display_name: str) -> str:
     if filename.endswith(".pdf"):
         return extract_text_from_pdf(file_bytes)
 
-    elif filename.endswith(".docx") or filename.endswith(".doc"):
+    elif filename.endswith(".docx"):
         return extract_text_from_docx(file_bytes)
 
+    elif filename.endswith(".doc"):
+        # Word 97 binary format — not ZIP-based, the DOCX reader can't open it
+        return f"⚠️ Legacy Word format not supported: {display_name} — please save it as .docx or PDF"
+
     else:
-        return f"⚠️ Unsupported file format: {uploaded_file.name}"
+        return f"⚠️ Unsupported file format: {display_name}"
@@ -1,210 +1,279 @@
 # document_builder.py
 from docx import Document
-from docx.shared import Pt, Cm, RGBColor, Inches
+from docx.shared import Pt, Cm, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+from functools import lru_cache
+from cache import LRUCache, content_hash
+from metrics import timed
+from document_model import (
+    CVDocument, CoverLetterDocument, Paragraph, Span, document_hash, parse_cv_text, parse_cover_letter_text
+)
+from typing import Union
+import copy
 import io
+import os
 
+# Page setup and all fonts, sizes, colors and spacing live as named styles
+# in this template (see templates/make_base_template.py); the builders
+# below only pick a style per paragraph.
+BASE_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "base.docx")
 
-def create_cv_document(cv_text: str, full_name: str, photo_path: str = None) -> io.BytesIO:
+# Bump whenever the layout/styling below changes, so memoized documents
+# rendered by the old code are not served any more
+TEMPLATE_VERSION = 4
+
+# Finished .docx files, shared by all sessions. Streamlit reruns the whole
+# script on every click, and without this each rerun would rebuild both
+# documents just to feed st.download_button the same bytes again.
+_rendered_documents = LRUCache(max_bytes=int(os.getenv("DOCX_CACHE_MAX_BYTES", 64 * 1024 * 1024)))
+
+
+# CV layouts:
+#   table     — consecutive "date | content" entries of a section share one
+#               borderless two-column table; bullets and detail lines of an
+#               entry go into its content cell (default)
+#   per_entry — one separate 1x2 table per entry, bullets in between
+CV_LAYOUTS = ("table", "per_entry")
+
+CV_TABLE_STYLE = "CV Tabelle"
+DATE_COLUMN_WIDTH = Inches(1.8)
+CONTENT_COLUMN_WIDTH = Inches(4.2)
+
+
+@lru_cache(maxsize=1)
+def _base_template() -> tuple:
+    """The parsed base template and its style name → style id map, loaded once per process."""
+    doc = Document(BASE_TEMPLATE_PATH)
+    return doc, {style.name: style.style_id for style in doc.styles}
+
+
+def _new_document() -> Document:
+    # Deep-copying the parsed package is cheaper than reading the .docx again
+    return copy.deepcopy(_base_template()[0])
+
+
+def _style_id(name: str) -> str:
+    return _base_template()[1][name]
+
+
+def _add_paragraph(container, style: str, spans: list[Span] = ()):
+    # python-docx resolves a style *name* by scanning every style in the
+    # document on each call — the ids are known, so set them directly
+    para = container.add_paragraph()
+    para._p.style = _style_id(style)
+    _add_runs(para, spans)
+    return para
+
+
+def _add_runs(para, spans: list[Span]) -> None:
+    # Only bold is set on runs; font, size and color come from the paragraph style
+    for span in spans:
+        run = para.add_run(span.text)
+        if span.bold:
+            run.bold = True
+
+
+def _add_entry_table(doc):
+    table = doc.add_table(rows=0, cols=2)
+    table._tbl.tblStyle_val = _style_id(CV_TABLE_STYLE)
+    table.autofit = False
+    # Column widths live in the table grid; rows added later inherit them
+    table.columns[0].width = DATE_COLUMN_WIDTH
+    table.columns[1].width = CONTENT_COLUMN_WIDTH
+    return table
+
+
+def _add_cv_paragraph(container, paragraph: Paragraph, indent_bullets: bool = False) -> None:
+    if paragraph.kind == "bullet":
+        para = _add_paragraph(container, "CV Aufzählung", paragraph.spans)
+        if indent_bullets:
+            para.paragraph_format.left_indent = Cm(2.5)
+    else:
+        _add_paragraph(container, "CV Text", paragraph.spans)
+
+
+@timed("build_cv_document")
+def build_cv_document(cv: Union[CVDocument, str], full_name: str, photo: bytes = None,
+                      layout: str = "table") -> Document:
     """
-    Creates a two-column German CV with photo (if provided).
-    Tight spacing (6pt between sections, no extra line breaks).
+    Renders the CV as a python-docx Document (not yet saved).
+    cv: parsed CVDocument, or raw CV text (parsed here)
+    photo: image bytes, ideally from photo.prepare_photo
+    layout: one of CV_LAYOUTS
     """
-    if not cv_text or not isinstance(cv_text, str):
-        raise ValueError(f"cv_text must be a non-empty string, got: {type(cv_text)}")
+    if isinstance(cv, str) or cv is None:
+        cv = parse_cv_text(cv)
+    if layout not in CV_LAYOUTS:
+        raise ValueError(f"layout must be one of {CV_LAYOUTS}, got: {layout!r}")
 
-    doc = Document()
-
-    # DIN 5008 margins (2.5cm all around except 2cm right)
-    for section in doc.sections:
-        section.top_margin = Cm(2.5)
-        section.bottom_margin = Cm(2.5)
-        section.left_margin = Cm(2.5)
-        section.right_margin = Cm(2.0)
-        section.page_height = Cm(29.7)  # A4
-        section.page_width = Cm(21.0)
+    # A4 with DIN 5008 margins, from the template
+    doc = _new_document()
 
     # --- HEADER WITH NAME + PHOTO ---
     header_table = doc.add_table(rows=1, cols=2)
     header_table.autofit = False
     header_table.allow_autofit = False
+    if layout == "table":
+        header_table._tbl.tblStyle_val = _style_id(CV_TABLE_STYLE)
 
     # Left cell: Name
     left_cell = header_table.rows[0].cells[0]
     left_cell.width = Inches(4.5)
     name_para = left_cell.paragraphs[0]
-    name_run = name_para.add_run(full_name.upper())
-    name_run.bold = True
-    name_run.font.size = Pt(16)
-    name_run.font.name = "Arial"
-    name_run.font.color.rgb = RGBColor(0x1F, 0x35, 0x64)
+    name_para._p.style = _style_id("CV Name")
+    name_para.add_run(full_name.upper())
 
     # Right cell: Photo placeholder
     right_cell = header_table.rows[0].cells[1]
     right_cell.width = Inches(1.5)
     photo_para = right_cell.paragraphs[0]
     photo_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-    if photo_path:
+    if photo:
         try:
-            photo_para.add_run().add_picture(photo_path, width=Cm(3.5), height=Cm(4.5))
+            photo_para.add_run().add_picture(io.BytesIO(photo), width=Cm(3.5), height=Cm(4.5))
         except:
-            photo_para.add_run("[Foto einfügen]").font.size = Pt(8)
+            photo_para.add_run("[Foto einfügen]")._r.style = _style_id("Foto Platzhalter")
     else:
-        photo_para.add_run("[Foto]").font.size = Pt(8)
-        photo_para.add_run("[Foto]").font.color.rgb = RGBColor(0xCC, 0xCC, 0xCC)
+        photo_para.add_run("[Foto]")._r.style = _style_id("Foto Platzhalter")
 
     # Remove table borders
-    for row in header_table.rows:
-        for cell in row.cells:
-            set_cell_border(cell, top={"sz": 0}, bottom={"sz": 0}, start={"sz": 0}, end={"sz": 0})
+    if layout == "per_entry":
+        for row in header_table.rows:
+            for cell in row.cells:
+                set_cell_border(cell, top={"sz": 0}, bottom={"sz": 0}, start={"sz": 0}, end={"sz": 0})
 
     doc.add_paragraph()  # Spacer after header
 
-    # --- PARSE CV TEXT INTO SECTIONS ---
-    lines = cv_text.split("\n")
-    current_section = None
-
-    for line in lines:
-        line = line.strip()
-
-        if not line or line == "---":
-            continue
-
-        # Detect section headers (all caps or **SECTION**)
-        if line.startswith("**") and line.endswith("**") and line.isupper():
-            # New section header
-            current_section = line.replace("**", "").strip()
-            para = doc.add_paragraph()
-            para.paragraph_format.space_before = Pt(6)  # 6pt before section
-            para.paragraph_format.space_after = Pt(0)  # 0pt after section
-            run = para.add_run(current_section)
-            run.bold = True
-            run.font.size = Pt(11)
-            run.font.name = "Arial"
-            run.font.color.rgb = RGBColor(0x1F, 0x35, 0x64)
-            continue
-
-        # Two-column entries (e.g., "MM/YYYY – MM/YYYY | Content")
-        if "|" in line:
-            parts = line.split("|", 1)
-            date_part = parts[0].strip()
-            content_part = parts[1].strip() if len(parts) > 1 else ""
-
-            # Create a 2-column table for this entry
-            entry_table = doc.add_table(rows=1, cols=2)
-            entry_table.autofit = False
-
-            # Left column: date
-            left = entry_table.rows[0].cells[0]
-            left.width = Inches(1.8)
-            left_para = left.paragraphs[0]
-            left_run = left_para.add_run(date_part)
-            left_run.font.size = Pt(10)
-            left_run.font.name = "Arial"
-
-            # Right column: content
-            right = entry_table.rows[0].cells[1]
-            right.width = Inches(4.2)
-            right_para = right.paragraphs[0]
-
-            # Handle bold within content (**text**)
-            content_parts = content_part.split("**")
-            for i, part in enumerate(content_parts):
-                if part:
-                    run = right_para.add_run(part)
-                    run.bold = (i % 2 == 1)
-                    run.font.size = Pt(10)
-                    run.font.name = "Arial"
-
-            # Remove table borders
-            for row in entry_table.rows:
-                for cell in row.cells:
+    # --- SECTIONS ---
+    for section in cv.sections:
+        if section.title:
+            _add_paragraph(doc, "CV Abschnitt", [Span(text=section.title)])
+
+        entry_table = None      # table layout: the section's table so far
+        for item in section.items:
+            if isinstance(item, Paragraph):
+                entry_table = None
+                _add_cv_paragraph(doc, item, indent_bullets=True)
+                continue
+
+            # Two-column entry: date | content
+            if layout == "table":
+                if entry_table is None:
+                    entry_table = _add_entry_table(doc)
+                left, right = entry_table.add_row().cells
+            else:
+                # Create a 2-column table for this entry
+                single_table = doc.add_table(rows=1, cols=2)
+                single_table.autofit = False
+                left, right = single_table.rows[0].cells
+                left.width = DATE_COLUMN_WIDTH
+                right.width = CONTENT_COLUMN_WIDTH
+                # Remove table borders
+                for cell in (left, right):
                     set_cell_border(cell, top={"sz": 0}, bottom={"sz": 0}, start={"sz": 0}, end={"sz": 0})
-                    cell.paragraphs[0].paragraph_format.space_before = Pt(0)
-                    cell.paragraphs[0].paragraph_format.space_after = Pt(2)
 
-        # Bullet points
-        elif line.startswith("•") or line.startswith("* "):
-            para = doc.add_paragraph(style="List Bullet")
-            para.paragraph_format.left_indent = Cm(2.5)
-            para.paragraph_format.space_before = Pt(0)
-            para.paragraph_format.space_after = Pt(2)
-            run = para.add_run(line.lstrip("•* "))
-            run.font.size = Pt(10)
-            run.font.name = "Arial"
+            left.paragraphs[0]._p.style = _style_id("CV Datum")
+            _add_runs(left.paragraphs[0], [Span(text=item.date)])
+            right.paragraphs[0]._p.style = _style_id("CV Text")
+            _add_runs(right.paragraphs[0], item.content)
 
-        # Regular text line
-        else:
-            para = doc.add_paragraph()
-            para.paragraph_format.space_before = Pt(0)
-            para.paragraph_format.space_after = Pt(2)
-
-            # Handle inline bold
-            parts = line.split("**")
-            for i, part in enumerate(parts):
-                if part:
-                    run = para.add_run(part)
-                    run.bold = (i % 2 == 1)
-                    run.font.size = Pt(10)
-                    run.font.name = "Arial"
-
-    # Save to memory
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+            # Bullets and detail lines: inside the content cell, or below the entry
+            for detail in item.details:
+                if layout == "table":
+                    _add_cv_paragraph(right, detail)
+                else:
+                    _add_cv_paragraph(doc, detail, indent_bullets=True)
 
+    return doc
 
-def create_cover_letter_document(cl_text: str, full_name: str) -> io.BytesIO:
-    """DIN 5008 compliant cover letter, strictly 1 page."""
-    if not cl_text or not isinstance(cl_text, str):
-        raise ValueError(f"cl_text must be a non-empty string, got: {type(cl_text)}")
 
-    doc = Document()
+@timed("build_cover_letter_document")
+def build_cover_letter_document(cover_letter: Union[CoverLetterDocument, str], full_name: str) -> Document:
+    """
+    Renders the cover letter as a python-docx Document (not yet saved).
+    cover_letter: parsed CoverLetterDocument, or raw text (parsed here)
+    """
+    if isinstance(cover_letter, str) or cover_letter is None:
+        cover_letter = parse_cover_letter_text(cover_letter)
 
+    doc = _new_document()
     for section in doc.sections:
-        section.top_margin = Cm(2.5)
         section.bottom_margin = Cm(2.0)
-        section.left_margin = Cm(2.5)
-        section.right_margin = Cm(2.0)
-        section.page_height = Cm(29.7)
-        section.page_width = Cm(21.0)
-
-    for line in cl_text.split("\n"):
-        line = line.strip()
-        if not line or line == "---":
-            doc.add_paragraph()
-            continue
 
-        para = doc.add_paragraph()
-        para.paragraph_format.space_after = Pt(6)
+    for paragraph in cover_letter.paragraphs:
+        if paragraph.kind == "blank":
+            doc.add_paragraph()
+        elif paragraph.kind == "subject":
+            _add_paragraph(doc, "Anschreiben Betreff", paragraph.spans)
+        else:
+            _add_paragraph(doc, "Anschreiben Text", paragraph.spans)
+    return doc
 
-        # Detect subject line (bold, no **markers**)
-        if "Bewerbung als" in line or "bewerbung als" in line.lower():
-            para.paragraph_format.space_before = Pt(12)
-            run = para.add_run(line.replace("**", ""))
-            run.bold = True
-            run.font.size = Pt(11)
-            run.font.name = "Arial"
-            continue
-
-        # Handle inline bold
-        parts = line.split("**")
-        for i, part in enumerate(parts):
-            if part:
-                run = para.add_run(part)
-                run.bold = (i % 2 == 1)
-                run.font.size = Pt(10.5)
-                run.font.name = "Arial"
 
+def _save(doc: Document) -> io.BytesIO:
     buffer = io.BytesIO()
-    doc.save(buffer)
+    with timed("save_docx"):
+        doc.save(buffer)
     buffer.seek(0)
     return buffer
 
 
+def create_cv_document(cv: Union[CVDocument, str], full_name: str, photo: bytes = None,
+                       layout: str = "table") -> io.BytesIO:
+    """
+    Creates a two-column German CV with photo (if provided).
+    Tight spacing (6pt between sections, no extra line breaks).
+    """
+    return _save(build_cv_document(cv, full_name, photo=photo, layout=layout))
+
+
+def create_cover_letter_document(cover_letter: Union[CoverLetterDocument, str], full_name: str) -> io.BytesIO:
+    """DIN 5008 compliant cover letter, strictly 1 page."""
+    return _save(build_cover_letter_document(cover_letter, full_name))
+
+
+def cv_document_bytes(cv: Union[CVDocument, str], full_name: str, photo: bytes = None,
+                      layout: str = "table") -> bytes:
+    """
+    create_cv_document, memoized: same CV, name, photo and template
+    version → the same finished .docx bytes, without rebuilding.
+    """
+    key = "|".join([
+        "cv", str(TEMPLATE_VERSION), layout, document_hash(cv),
+        content_hash(full_name.encode("utf-8")), content_hash(photo) if photo else "none",
+    ])
+    document = _rendered_documents.get(key)
+    if document is None:
+        document = create_cv_document(cv, full_name, photo=photo, layout=layout).getvalue()
+        _rendered_documents.set(key, document)
+    return document
+
+
+def cover_letter_document_bytes(cover_letter: Union[CoverLetterDocument, str], full_name: str) -> bytes:
+    """create_cover_letter_document, memoized like cv_document_bytes."""
+    key = "|".join([
+        "cl", str(TEMPLATE_VERSION), document_hash(cover_letter),
+        content_hash(full_name.encode("utf-8")),
+    ])
+    document = _rendered_documents.get(key)
+    if document is None:
+        document = create_cover_letter_document(cover_letter, full_name).getvalue()
+        _rendered_documents.set(key, document)
+    return document
+
+
+def create_application_documents(cv: Union[CVDocument, str], cover_letter: Union[CoverLetterDocument, str],
+                                 full_name: str, photo: bytes = None) -> tuple[bytes, bytes]:
+    """
+    Fetches CV and cover letter from the memo cache, building any misses
+    one after the other — python-docx is pure Python and holds the GIL, so
+    threads wouldn't build them any faster. Returns (cv_bytes, cl_bytes).
+    """
+    return cv_document_bytes(cv, full_name, photo=photo), cover_letter_document_bytes(cover_letter, full_name)
+
+
 def set_cell_border(cell, **kwargs):
     """
     Helper to remove table borders (makes the two-column layout look clean).
@@ -0,0 +1,173 @@
+# document_model.py
+# Typed document model between generator and document_builder.
+# The generated text is parsed ONCE into sections, dated entries, bullets
+# and bold spans; the app keeps the model in session state and the
+# builders render from it on every rerun instead of re-running the line
+# heuristics (isupper(), "|" in line, "Bewerbung als" ...) each time.
+#
+#   CVDocument
+#   └── Section (title, or None for lines before the first header)
+#       ├── Paragraph          — plain line / bullet before the first entry
+#       └── Entry              — "date | content" line
+#           └── Paragraph      — bullets and detail lines of that entry
+#
+#   CoverLetterDocument
+#   └── Paragraph (text / subject / blank)
+#
+# In JSON mode Gemini answers with a models.GeneratedCV instead of text;
+# cv_document_from_generated maps that onto the same model without any
+# text heuristics.
+
+from typing import Literal, Optional, Union
+
+from pydantic import BaseModel
+
+from cache import content_hash
+from metrics import timed
+from models import CVEntry, GeneratedCV
+
+
+class Span(BaseModel):
+    text: str
+    bold: bool = False
+
+
+class Paragraph(BaseModel):
+    kind: Literal["text", "bullet", "subject", "blank"] = "text"
+    spans: list[Span] = []
+
+
+class Entry(BaseModel):
+    date: str
+    content: list[Span] = []
+    details: list[Paragraph] = []
+
+
+class Section(BaseModel):
+    title: Optional[str] = None
+    items: list[Union[Entry, Paragraph]] = []
+
+
+class CVDocument(BaseModel):
+    sections: list[Section] = []
+
+
+class CoverLetterDocument(BaseModel):
+    paragraphs: list[Paragraph] = []
+
+
+def parse_spans(text: str) -> list[Span]:
+    """"**bold**" markers → alternating plain/bold spans."""
+    return [Span(text=part, bold=(i % 2 == 1)) for i, part in enumerate(text.split("**")) if part]
+
+
+def _is_section_header(line: str) -> bool:
+    return line.startswith("**") and line.endswith("**") and line.isupper()
+
+
+def _is_bullet(line: str) -> bool:
+    return line.startswith("•") or line.startswith("* ")
+
+
+@timed("parse_cv_text")
+def parse_cv_text(cv_text: str) -> CVDocument:
+    """Parses CV text in the format generator.build_cv_prompt asks for."""
+    if not cv_text or not isinstance(cv_text, str):
+        raise ValueError(f"cv_text must be a non-empty string, got: {type(cv_text)}")
+
+    section = Section()
+    sections = [section]
+    entry = None    # details after an entry belong to it
+
+    for line in cv_text.split("\n"):
+        line = line.strip()
+        if not line or line == "---":
+            continue
+
+        if _is_section_header(line):
+            section = Section(title=line.replace("**", "").strip())
+            sections.append(section)
+            entry = None
+        elif "|" in line:
+            date_part, _, content_part = line.partition("|")
+            entry = Entry(date=date_part.strip(), content=parse_spans(content_part.strip()))
+            section.items.append(entry)
+        else:
+            if _is_bullet(line):
+                paragraph = Paragraph(kind="bullet", spans=parse_spans(line.lstrip("•* ")))
+            else:
+                paragraph = Paragraph(spans=parse_spans(line))
+            (entry.details if entry is not None else section.items).append(paragraph)
+
+    if not sections[0].items:
+        sections.pop(0)
+    return CVDocument(sections=sections)
+
+
+@timed("parse_cover_letter_text")
+def parse_cover_letter_text(cl_text: str) -> CoverLetterDocument:
+    """Parses cover letter text: one paragraph per line, subject line detected."""
+    if not cl_text or not isinstance(cl_text, str):
+        raise ValueError(f"cl_text must be a non-empty string, got: {type(cl_text)}")
+
+    paragraphs = []
+    for line in cl_text.split("\n"):
+        line = line.strip()
+        if not line or line == "---":
+            paragraphs.append(Paragraph(kind="blank"))
+        elif "bewerbung als" in line.lower():
+            # Subject line is bold as a whole, **markers** or not
+            paragraphs.append(Paragraph(kind="subject", spans=[Span(text=line.replace("**", ""), bold=True)]))
+        else:
+            paragraphs.append(Paragraph(spans=parse_spans(line)))
+    return CoverLetterDocument(paragraphs=paragraphs)
+
+
+def document_hash(document: Union[str, BaseModel]) -> str:
+    """Cache key part for a document: raw text as is, a parsed model via its JSON."""
+    if isinstance(document, str):
+        return content_hash(document.encode("utf-8"))
+    return content_hash(document.model_dump_json().encode("utf-8"))
+
+
+def _entry_date(entry: CVEntry) -> str:
+    return f"{entry.start} – {entry.end}" if entry.end else entry.start
+
+
+def _entry_rest(entry: CVEntry) -> str:
+    return ", ".join(filter(None, [entry.organization, entry.location]))
+
+
+def cv_document_from_generated(cv: GeneratedCV) -> CVDocument:
+    """Structured Gemini output → document model, field by field."""
+    sections = []
+    for generated in cv.sections:
+        section = Section(title=generated.title.upper())
+        section.items.extend(Paragraph(spans=[Span(text=line)]) for line in generated.lines)
+        for entry in generated.entries:
+            content = [Span(text=entry.title, bold=True)]
+            if _entry_rest(entry):
+                content.append(Span(text=f", {_entry_rest(entry)}"))
+            section.items.append(Entry(
+                date=_entry_date(entry),
+                content=content,
+                details=[Paragraph(kind="bullet", spans=[Span(text=b)]) for b in entry.bullets]
+                        + [Paragraph(spans=[Span(text=d)]) for d in entry.details],
+            ))
+        sections.append(section)
+    return CVDocument(sections=sections)
+
+
+def cv_text_from_generated(cv: GeneratedCV) -> str:
+    """Structured Gemini output → the text format of text mode (previews, batch files)."""
+    lines = []
+    for section in cv.sections:
+        lines.append(f"**{section.title.upper()}**")
+        lines.extend(section.lines)
+        for entry in section.entries:
+            rest = f", {_entry_rest(entry)}" if _entry_rest(entry) else ""
+            lines.append(f"{_entry_date(entry)} | **{entry.title}**{rest}")
+            lines.extend(f"• {bullet}" for bullet in entry.bullets)
+            lines.extend(entry.details)
+        lines.append("")
+    return "\n".join(lines).strip()
@@ -0,0 +1,309 @@
+# fake_gemini.py
+# Local stand-in for genai.Client — same call shape as
+# client.models.generate_content / generate_content_stream, but answers
+# instantly (or after a configurable delay) with deterministic text in the
+# format our prompts ask for. Used for batch dry runs and benchmarks, so
+# neither needs an API key or burns quota. StubServer (bottom) serves the
+# same answers over HTTP for tests of the real client.
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from google.genai import errors
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class FakeResponse:
+    """usage_text: the text billed (default: text); prompt=None means no usage metadata."""
+
+    def __init__(self, text: str, prompt: str = None, usage_text: str = None):
+        self.text = text
+        # ~4 characters per token is close enough for German prose
+        self.usage_metadata = None
+        if prompt is not None:
+            billed = text if usage_text is None else usage_text
+            self.usage_metadata = FakeUsage(len(prompt) // 4, len(billed) // 4)
+
+
+def _field(prompt: str, label: str, default: str) -> str:
+    match = re.search(rf"^-?\s*{label}:\s*(.+)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def fake_cv_text(prompt: str, n_entries: int = 4) -> str:
+    position = _field(prompt, "ZIELPOSITION", "BIM Manager")
+    lines = [
+        "**PERSÖNLICHE DATEN**",
+        f"Geburtsdatum: {_field(prompt, 'Geburtsdatum', '01.01.1990')}",
+        f"Wohnort: {_field(prompt, 'Wohnort', 'Berlin')}",
+        f"E-Mail: {_field(prompt, 'E-Mail', 'max@example.de')}",
+        "",
+        "**BERUFSERFAHRUNG**",
+    ]
+    for i in range(n_entries):
+        lines += [
+            f"01/{2024 - 2 * i} – 12/{2025 - 2 * i} | **{position}**, Musterbau GmbH {i + 1}, Leipzig",
+            "• Koordination der Fachmodelle und Kollisionsprüfung nach ISO 19650",
+            "• Pflege der BIM-Abwicklungspläne und Schulung der Projektteams",
+            "",
+        ]
+    lines += [
+        "**AUSBILDUNG**",
+        f"10/2008 – 09/2013 | **{_field(prompt, 'Abschluss', 'M.Sc. Bauingenieurwesen')}**, "
+        f"{_field(prompt, 'Universität', 'TU Dresden')}",
+        "",
+        "**SPRACHEN**",
+        "Deutsch – Muttersprache",
+        "Englisch – Verhandlungssicher",
+    ]
+    return "\n".join(lines)
+
+
+def fake_cv_json(prompt: str, n_entries: int = 4) -> str:
+    """fake_cv_text as JSON per models.GeneratedCV (JSON mode)."""
+    position = _field(prompt, "ZIELPOSITION", "BIM Manager")
+    return json.dumps({"sections": [
+        {"title": "PERSÖNLICHE DATEN", "lines": [
+            f"Geburtsdatum: {_field(prompt, 'Geburtsdatum', '01.01.1990')}",
+            f"Wohnort: {_field(prompt, 'Wohnort', 'Berlin')}",
+            f"E-Mail: {_field(prompt, 'E-Mail', 'max@example.de')}",
+        ]},
+        {"title": "BERUFSERFAHRUNG", "entries": [
+            {"start": f"01/{2024 - 2 * i}", "end": f"12/{2025 - 2 * i}", "title": position,
+             "organization": f"Musterbau GmbH {i + 1}", "location": "Leipzig",
+             "bullets": ["Koordination der Fachmodelle und Kollisionsprüfung nach ISO 19650",
+                         "Pflege der BIM-Abwicklungspläne und Schulung der Projektteams"]}
+            for i in range(n_entries)
+        ]},
+        {"title": "AUSBILDUNG", "entries": [
+            {"start": "10/2008", "end": "09/2013",
+             "title": _field(prompt, "Abschluss", "M.Sc. Bauingenieurwesen"),
+             "organization": _field(prompt, "Universität", "TU Dresden")},
+        ]},
+        {"title": "SPRACHEN", "lines": ["Deutsch – Muttersprache", "Englisch – Verhandlungssicher"]},
+    ]}, ensure_ascii=False)
+
+
+def _wants_json(config) -> bool:
+    if config is None:
+        return False
+    mime_type = config.get("response_mime_type") if isinstance(config, dict) else config.response_mime_type
+    return mime_type == "application/json"
+
+
+def fake_cover_letter_text(prompt: str) -> str:
+    name = _field(prompt, "Name", "Max Mustermann")
+    position = _field(prompt, "POSITION", "BIM Manager")
+    company = _field(prompt, "UNTERNEHMEN", "Musterbau GmbH")
+    return "\n".join([
+        name,
+        f"{_field(prompt, 'Wohnort', 'Berlin')}",
+        "",
+        company,
+        "Personalabteilung",
+        "",
+        f"**Bewerbung als {position}**",
+        "",
+        "Sehr geehrte Damen und Herren,",
+        "",
+        f"mit großem Interesse habe ich Ihre Ausschreibung als {position} gelesen.",
+        "In meinen bisherigen Projekten habe ich BIM-Prozesse nach ISO 19650 aufgebaut.",
+        "Über eine Einladung zu einem persönlichen Gespräch freue ich mich sehr.",
+        "",
+        "Mit freundlichen Grüßen",
+        "",
+        name,
+    ])
+
+
+class FakeModels:
+    def __init__(self, owner: "FakeClient"):
+        self._owner = owner
+
+    def generate_content(self, model: str, contents: str, config=None) -> FakeResponse:
+        self._owner._before_call()
+        return FakeResponse(self._owner.answer(contents, json_mode=_wants_json(config)), contents)
+
+    def generate_content_stream(self, model: str, contents: str, config=None):
+        self._owner._before_call()
+        text = self._owner.answer(contents, json_mode=_wants_json(config))
+        step = self._owner.stream_chunk_chars
+        for i in range(0, len(text), step):
+            last = i + step >= len(text)
+            # Like the API: the usage totals arrive with the last chunk
+            yield FakeResponse(text[i:i + step], contents if last else None, usage_text=text)
+
+
+class FakeClient:
+    """
+    latency: seconds every call sleeps before answering
+    error_rate: share of calls (0..1) that fail with a 429 like the real API
+    seed: makes the injected errors reproducible
+    cv_entries: positions in a generated CV, i.e. how long the CV answer is
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 stream_chunk_chars: int = 200, cv_entries: int = 4):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stream_chunk_chars = stream_chunk_chars
+        self.cv_entries = cv_entries
+        self.calls = 0
+        self.models = FakeModels(self)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _before_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise errors.ClientError(429, {"error": {
+                "code": 429, "message": "Resource has been exhausted (fake)", "status": "RESOURCE_EXHAUSTED",
+            }})
+
+    def answer(self, prompt: str, json_mode: bool = False) -> str:
+        if "Lebenslauf" in prompt:
+            if json_mode:
+                return fake_cv_json(prompt, self.cv_entries)
+            return fake_cv_text(prompt, self.cv_entries)
+        return fake_cover_letter_text(prompt)
+
+
+# ─────────────────────────────────────────────
+# STUB SERVER — the same answers over HTTP, in the REST format of the
+# Gemini API, so the real google-genai client (timeouts, connection pool,
+# gemini_client.py retries and breaker) runs without the API:
+#   python fake_gemini.py --port 8765 --latency 0.5 --error-rate 0.2
+#   GEMINI_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=x streamlit run app.py
+# ─────────────────────────────────────────────
+ERROR_STATUS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED"}
+
+
+def _rest_response(text: str, prompt: str, usage_text: str = None) -> dict:
+    """usage_text: the text billed; None leaves out usageMetadata (all but the last stream chunk)."""
+    response = {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+    }
+    if usage_text is not None:
+        usage = FakeUsage(len(prompt) // 4, len(usage_text) // 4)
+        response["usageMetadata"] = {
+            "promptTokenCount": usage.prompt_token_count,
+            "candidatesTokenCount": usage.candidates_token_count,
+            "totalTokenCount": usage.total_token_count,
+        }
+    return response
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        error_code = server.before_request()
+        if error_code:
+            error = {"code": error_code, "message": "Injected error (fake)", "status": ERROR_STATUS[error_code]}
+            self._send(error_code, json.dumps({"error": error}).encode("utf-8"))
+            return
+
+        prompt = "".join(part.get("text", "") for content in request.get("contents", [])
+                         for part in content.get("parts", []))
+        json_mode = request.get("generationConfig", {}).get("responseMimeType") == "application/json"
+        text = server.fake.answer(prompt, json_mode=json_mode)
+
+        if ":streamGenerateContent" in self.path:
+            step = server.fake.stream_chunk_chars
+            events = [_rest_response(text[i:i + step], prompt, text if i + step >= len(text) else None)
+                      for i in range(0, len(text), step)]
+            body = "".join(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n" for event in events)
+            self._send(200, body.encode("utf-8"), "text/event-stream")
+        else:
+            self._send(200, json.dumps(_rest_response(text, prompt, text), ensure_ascii=False).encode("utf-8"))
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for the Gemini API with injected latency and errors.
+    port 0 picks a free port; see .url. error_codes: what a failing request
+    answers with, picked at random.
+    """
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                 error_codes: tuple = (429, 503), seed: int = 0):
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_codes = error_codes
+        self.fake = FakeClient()
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def before_request(self):
+        """Counts the request, waits the latency; returns the error code to answer with, or None."""
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.error_rate
+            error_code = self._random.choice(self.error_codes) if fail else None
+        if self.latency:
+            time.sleep(self.latency)
+        return error_code
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self.serve_forever, name="gemini-stub", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Local Gemini stub server with injected latency and errors")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="seconds before every answer")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail (0..1)")
+    arg_parser.add_argument("--error-codes", type=int, nargs="+", default=[429, 503],
+                            choices=sorted(ERROR_STATUS))
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    server = StubServer(args.port, args.latency, args.error_rate, tuple(args.error_codes), args.seed)
+    print(f"Gemini stub on {server.url} — set GEMINI_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+# gemini_client.py
+# Everything between our code and the Gemini API that isn't the prompt:
+#   - ONE genai.Client per process, on a pooled keep-alive HTTP connection
+#     and with a timeout per attempt
+#   - retries on 429 / 5xx / timeouts with exponential backoff and full
+#     jitter, inside an overall deadline per request
+#   - a circuit breaker: after GEMINI_BREAKER_THRESHOLD transient failures
+#     in a row, calls fail fast for a cooldown instead of piling more
+#     traffic (and more manual "retry" clicks) onto a degraded API
+#   - a limit on concurrent requests, shared by all Streamlit sessions and
+#     batch threads of the process
+#
+# The manager wraps calls to whatever client it is handed — the real one
+# (manager.client) or fake_gemini.FakeClient. To run against injected
+# latency and errors over real HTTP, start `python fake_gemini.py`
+# and set GEMINI_BASE_URL to its address.
+#
+# All settings come from environment variables, see settings_from_env().
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+# HTTP status codes worth retrying: request timeout, quota exhausted, server trouble
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class ClientSettings(NamedTuple):
+    timeout: float = 60.0           # seconds per attempt (HTTP read timeout)
+    deadline: float = 180.0         # seconds per request: all attempts + backoff
+    max_retries: int = 3
+    backoff_base: float = 1.0       # first backoff ceiling, doubled per retry
+    backoff_max: float = 30.0
+    max_concurrency: int = 8        # requests in flight per process
+    max_connections: int = 16       # HTTP connection pool size
+    keepalive_seconds: float = 60.0
+    breaker_threshold: int = 5      # transient failures in a row that open the breaker
+    breaker_cooldown: float = 30.0  # seconds before one trial request is let through
+    base_url: Optional[str] = None  # e.g. the fake_gemini stub server
+
+
+def settings_from_env() -> ClientSettings:
+    return ClientSettings(
+        timeout=float(os.getenv("GEMINI_TIMEOUT", 60)),
+        deadline=float(os.getenv("GEMINI_DEADLINE", 180)),
+        max_retries=int(os.getenv("GEMINI_MAX_RETRIES", 3)),
+        backoff_base=float(os.getenv("GEMINI_BACKOFF_BASE", 1.0)),
+        backoff_max=float(os.getenv("GEMINI_BACKOFF_MAX", 30)),
+        max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", 8)),
+        max_connections=int(os.getenv("GEMINI_MAX_CONNECTIONS", 16)),
+        keepalive_seconds=float(os.getenv("GEMINI_KEEPALIVE_SECONDS", 60)),
+        breaker_threshold=int(os.getenv("GEMINI_BREAKER_THRESHOLD", 5)),
+        breaker_cooldown=float(os.getenv("GEMINI_BREAKER_COOLDOWN", 30)),
+        base_url=os.getenv("GEMINI_BASE_URL") or None,
+    )
+
+
+class GeminiUnavailableError(RuntimeError):
+    """Raised without calling the API: breaker open, or no free slot before the deadline."""
+    code = 503
+
+
+def is_retryable(error: Exception) -> bool:
+    """429/5xx answers, timeouts and dropped connections — not 400s or our own bugs."""
+    if isinstance(error, GeminiUnavailableError):
+        return False
+    if getattr(error, "code", None) in RETRYABLE_CODES:
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # httpx is loaded by now if the error came from google.genai
+    import httpx
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Full jitter: uniform in [0, min(maximum, base · 2^(attempt-1))], so retries of many clients spread out."""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    closed → open after `threshold` transient failures in a row;
+    open → half-open after `cooldown` seconds, letting ONE trial call through;
+    the trial's outcome closes it again or restarts the cooldown. Thread-safe.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    @staticmethod
+    def _unavailable(remaining: float) -> GeminiUnavailableError:
+        return GeminiUnavailableError(
+            f"Gemini ist gerade überlastet — bitte in {max(remaining, 1):.0f} s erneut versuchen."
+        )
+
+    def check(self) -> None:
+        """Raises GeminiUnavailableError while open; doesn't claim the half-open trial."""
+        opened_at = self.opened_at
+        if opened_at is not None and time.monotonic() - opened_at < self.cooldown:
+            raise self._unavailable(opened_at + self.cooldown - time.monotonic())
+
+    def before_call(self) -> None:
+        """Like check(), but a half-open breaker lets exactly one caller through."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if remaining <= 0 and not self._trial_running:
+                self._trial_running = True
+                return
+        raise self._unavailable(remaining)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_running:
+                # Trial failed: another cooldown
+                self.opened_at = time.monotonic()
+                self._trial_running = False
+            elif self.threshold and self.opened_at is None and self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                self.trips += 1
+
+    def release_trial(self) -> None:
+        """The trial call failed for reasons that say nothing about the API."""
+        with self._lock:
+            self._trial_running = False
+
+
+class GeminiClientManager:
+    def __init__(self, settings: ClientSettings = None):
+        self.settings = settings or settings_from_env()
+        self.breaker = CircuitBreaker(self.settings.breaker_threshold, self.settings.breaker_cooldown)
+        self._slots = threading.BoundedSemaphore(self.settings.max_concurrency)
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "attempts": 0, "retries": 0, "failed": 0, "rejected": 0}
+
+    @property
+    def client(self):
+        """The process-wide genai.Client, created on first use (google.genai is slow to import)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        import httpx
+        from google import genai
+        from google.genai import types
+
+        http_options = types.HttpOptions(
+            base_url=self.settings.base_url,
+            timeout=int(self.settings.timeout * 1000),
+            # SDK-side retries stay off (its default): they would bypass the breaker and the limiter
+            client_args={"limits": httpx.Limits(
+                max_connections=self.settings.max_connections,
+                max_keepalive_connections=self.settings.max_connections,
+                keepalive_expiry=self.settings.keepalive_seconds,
+            )},
+        )
+        return genai.Client(api_key=os.getenv("GEMINI_API_KEY"), http_options=http_options)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {**self._stats, "breaker": self.breaker.state, "breaker_trips": self.breaker.trips}
+
+    def _count(self, **increments) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def _reject_if_open(self, breaker_call) -> None:
+        try:
+            breaker_call()
+        except GeminiUnavailableError:
+            self._count(rejected=1)
+            raise
+
+    @contextmanager
+    def _slot(self, deadline: float):
+        self._count(requests=1)
+        self._reject_if_open(self.breaker.check)  # fail fast instead of queueing for a slot
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            self._count(rejected=1)
+            raise GeminiUnavailableError("Zu viele gleichzeitige Gemini-Anfragen — bitte gleich erneut versuchen.")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _with_retries(self, call, deadline: float, max_retries: Optional[int], on_attempt):
+        retries = self.settings.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            attempt += 1
+            self._reject_if_open(self.breaker.before_call)
+            try:
+                if on_attempt is not None:
+                    on_attempt(attempt)
+                self._count(attempts=1)
+                result = call()
+            except Exception as e:
+                if not is_retryable(e):
+                    if getattr(e, "code", None) is not None:
+                        self.breaker.record_success()  # the API answered, it's just our request
+                    else:
+                        self.breaker.release_trial()
+                    self._count(failed=1)
+                    raise
+                self.breaker.record_failure()
+                delay = backoff_delay(attempt, self.settings.backoff_base, self.settings.backoff_max)
+                if attempt > retries or time.monotonic() + delay >= deadline:
+                    self._count(failed=1)
+                    raise
+                self._count(retries=1)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def generate_content(self, client, max_retries: int = None, on_attempt=None, **request):
+        """
+        client.models.generate_content(**request) with retries, breaker and limiter.
+        max_retries: overrides the configured number of retries
+        on_attempt: called with the attempt number (1, 2, ...) before each attempt
+        """
+        deadline = time.monotonic() + self.settings.deadline
+        with self._slot(deadline):
+            return self._with_retries(lambda: client.models.generate_content(**request),
+                                      deadline, max_retries, on_attempt)
+
+    def generate_content_stream(self, client, max_retries: int = None, on_attempt=None, **request):
+        """
+        Streaming twin of generate_content. Only failures before the first
+        chunk are retried; text already shown can't be taken back.
+
+        The concurrency slot is held until the stream ends, fails or is
+        closed — close() an abandoned stream (a Streamlit rerun, a consumer
+        that went away) so the slot is free again right away, not whenever
+        the generator happens to be garbage-collected.
+        """
+        def open_stream():
+            stream = iter(client.models.generate_content_stream(**request))
+            return next(stream, None), stream
+
+        deadline = time.monotonic() + self.settings.deadline
+        stream = None
+        with self._slot(deadline):  # released on GeneratorExit too
+            try:
+                first, stream = self._with_retries(open_stream, deadline, max_retries, on_attempt)
+                if first is None:
+                    return
+                yield first
+                try:
+                    yield from stream
+                except Exception as e:
+                    if is_retryable(e):
+                        self.breaker.record_failure()
+                    self._count(failed=1)
+                    raise
+            finally:
+                # Also ends the HTTP response of an abandoned stream
+                if hasattr(stream, "close"):
+                    stream.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_manager() -> GeminiClientManager:
+    """The manager of this process, built from the environment on first use."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = GeminiClientManager()
+    return _shared
+
+
+def configure(**overrides) -> GeminiClientManager:
+    """Replaces the shared manager, e.g. configure(max_concurrency=16) for a batch run."""
+    global _shared
+    with _shared_lock:
+        _shared = GeminiClientManager(settings_from_env()._replace(**overrides))
+    return _shared
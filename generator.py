@@ -1,20 +1,228 @@
 # generator.py
 import os
-from google import genai
+import re
+import json
+import time
+import logging
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Union
 from dotenv import load_dotenv
-from models import UserProfile
+from models import UserProfile, GeneratedCV
+from cache import LRUCache, SQLiteCache, content_hash
+from cv_context import select_cv_context, estimate_tokens
+from keywords import find_keywords, STANDARD
+from gemini_client import shared_manager
+from metrics import timed, record_stage, record_tokens
 
 load_dotenv()
 
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 MODEL = "gemini-2.5-flash"
 
+# None = the shared pooled client of gemini_client.py, created on first use
+# (google.genai alone takes ~0.6 s to import, and the app shouldn't pay that
+# or need an API key before anything is generated). Assign a client here to
+# replace it, e.g. fake_gemini.FakeClient() in tests. Either way, calls go
+# through the shared manager's retries, circuit breaker and limiter.
+client = None
 
-def build_cv_prompt(profile: UserProfile) -> str:
+logger = logging.getLogger(__name__)
+
+# Max. estimated tokens of extracted CV text pasted into the CV prompt;
+# longer CVs are cut down to the entries most relevant to the job ad
+CV_CONTEXT_TOKEN_BUDGET = int(os.getenv("CV_CONTEXT_TOKEN_BUDGET", 1500))
+
+# JSON mode: Gemini fills models.GeneratedCV instead of writing formatted text
+CV_JSON_CONFIG = {"response_mime_type": "application/json", "response_schema": GeneratedCV}
+
+# Chunks generate_application_stream buffers per stream before its producers wait
+STREAM_QUEUE_SIZE = 64
+
+
+# ─────────────────────────────────────────────
+# RESPONSE CACHE
+# Same prompt + model + config → same answer, without another API call.
+# GEMINI_CACHE_BACKEND = memory (default) | sqlite | off
+# ─────────────────────────────────────────────
+def _make_response_cache():
+    backend = os.getenv("GEMINI_CACHE_BACKEND", "memory").lower()
+    ttl = float(os.getenv("GEMINI_CACHE_TTL", 24 * 3600))
+    max_bytes = int(os.getenv("GEMINI_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+    if backend == "off":
+        return None
+    if backend == "sqlite":
+        path = os.getenv("GEMINI_CACHE_PATH", os.path.join(".cache", "gemini_responses.sqlite3"))
+        return SQLiteCache(path, max_bytes=max_bytes, ttl=ttl)
+    return LRUCache(max_bytes=max_bytes, ttl=ttl)
+
+
+response_cache = _make_response_cache()
+_saved_seconds = 0.0
+_stats_lock = threading.Lock()
+
+
+def get_client():
+    """The client Gemini calls go to: `client` if one was assigned, else the shared one."""
+    return client if client is not None else shared_manager().client
+
+
+def _config_value(value):
+    # A response schema class goes into the key as its JSON schema, so
+    # changing the schema invalidates the answers cached for the old one
+    if hasattr(value, "model_json_schema"):
+        return value.model_json_schema()
+    return str(value)
+
+
+def response_cache_key(prompt: str, model: str = MODEL, config: dict = None) -> str:
+    """
+    Whitespace is normalized first, so re-pasting the same job ad with
+    different line breaks still hits the cache.
+    """
+    normalized_prompt = re.sub(r"\s+", " ", prompt).strip()
+    payload = json.dumps(
+        {"model": model, "config": config or {}, "prompt": normalized_prompt},
+        sort_keys=True, ensure_ascii=False, default=_config_value,
+    )
+    return content_hash(payload.encode("utf-8"))
+
+
+def response_cache_stats() -> dict:
+    """Hits, misses and the Gemini latency the hits have saved so far."""
+    if response_cache is None:
+        return {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+    return {
+        "hits": response_cache.hits,
+        "misses": response_cache.misses,
+        "saved_seconds": round(_saved_seconds, 1),
+    }
+
+
+def _cache_lookup(key: str):
+    """Cached answer for key, or None. Counts the saved latency on a hit."""
+    global _saved_seconds
+    if response_cache is None:
+        return None
+    cached = response_cache.get(key)
+    if cached is None:
+        return None
+    entry = json.loads(cached)
+    with _stats_lock:
+        _saved_seconds += entry["latency"]
+    logger.info("Gemini cache hit %s — %.1f s saved", key[:12], entry["latency"])
+    return entry["text"]
+
+
+def _cache_store(key: str, text: str, latency: float, regenerate: bool) -> None:
+    logger.info("Gemini cache %s %s — generated in %.1f s",
+                "bypass" if regenerate else "miss", key[:12], latency)
+    if response_cache is not None and text:
+        response_cache.set(key, json.dumps({"text": text, "latency": latency}))
+
+
+def generate_text(prompt: str, config: dict = None, regenerate: bool = False,
+                  gemini_client=None, max_retries: int = None, on_attempt=None) -> str:
+    """
+    Calls Gemini through the response cache.
+    regenerate=True skips the lookup ("regenerate anyway") but still stores
+    the fresh answer, so the next normal request gets the new version.
+    gemini_client: use this client instead of the shared one (get_client)
+                   (e.g. fake_gemini.FakeClient for dry runs). Its answers
+                   bypass the response cache — the key has no client
+                   identity, so they'd otherwise be served to real calls.
+    max_retries / on_attempt: see GeminiClientManager.generate_content
+    Transient errors are retried (gemini_client.py); what's left is raised.
+    """
+    use_cache = gemini_client is None
+    key = response_cache_key(prompt, MODEL, config)
+    if use_cache and not regenerate:
+        cached_text = _cache_lookup(key)
+        if cached_text is not None:
+            return cached_text
+
+    start = time.perf_counter()
+    with timed("gemini"):
+        response = shared_manager().generate_content(
+            gemini_client or get_client(),
+            max_retries=max_retries,
+            on_attempt=on_attempt,
+            model=MODEL,
+            contents=prompt,
+            config=config
+        )
+    record_tokens(response.usage_metadata)
+    if use_cache:
+        _cache_store(key, response.text, time.perf_counter() - start, regenerate)
+    return response.text
+
+
+def _generate_text_stream(prompt: str, config: dict = None, regenerate: bool = False):
+    """
+    Streaming twin of generate_text: yields text chunks as Gemini writes
+    them. A cache hit arrives as one single chunk; a completed stream is
+    stored in the cache like a normal answer.
+    """
+    key = response_cache_key(prompt, MODEL, config)
+    if not regenerate:
+        cached_text = _cache_lookup(key)
+        if cached_text is not None:
+            yield cached_text
+            return
+
+    start = time.perf_counter()
+    chunks = []
+    usage_metadata = None
+    # closing(): if our consumer goes away, the stream's concurrency slot is freed at once
+    with closing(shared_manager().generate_content_stream(
+        get_client(),
+        model=MODEL,
+        contents=prompt,
+        config=config
+    )) as stream:
+        for chunk in stream:
+            # The last chunk that has usage metadata carries the totals
+            usage_metadata = chunk.usage_metadata or usage_metadata
+            if chunk.text:
+                if not chunks:
+                    record_stage("gemini_first_chunk", time.perf_counter() - start)
+                chunks.append(chunk.text)
+                yield chunk.text
+    record_stage("gemini", time.perf_counter() - start)
+    record_tokens(usage_metadata)
+    _cache_store(key, "".join(chunks), time.perf_counter() - start, regenerate)
+
+
+@timed("build_cv_prompt")
+def build_cv_prompt(profile: UserProfile, token_budget: int = CV_CONTEXT_TOKEN_BUDGET,
+                    structured: bool = False) -> str:
     """
     Highly prescriptive prompt that forces Gemini to output
     structured text matching German AEC two-column CV format.
+
+    token_budget: limit for the pasted CV text (see cv_context.py);
+                  None pastes the extracted CV in full
+    structured: ask for JSON per models.GeneratedCV instead of formatted text
     """
+    return _build_cv_prompt_with_report(profile, token_budget, structured)[0]
+
+
+def cv_prompt_token_report(profile: UserProfile, token_budget: int = CV_CONTEXT_TOKEN_BUDGET,
+                           structured: bool = False) -> dict:
+    """Estimated prompt tokens with the full CV text vs. the filtered one."""
+    return _build_cv_prompt_with_report(profile, token_budget, structured)[1]
+
+
+def _build_cv_prompt_with_report(profile: UserProfile, token_budget,
+                                 structured: bool = False) -> tuple[str, dict]:
+    cv_text = profile.cv_extracted_text
+    cv_context = None
+    if cv_text and token_budget is not None and not cv_text.startswith("⚠️"):
+        cv_context = select_cv_context(cv_text, profile.job_ad_text or "", token_budget)
+        cv_text = cv_context.text
 
     # Extract software with proficiency levels
     software_with_levels = []
@@ -23,18 +231,78 @@ def build_cv_prompt(profile: UserProfile) -> str:
             # You can extend this to accept dict like {"Revit": "Expert"}
             software_with_levels.append(f"{sw} – Fortgeschritten")
 
-    # Add AEC keywords if job ad mentions them
+    # Add AEC standards if job ad mentions them (see keywords.py)
     aec_keywords = []
     if profile.job_ad_text:
-        job_ad_lower = profile.job_ad_text.lower()
-        if "iso 19650" in job_ad_lower or "bim" in job_ad_lower:
-            aec_keywords.append("ISO 19650")
-        if "hoai" in job_ad_lower:
-            aec_keywords.append("HOAI")
-        if "vob" in job_ad_lower:
-            aec_keywords.append("VOB")
+        job_ad_keywords = find_keywords(profile.job_ad_text)
+        aec_keywords = [m.term for m in job_ad_keywords if m.category == STANDARD]
+        # Any BIM position in Germany is run along ISO 19650, named or not
+        mentions_bim = any(m.term == "BIM" or m.term.startswith("BIM ") for m in job_ad_keywords)
+        if mentions_bim and "ISO 19650" not in aec_keywords:
+            aec_keywords.insert(0, "ISO 19650")
+
+    if structured:
+        output_format = f"""OUTPUT-FORMAT:
+Gib den Lebenslauf als JSON nach dem vorgegebenen Schema zurück — reiner Text in den Feldern,
+keine **Sternchen**, keine Aufzählungszeichen.
+- sections: Abschnitte in der obigen Reihenfolge, title in Großbuchstaben (z. B. "BERUFSERFAHRUNG")
+- entries: Stationen mit Zeitraum — start/end als MM/YYYY (end leer bei Einzeldatum),
+  title = Jobtitel / Abschluss / Zertifikat, organization, location,
+  bullets = Aufgaben mit konkreten Erfolgen und Keywords aus der Stellenausschreibung,
+  details = weitere Angaben wie "Abschlussarbeit: [Titel]", "Note: [Note]"
+- lines: Zeilen ohne Zeitraum, z. B. "Geburtsdatum: [Datum]" oder "Deutsch – Muttersprache"
+
+Abschnitt KENNTNISSE als lines:
+BIM-Management & Methoden: {", ".join(profile.bim_roles) if profile.bim_roles else "—"}
+Software: {", ".join(software_with_levels) if software_with_levels else "—"}
+Standards & Normen: {", ".join(aec_keywords) if aec_keywords else "—"}
+"""
+    else:
+        output_format = f"""OUTPUT-FORMAT:
+Gib den Lebenslauf im folgenden strukturierten Format zurück:
 
-    return f"""
+**PERSÖNLICHE DATEN**
+Geburtsdatum: [Datum]
+Nationalität: [Land]
+Wohnort: [Stadt]
+Telefon: [Nummer]
+E-Mail: [Adresse]
+
+**BERUFSERFAHRUNG**
+[MM/YYYY – MM/YYYY] | **[Jobtitel]**, [Unternehmen], [Stadt]
+• [Aufgabe 1 mit konkreten Erfolgen und Keywords aus der Stellenausschreibung]
+• [Aufgabe 2]
+• [Aufgabe 3]
+
+[Für jede weitere Position wiederholen]
+
+**AUSBILDUNG**
+[MM/YYYY – MM/YYYY] | **[Abschluss]**, [Universität], [Stadt]
+Abschlussarbeit: [Titel]
+Note: [Note]
+
+**WEITERBILDUNG**
+[MM/YYYY] | **[BIM-Zertifikat 1]**, [Institution]
+[MM/YYYY] | **[BIM-Zertifikat 2]**, [Institution]
+[MM/YYYY] | **[Andere Zertifikate]**, [Institution]
+
+**KENNTNISSE**
+**BIM-Management & Methoden:**
+{", ".join(profile.bim_roles) if profile.bim_roles else "—"}
+
+**Software:**
+{", ".join(software_with_levels) if software_with_levels else "—"}
+
+**Standards & Normen:**
+{", ".join(aec_keywords) if aec_keywords else "—"}
+
+**SPRACHEN**
+Deutsch – Muttersprache
+Englisch – Verhandlungssicher
+[Weitere Sprachen falls vorhanden]
+"""
+
+    prompt = f"""
 Du bist ein Experte für deutsche Bewerbungen im Bauwesen (AEC-Branche).
 Erstelle einen **tabellarischen Lebenslauf** nach deutschem Standard für die Position **{profile.target_job_title}** bei **{profile.target_company}**.
 
@@ -60,7 +328,7 @@ PERSÖNLICHE DATEN:
 - E-Mail: {profile.email}
 
 BERUFSERFAHRUNG — KRITISCH: NUR die folgenden Daten verwenden, NICHTS erfinden:
-{profile.cv_extracted_text or "⚠️ KEIN LEBENSLAUF HOCHGELADEN — Bitte nur die oben angegebenen Daten verwenden, KEINE Erfahrung erfinden."}
+{cv_text or "⚠️ KEIN LEBENSLAUF HOCHGELADEN — Bitte nur die oben angegebenen Daten verwenden, KEINE Erfahrung erfinden."}
 
 STRIKTE REGEL: Du darfst KEINE Unternehmen, Positionen, Projekte oder Daten erfinden, 
 die nicht explizit in den obigen Daten stehen. Wenn keine Berufserfahrung vorhanden ist, 
@@ -85,68 +353,60 @@ STELLENAUSSCHREIBUNG (Keywords beachten):
 WICHTIGE AEC-KEYWORDS (wenn relevant, einbauen):
 {", ".join(aec_keywords) if aec_keywords else "keine spezifischen Standards erwähnt"}
 
-OUTPUT-FORMAT:
-Gib den Lebenslauf im folgenden strukturierten Format zurück:
-
-**PERSÖNLICHE DATEN**
-Geburtsdatum: [Datum]
-Nationalität: [Land]
-Wohnort: [Stadt]
-Telefon: [Nummer]
-E-Mail: [Adresse]
-
-**BERUFSERFAHRUNG**
-[MM/YYYY – MM/YYYY] | **[Jobtitel]**, [Unternehmen], [Stadt]
-• [Aufgabe 1 mit konkreten Erfolgen und Keywords aus der Stellenausschreibung]
-• [Aufgabe 2]
-• [Aufgabe 3]
-
-[Für jede weitere Position wiederholen]
-
-**AUSBILDUNG**
-[MM/YYYY – MM/YYYY] | **[Abschluss]**, [Universität], [Stadt]
-Abschlussarbeit: [Titel]
-Note: [Note]
-
-**WEITERBILDUNG**
-[MM/YYYY] | **[BIM-Zertifikat 1]**, [Institution]
-[MM/YYYY] | **[BIM-Zertifikat 2]**, [Institution]
-[MM/YYYY] | **[Andere Zertifikate]**, [Institution]
-
-**KENNTNISSE**
-**BIM-Management & Methoden:**
-{", ".join(profile.bim_roles) if profile.bim_roles else "—"}
-
-**Software:**
-{", ".join(software_with_levels) if software_with_levels else "—"}
-
-**Standards & Normen:**
-{", ".join(aec_keywords) if aec_keywords else "—"}
-
-**SPRACHEN**
-Deutsch – Muttersprache
-Englisch – Verhandlungssicher
-[Weitere Sprachen falls vorhanden]
-
+{output_format}
 KRITISCHE REGEL: Gib NUR den fertigen Lebenslauf zurück, KEINE Erklärungen davor oder danach.
 """
 
+    tokens_after = estimate_tokens(prompt)
+    tokens_before = tokens_after
+    if cv_context is not None:
+        tokens_before += cv_context.tokens_before - cv_context.tokens_after
+        logger.info("CV prompt: %d → %d tokens (%d/%d CV entries in full)",
+                    tokens_before, tokens_after, cv_context.entries_in_full, cv_context.entries_total)
+    return prompt, {"tokens_before": tokens_before, "tokens_after": tokens_after}
 
-def generate_cv(profile: UserProfile) -> str:
-    prompt = build_cv_prompt(profile)
+
+@timed("generate_cv")
+def generate_cv(profile: UserProfile, regenerate: bool = False,
+                structured: bool = False) -> Union[str, GeneratedCV]:
+    """
+    structured=False: CV as formatted text (the default)
+    structured=True:  JSON mode — Gemini answers per the GeneratedCV schema,
+                      returned as a validated GeneratedCV
+    Errors are returned as a string starting with "❌" in both modes.
+    """
+    prompt = build_cv_prompt(profile, structured=structured)
     try:
-        response = client.models.generate_content(
-            model=MODEL,
-            contents=prompt
-        )
-        return response.text
+        if structured:
+            answer = generate_text(prompt, config=CV_JSON_CONFIG, regenerate=regenerate)
+            return GeneratedCV.model_validate_json(answer)
+        return generate_text(prompt, regenerate=regenerate)
     except Exception as e:
         return f"❌ Fehler bei der CV-Generierung: {str(e)}"
 
 
+def generate_cv_stream(profile: UserProfile, regenerate: bool = False):
+    """
+    Like generate_cv, but yields the text in chunks while Gemini is still
+    writing, so the UI can show the CV as it grows. Joined together, the
+    chunks are exactly what generate_cv would return. An error arrives as
+    a final chunk starting with "❌".
+    """
+    with timed("generate_cv"):
+        prompt = build_cv_prompt(profile)
+        try:
+            yield from _generate_text_stream(prompt, regenerate=regenerate)
+        except Exception as e:
+            yield f"❌ Fehler bei der CV-Generierung: {str(e)}"
+
+
+@timed("build_cover_letter_prompt")
 def build_cover_letter_prompt(profile: UserProfile) -> str:
     """DIN 5008 compliant cover letter with named contact preference."""
 
+    # Terms the ad itself uses, most frequent first — to be picked up verbatim
+    job_ad_terms = [m.term for m in find_keywords(profile.job_ad_text)]
+
     return f"""
 Du bist ein Experte für deutsche Bewerbungsschreiben im Bauwesen (AEC-Branche).
 Erstelle ein **professionelles Anschreiben nach DIN 5008** für die Position **{profile.target_job_title}** bei **{profile.target_company}**.
@@ -178,6 +438,9 @@ UNTERNEHMEN: {profile.target_company}
 STELLENAUSSCHREIBUNG (Keywords daraus verwenden):
 {profile.job_ad_text}
 
+ERKANNTE FACHBEGRIFFE AUS DER AUSSCHREIBUNG (gezielt aufgreifen, wenn passend):
+{", ".join(job_ad_terms) if job_ad_terms else "keine erkannt"}
+
 VORHERIGES ANSCHREIBEN DES BEWERBERS (falls vorhanden, verbessern):
 {profile.cover_letter_extracted_text or "Kein vorheriges Anschreiben vorhanden"}
 
@@ -221,13 +484,85 @@ KRITISCHE REGEL: Gib NUR das fertige Anschreiben zurück, KEINE Erklärungen.
 """
 
 
-def generate_cover_letter(profile: UserProfile) -> str:
+@timed("generate_cover_letter")
+def generate_cover_letter(profile: UserProfile, regenerate: bool = False) -> str:
     prompt = build_cover_letter_prompt(profile)
     try:
-        response = client.models.generate_content(
-            model=MODEL,
-            contents=prompt
-        )
-        return response.text
+        return generate_text(prompt, regenerate=regenerate)
     except Exception as e:
         return f"❌ Fehler beim Anschreiben: {str(e)}"
+
+
+def generate_cover_letter_stream(profile: UserProfile, regenerate: bool = False):
+    """Streaming variant of generate_cover_letter, see generate_cv_stream."""
+    with timed("generate_cover_letter"):
+        prompt = build_cover_letter_prompt(profile)
+        try:
+            yield from _generate_text_stream(prompt, regenerate=regenerate)
+        except Exception as e:
+            yield f"❌ Fehler beim Anschreiben: {str(e)}"
+
+
+# ─────────────────────────────────────────────
+# FULL APPLICATION PACKAGE
+# Both prompts come from the same profile and are independent, so the
+# two requests run side by side: total wait ≈ the slower of the two.
+# ─────────────────────────────────────────────
+def generate_application(profile: UserProfile, regenerate: bool = False,
+                         structured: bool = False) -> tuple[Union[str, GeneratedCV], str]:
+    """Returns (cv, cover_letter_text), generated concurrently; structured as in generate_cv."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # Each task runs in a copy of this context, so stage timings reach the caller's trace
+        cv_future = pool.submit(contextvars.copy_context().run, generate_cv, profile, regenerate, structured)
+        cl_future = pool.submit(contextvars.copy_context().run, generate_cover_letter, profile, regenerate)
+        return cv_future.result(), cl_future.result()
+
+
+def generate_application_stream(profile: UserProfile, regenerate: bool = False):
+    """
+    Streams CV and cover letter concurrently.
+    Yields ("cv", chunk) and ("cover_letter", chunk) pairs in arrival order;
+    each document's chunks follow the generate_cv_stream conventions.
+    """
+    # Bounded, so producers wait for a slow consumer instead of buffering the
+    # whole answer; `stop` ends them (and frees their Gemini slots) once the
+    # consumer is gone, e.g. after a Streamlit rerun abandoned the stream
+    chunk_queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                chunk_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def pump(key, chunks):
+        try:
+            for chunk in chunks:
+                if not put((key, chunk)):
+                    break
+        finally:
+            chunks.close()
+            put((key, finished))
+
+    streams = {
+        "cv": generate_cv_stream(profile, regenerate),
+        "cover_letter": generate_cover_letter_stream(profile, regenerate),
+    }
+    for key, chunks in streams.items():
+        threading.Thread(target=contextvars.copy_context().run, args=(pump, key, chunks), daemon=True).start()
+
+    running = len(streams)
+    try:
+        while running:
+            key, chunk = chunk_queue.get()
+            if chunk is finished:
+                running -= 1
+            else:
+                yield key, chunk
+    finally:
+        stop.set()
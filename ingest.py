@@ -0,0 +1,255 @@
+# ingest.py
+# Bulk CV ingestion: a ZIP archive or a directory of applicant CVs
+# (PDF/DOCX) → one JSONL line per file with its extracted text, status and
+# timing — no Streamlit needed.
+#
+#   python ingest.py bewerbungen.zip --out cvs.jsonl [--workers 4]
+#
+# - Files are listed lazily (ZIP central directory / os.scandir) and only
+#   --workers × 2 are in flight at a time; each worker process reads just
+#   its own file, so memory stays bounded by the largest file, not the
+#   archive. Files above --max-file-mb (uncompressed) are skipped unread.
+# - Extraction runs on a process pool (layout analysis is CPU-bound pure
+#   Python, see cv_extractor). A corrupt file becomes a "failed" line; a
+#   crashed worker process fails the files in flight at that moment, and
+#   the run continues on a fresh pool.
+# - Every result is appended and flushed as soon as it is done. Rerunning
+#   with the same --out resumes: files that already have a line in it are
+#   skipped, and --retry-failed redoes the ones that failed.
+#
+# Line format: {"source", "status": "done" | "empty" | "failed" | "skipped",
+#               "text", "chars", "sha256", "bytes", "seconds", "error"}
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, NamedTuple
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+# Listed so they show up as "skipped" lines instead of vanishing: legacy
+# Word 97 files aren't ZIP-based, the DOCX reader can't open them
+UNSUPPORTED_EXTENSIONS = (".doc",)
+FINISHED_STATUSES = ("done", "empty", "skipped")
+
+
+class Source(NamedTuple):
+    container: str   # the ZIP file or the directory
+    name: str        # member name / path relative to the directory
+    size: int        # uncompressed bytes
+
+
+def _wanted(name: str) -> bool:
+    base = os.path.basename(name)
+    return (name.lower().endswith(SUPPORTED_EXTENSIONS + UNSUPPORTED_EXTENSIONS)
+            and not base.startswith((".", "~$"))     # macOS resource forks, Word lock files
+            and "__MACOSX/" not in name)
+
+
+def iter_sources(path: str) -> Iterator[Source]:
+    """The CVs in a ZIP archive or directory tree, in a stable order, without reading them."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _wanted(info.filename):
+                    yield Source(path, info.filename, info.file_size)
+        return
+
+    if not os.path.isdir(path):
+        raise ValueError(f"Weder ZIP-Archiv noch Ordner: {path}")
+    pending = [path]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        # Reversed onto the stack, so subdirectories come out in name order
+        pending.extend(entry.path for entry in reversed(entries) if entry.is_dir(follow_symlinks=False))
+        for entry in entries:
+            if entry.is_file() and _wanted(entry.name):
+                yield Source(path, os.path.relpath(entry.path, path).replace(os.sep, "/"), entry.stat().st_size)
+
+
+def _read_source(source: Source) -> bytes:
+    if os.path.isdir(source.container):
+        with open(os.path.join(source.container, source.name), "rb") as f:
+            return f.read()
+    with zipfile.ZipFile(source.container) as archive:
+        return archive.read(source.name)
+
+
+def extract_source(source: Source) -> dict:
+    """One file → its result line. Runs in a worker process; never raises."""
+    from cv_extractor import extract_text_from_docx, extract_text_from_pdf
+
+    start = time.perf_counter()
+    result = {"source": source.name, "bytes": source.size}
+    try:
+        file_bytes = _read_source(source)
+        result["sha256"] = hashlib.sha256(file_bytes).hexdigest()
+        if source.name.lower().endswith(".pdf"):
+            # The pool already keeps every core busy: OCR stays in this process
+            text = extract_text_from_pdf(file_bytes, ocr_workers=1)
+        else:
+            text = extract_text_from_docx(file_bytes)
+        del file_bytes
+        if text.startswith("⚠️"):
+            result.update(status="empty", error=text)
+        else:
+            result.update(status="done", text=text, chars=len(text))
+    except Exception as e:
+        result.update(status="failed", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+# ─────────────────────────────────────────────
+# OUTPUT
+# ─────────────────────────────────────────────
+def finished_sources(out_path: str, retry_failed: bool = False) -> set[str]:
+    """
+    Sources the JSONL file already has a final line for, read line by line.
+    A line cut off by a crash is dropped from the file, so appending
+    continues cleanly.
+    """
+    if not os.path.exists(out_path):
+        return set()
+    finished = set()
+    with open(out_path, "rb+") as f:
+        complete_until = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                f.truncate(complete_until)
+                break
+            complete_until += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("status") in FINISHED_STATUSES or (entry.get("status") == "failed" and not retry_failed):
+                finished.add(entry["source"])
+    return finished
+
+
+class ResultWriter:
+    """Appends one JSON line per result and flushes it, so a crash loses at most the line being written."""
+
+    def __init__(self, out_path: str):
+        self._file = open(out_path, "a", encoding="utf-8")
+        self.counts = {"done": 0, "empty": 0, "failed": 0, "skipped": 0}
+
+    def write(self, result: dict) -> None:
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.counts[result["status"]] += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ─────────────────────────────────────────────
+# ENGINE
+# ─────────────────────────────────────────────
+def ingest(path: str, out_path: str, workers: int = 4, max_file_bytes: int = 20 * 1024 * 1024,
+           retry_failed: bool = False, progress=print) -> dict:
+    """
+    Extracts every CV in the ZIP / directory `path` into the JSONL file out_path.
+
+    workers: extraction processes; 0 or 1 extracts in this process
+    max_file_bytes: larger files get a "skipped" line instead of being read
+    retry_failed: redo files whose last attempt failed
+    returns: counts per status for this run, plus "already" for resumed files
+    """
+    finished = finished_sources(out_path, retry_failed)
+    writer = ResultWriter(out_path)
+    already = 0
+
+    def report(result: dict) -> None:
+        writer.write(result)
+        if result["status"] == "done":
+            progress(f"✅ {result['source']}: {result['chars']} chars, {result['seconds']} s")
+        elif result["status"] == "failed":
+            progress(f"❌ {result['source']}: {result['error']}")
+        else:
+            progress(f"⚠️ {result['source']}: {result['error']}")
+
+    def todo() -> Iterator[Source]:
+        nonlocal already
+        for source in iter_sources(path):
+            if source.name in finished:
+                already += 1
+            elif source.name.lower().endswith(UNSUPPORTED_EXTENSIONS):
+                report({"source": source.name, "status": "skipped", "bytes": source.size,
+                        "error": "Format nicht unterstützt"})
+            elif source.size > max_file_bytes:
+                report({"source": source.name, "status": "skipped", "bytes": source.size,
+                        "error": f"größer als {round(max_file_bytes / (1024 * 1024), 2):g} MB"})
+            else:
+                yield source
+
+    try:
+        if workers <= 1:
+            for source in todo():
+                report(extract_source(source))
+        else:
+            _run_pool(todo(), workers, report)
+    finally:
+        writer.close()
+    return {**writer.counts, "already": already}
+
+
+def _run_pool(sources: Iterator[Source], workers: int, report) -> None:
+    """At most workers × 2 files in flight; a broken pool is replaced and the run goes on."""
+    pool = ProcessPoolExecutor(max_workers=workers)
+    in_flight = {}
+    try:
+        for source in sources:
+            if len(in_flight) >= workers * 2:
+                pool = _collect(pool, in_flight, workers, report)
+            in_flight[pool.submit(extract_source, source)] = source
+        while in_flight:
+            pool = _collect(pool, in_flight, workers, report)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _collect(pool: ProcessPoolExecutor, in_flight: dict, workers: int, report) -> ProcessPoolExecutor:
+    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+    for future in done:
+        source = in_flight.pop(future)
+        try:
+            report(future.result())
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory): every file still in this pool is lost with it
+            for lost in [source] + [in_flight.pop(other) for other in list(in_flight)]:
+                report({"source": lost.name, "status": "failed", "bytes": lost.size,
+                        "error": "Worker-Prozess abgestürzt"})
+            pool.shutdown(wait=False, cancel_futures=True)
+            return ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Extract the text of many CVs from a ZIP archive or folder")
+    arg_parser.add_argument("source", help="ZIP archive or directory of PDF/DOCX files")
+    arg_parser.add_argument("--out", required=True, help="JSONL output file (appended to, resumable)")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument("--max-file-mb", type=float, default=20)
+    arg_parser.add_argument("--retry-failed", action="store_true", help="redo files that failed last time")
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    counts = ingest(args.source, args.out, workers=args.workers,
+                    max_file_bytes=int(args.max_file_mb * 1024 * 1024), retry_failed=args.retry_failed)
+    processed = counts["done"] + counts["empty"] + counts["failed"]
+    print(f"🏁 {processed} files in {time.perf_counter() - start:.1f} s — {counts['done']} done, "
+          f"{counts['empty']} without text, {counts['failed']} failed, {counts['skipped']} skipped, "
+          f"{counts['already']} already in {args.out}")
+    raise SystemExit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
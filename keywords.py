@@ -0,0 +1,251 @@
+# keywords.py
+# AEC keyword engine: finds standards, software, roles and methods in a
+# job ad in ONE linear pass.
+#
+# The dictionary below is plain data — canonical term → category + variants
+# (synonyms, German inflections, spelling variants). At import, all variants
+# are compiled into a single regex shaped like a prefix trie, so the scan
+# cost barely grows with the number of keywords. Matches respect word
+# boundaries: "BIM" matches "BIM-Koordination" but not "Bimsstein".
+# Short all-caps acronyms ("LOG", "ACC", "IDS", "4D") must also match in
+# upper case, so ordinary words ("log", "ids") don't count as keywords.
+
+import re
+from typing import NamedTuple
+
+STANDARD = "standard"
+SOFTWARE = "software"
+ROLE = "role"
+METHOD = "method"
+
+# Gendered German job titles: Koordinator → Koordinatorin, Koordinator*in ...
+_ROLE_SUFFIXES = ("", "in", "innen", "en", "e", "s", "*in", ":in", "/in", "(in)", "_in")
+
+
+def _role(*titles: str) -> list[str]:
+    return [title + suffix for title in titles for suffix in _ROLE_SUFFIXES]
+
+
+AEC_KEYWORDS: dict[str, dict] = {
+    # --- Standards & Normen ---
+    "ISO 19650": {"category": STANDARD, "variants": ["ISO 19650", "DIN EN ISO 19650", "ISO19650"]},
+    "HOAI": {"category": STANDARD, "variants": [
+        "HOAI", "Honorarordnung für Architekten und Ingenieure", "Leistungsphasen", "Leistungsphase", "LPH"]},
+    "VOB": {"category": STANDARD, "variants": [
+        "VOB", "VOB/A", "VOB/B", "VOB/C", "Vergabe- und Vertragsordnung für Bauleistungen"]},
+    "DIN 276": {"category": STANDARD, "variants": ["DIN 276", "DIN276", "Kostengruppen"]},
+    "DIN 277": {"category": STANDARD, "variants": ["DIN 277", "DIN277"]},
+    "VDI 2552": {"category": STANDARD, "variants": ["VDI 2552", "VDI2552"]},
+    "IFC": {"category": STANDARD, "variants": ["IFC", "IFC2x3", "IFC4", "Industry Foundation Classes", "ISO 16739"]},
+    "BCF": {"category": STANDARD, "variants": ["BCF", "BIM Collaboration Format"]},
+    "IDS": {"category": STANDARD, "variants": ["IDS", "Information Delivery Specification"]},
+    "LOIN": {"category": STANDARD, "variants": ["LOIN", "Level of Information Need", "DIN EN 17412", "LOD", "LOG", "LOI"]},
+    "AIA": {"category": STANDARD, "variants": [
+        "AIA", "Auftraggeber-Informationsanforderungen", "EIR", "Employer's Information Requirements"]},
+    "BAP": {"category": STANDARD, "variants": [
+        "BAP", "BIM-Abwicklungsplan", "BIM-Abwicklungspläne", "BIM Execution Plan", "BEP"]},
+    "GAEB": {"category": STANDARD, "variants": ["GAEB", "GAEB-DA XML"]},
+    "GEG": {"category": STANDARD, "variants": ["GEG", "Gebäudeenergiegesetz", "EnEV"]},
+    "Eurocode": {"category": STANDARD, "variants": ["Eurocode", "Eurocodes", "DIN EN 1990", "DIN EN 1992"]},
+    "Masterplan BIM": {"category": STANDARD, "variants": [
+        "Masterplan BIM", "Masterplan BIM Bundesfernstraßen", "BIM Deutschland"]},
+
+    # --- Software ---
+    "Revit": {"category": SOFTWARE, "variants": ["Revit", "Autodesk Revit", "Revit Architecture", "Revit MEP"]},
+    "Navisworks": {"category": SOFTWARE, "variants": ["Navisworks", "Autodesk Navisworks", "Navisworks Manage"]},
+    "Solibri": {"category": SOFTWARE, "variants": ["Solibri", "Solibri Office", "Solibri Model Checker", "SMC"]},
+    "AutoCAD": {"category": SOFTWARE, "variants": ["AutoCAD", "Auto CAD", "AutoCAD Civil 3D"]},
+    "Civil 3D": {"category": SOFTWARE, "variants": ["Civil 3D", "Civil3D"]},
+    "Archicad": {"category": SOFTWARE, "variants": ["Archicad", "ArchiCAD", "Graphisoft Archicad"]},
+    "Allplan": {"category": SOFTWARE, "variants": ["Allplan", "Nemetschek Allplan"]},
+    "Tekla": {"category": SOFTWARE, "variants": ["Tekla", "Tekla Structures"]},
+    "Vectorworks": {"category": SOFTWARE, "variants": ["Vectorworks"]},
+    "Dynamo": {"category": SOFTWARE, "variants": ["Dynamo", "Dynamo BIM"]},
+    "Grasshopper": {"category": SOFTWARE, "variants": ["Grasshopper", "Rhino", "Rhinoceros"]},
+    "BIM 360": {"category": SOFTWARE, "variants": [
+        "BIM 360", "BIM360", "Autodesk Construction Cloud", "ACC", "Autodesk Docs"]},
+    "Dalux": {"category": SOFTWARE, "variants": ["Dalux", "Dalux Field", "Dalux Box"]},
+    "DESITE": {"category": SOFTWARE, "variants": ["DESITE", "Desite MD", "Desite BIM"]},
+    "BIMcollab": {"category": SOFTWARE, "variants": ["BIMcollab", "BIM collab"]},
+    "Trimble Connect": {"category": SOFTWARE, "variants": ["Trimble Connect"]},
+    "iTWO": {"category": SOFTWARE, "variants": ["iTWO", "RIB iTWO", "iTWO 4.0"]},
+    "ORCA AVA": {"category": SOFTWARE, "variants": ["ORCA AVA", "ORCA"]},
+    "NEVARIS": {"category": SOFTWARE, "variants": ["NEVARIS", "California.pro"]},
+    "MicroStation": {"category": SOFTWARE, "variants": ["MicroStation", "Bentley MicroStation", "OpenRoads", "OpenBuildings"]},
+    "SketchUp": {"category": SOFTWARE, "variants": ["SketchUp", "Sketch Up"]},
+    "Power BI": {"category": SOFTWARE, "variants": ["Power BI", "PowerBI"]},
+    "Python": {"category": SOFTWARE, "variants": ["Python"]},
+    "IfcOpenShell": {"category": SOFTWARE, "variants": ["IfcOpenShell", "IFC OpenShell"]},
+    "Primavera P6": {"category": SOFTWARE, "variants": ["Primavera P6", "Primavera", "Oracle Primavera"]},
+    "MS Project": {"category": SOFTWARE, "variants": ["MS Project", "Microsoft Project"]},
+
+    # --- Rollen ---
+    "BIM Manager": {"category": ROLE, "variants": _role("BIM Manager", "BIM-Manager") + ["BIM-Management", "BIM Management"]},
+    "BIM Koordinator": {"category": ROLE, "variants": _role("BIM Koordinator", "BIM Coordinator") + ["BIM-Koordination"]},
+    "BIM Modeler": {"category": ROLE, "variants": _role("BIM Modeler", "BIM Modeller", "BIM Modellierer")},
+    "BIM Berater": {"category": ROLE, "variants": _role("BIM Berater", "BIM Consultant") + ["BIM-Beratung"]},
+    "VDC Manager": {"category": ROLE, "variants": _role("VDC Manager", "VDC Engineer")},
+    "Projektleiter": {"category": ROLE, "variants": _role("Projektleiter", "Project Manager") + ["Projektleitung"]},
+    "Bauleiter": {"category": ROLE, "variants": _role("Bauleiter", "Oberbauleiter") + ["Bauleitung", "Bauüberwachung"]},
+    "Projektingenieur": {"category": ROLE, "variants": _role("Projektingenieur", "Project Engineer")},
+    "Tragwerksplaner": {"category": ROLE, "variants": _role("Tragwerksplaner", "Statiker") + ["Tragwerksplanung"]},
+    "TGA-Planer": {"category": ROLE, "variants": _role("TGA-Planer", "TGA-Ingenieur", "Fachplaner TGA") + ["TGA-Planung"]},
+    "Architekt": {"category": ROLE, "variants": _role("Architekt") + ["Architektur"]},
+    "Bauingenieur": {"category": ROLE, "variants": _role("Bauingenieur", "Civil Engineer") + ["Bauingenieurwesen"]},
+    "Kalkulator": {"category": ROLE, "variants": _role("Kalkulator") + ["Kalkulation"]},
+
+    # --- Methoden ---
+    "BIM": {"category": METHOD, "variants": ["BIM", "Building Information Modeling", "Building Information Modelling"]},
+    "openBIM": {"category": METHOD, "variants": ["openBIM", "open BIM", "Big Open BIM"]},
+    "CDE": {"category": METHOD, "variants": ["CDE", "Common Data Environment", "gemeinsame Datenumgebung"]},
+    "Kollisionsprüfung": {"category": METHOD, "variants": [
+        "Kollisionsprüfung", "Kollisionsprüfungen", "Clash Detection", "Kollisionskontrolle"]},
+    "Modellprüfung": {"category": METHOD, "variants": [
+        "Modellprüfung", "Modellprüfungen", "Modellqualitätsprüfung", "Model Checking"]},
+    "Mengenermittlung": {"category": METHOD, "variants": ["Mengenermittlung", "Massenermittlung", "Quantity Take-off", "QTO"]},
+    "4D/5D-Planung": {"category": METHOD, "variants": ["4D", "5D", "4D-Planung", "5D-Planung", "4D-Simulation"]},
+    "Digitaler Zwilling": {"category": METHOD, "variants": ["Digitaler Zwilling", "Digitalen Zwilling", "Digital Twin"]},
+    "Lean Construction": {"category": METHOD, "variants": ["Lean Construction", "Last Planner", "Taktplanung"]},
+    "Ausschreibung und Vergabe": {"category": METHOD, "variants": ["Ausschreibung", "Vergabe", "AVA", "Tender"]},
+    "Scan-to-BIM": {"category": METHOD, "variants": ["Scan-to-BIM", "Scan to BIM", "Punktwolke", "Punktwolken", "Laserscanning"]},
+}
+
+
+class KeywordMatch(NamedTuple):
+    term: str                           # canonical term, e.g. "ISO 19650"
+    category: str
+    count: int
+    positions: list[tuple[int, int]]    # (start, end) offsets in the scanned text
+
+
+# Spaces and hyphens in variants match any run of spaces/hyphens (incl. none),
+# so "BIM-Koordinator", "BIM Koordinator" and "BIMKoordinator" are equal.
+_SEPARATOR = "\x00"
+_SEPARATOR_PATTERN = r"[\s\-‐‑]*"
+_SEPARATORS = re.compile(r"[\s\-‐‑]+")
+
+
+def _trie_key(variant: str) -> str:
+    return _SEPARATORS.sub(_SEPARATOR, variant.lower())
+
+
+def _lookup_key(text: str) -> str:
+    return _SEPARATORS.sub("", text.lower())
+
+
+# Longest variant (without separators) that counts as an acronym
+_ACRONYM_MAX_LENGTH = 5
+
+
+def _acronym(variant: str) -> str:
+    """The variant without separators if it is a short all-caps acronym ("VOB/B", "4D"), else ""."""
+    compact = _SEPARATORS.sub("", variant)
+    if len(compact) <= _ACRONYM_MAX_LENGTH and compact == compact.upper() != compact.lower():
+        return compact
+    return ""
+
+
+def _merge_trie(into: dict, other: dict) -> None:
+    for char, child in other.items():
+        if char:
+            _merge_trie(into.setdefault(char, {}), child)
+        else:
+            into[""] = True
+
+
+def _fold_separators(node: dict) -> None:
+    """
+    A separator may also be empty ("Auto CAD" = "AutoCAD"), so a node's
+    other branches move below its separator branch. Otherwise the regex
+    would commit to the first alternative that matches — "AutoCAD" via
+    "Auto CAD" — and never try the longer "AutoCAD Civil 3D".
+    """
+    if _SEPARATOR in node:
+        for char in [char for char in node if char not in ("", _SEPARATOR)]:
+            _merge_trie(node[_SEPARATOR], {char: node.pop(char)})
+    for char, child in node.items():
+        if char:
+            _fold_separators(child)
+
+
+def _trie_pattern(node: dict) -> str:
+    """Turns a nested-dict trie into a regex with shared prefixes factored out."""
+    terminal = "" in node
+    branches = []
+    for char in sorted(k for k in node if k):
+        piece = _SEPARATOR_PATTERN if char == _SEPARATOR else re.escape(char)
+        branches.append(piece + _trie_pattern(node[char]))
+
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        # Greedy optional → the longest variant wins ("VOB/B" over "VOB")
+        return f"(?:{body})?"
+    return body
+
+
+class KeywordMatcher:
+    """
+    Compiles a keyword dictionary (format of AEC_KEYWORDS) once; scan()
+    then finds every variant in a single pass over the text.
+    """
+
+    def __init__(self, keywords: dict[str, dict]):
+        self._lookup: dict[str, tuple[str, str]] = {}
+        acronyms: dict[str, set[str]] = {}
+        any_case: set[str] = set()
+        trie: dict = {}
+        for term, spec in keywords.items():
+            for variant in [term, *spec.get("variants", [])]:
+                key = _lookup_key(variant)
+                if self._lookup.get(key, (term,))[0] != term:
+                    raise ValueError(f"Variante {variant!r} von {term!r} gehört schon zu {self._lookup[key][0]!r}")
+                self._lookup[key] = (term, spec["category"])
+                if _acronym(variant):
+                    acronyms.setdefault(key, set()).add(_acronym(variant))
+                else:
+                    any_case.add(key)
+                node = trie
+                for char in _trie_key(variant):
+                    node = node.setdefault(char, {})
+                node[""] = True
+
+        # The scan itself stays case-insensitive; acronym matches are checked
+        # against their spellings afterwards (lookup key → accepted spellings)
+        _fold_separators(trie)
+        self._acronyms = {key: spellings for key, spellings in acronyms.items() if key not in any_case}
+
+        # (?<!\w) / (?!\w): word boundaries that also work next to "*", "/" or ")"
+        self.pattern = re.compile(rf"(?<!\w)(?:{_trie_pattern(trie)})(?!\w)", re.IGNORECASE)
+
+    def scan(self, text: str) -> list[KeywordMatch]:
+        """All keywords found in text, most frequent first."""
+        found: dict[str, list[tuple[int, int]]] = {}
+        categories: dict[str, str] = {}
+        for match in self.pattern.finditer(text or ""):
+            key = _lookup_key(match.group())
+            entry = self._lookup.get(key)
+            if entry is None:
+                continue  # case-folding corner cases (e.g. "ß" vs. "SS")
+            if key in self._acronyms and _SEPARATORS.sub("", match.group()) not in self._acronyms[key]:
+                continue  # "log", "Ids": an ordinary word, not the acronym
+            term, category = entry
+            found.setdefault(term, []).append(match.span())
+            categories[term] = category
+
+        matches = [KeywordMatch(term, categories[term], len(spans), spans) for term, spans in found.items()]
+        matches.sort(key=lambda m: (-m.count, m.positions[0][0]))
+        return matches
+
+    def terms(self, text: str, category: str = None) -> list[str]:
+        """Canonical terms found in text, optionally of one category only."""
+        return [m.term for m in self.scan(text) if category is None or m.category == category]
+
+
+# Compiled once per process
+AEC_MATCHER = KeywordMatcher(AEC_KEYWORDS)
+
+
+def find_keywords(text: str) -> list[KeywordMatch]:
+    return AEC_MATCHER.scan(text)
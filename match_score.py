@@ -0,0 +1,113 @@
+# match_score.py
+# Keyword match score between a profile and job ads — fully local, no
+# Gemini round-trip, a few milliseconds per update.
+#
+# Every job ad becomes a sparse vector over the AEC keyword vocabulary
+# (keywords.py), weighted by how often the ad repeats a term. The profile
+# becomes a 0/1 vector of the terms it covers. Coverage = weight of the
+# ad's terms the profile covers / total weight of the ad's terms.
+#
+# Many ads are stacked into one CSR matrix (indptr / indices / data as in
+# scipy.sparse), so scoring a CV against hundreds of stored ads is a single
+# batched numpy operation instead of a Python loop.
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from keywords import AEC_KEYWORDS, AEC_MATCHER
+from models import UserProfile
+
+VOCABULARY = list(AEC_KEYWORDS)
+TERM_INDEX = {term: i for i, term in enumerate(VOCABULARY)}
+
+
+class MatchScore(NamedTuple):
+    score: float            # 0–100 % of the ad's (weighted) keywords covered
+    matched: list[str]      # ad terms the profile covers, most important first
+    missing: list[str]      # ad terms the profile lacks, most important first
+
+
+def _term_weight(count: int) -> float:
+    # Sub-linear: a term named five times matters more, but not five times more
+    return 1.0 + math.log(count)
+
+
+def profile_text(profile: UserProfile) -> str:
+    """Everything in the profile that can show a skill or role."""
+    return "\n".join(filter(None, [
+        ", ".join(profile.bim_roles),
+        ", ".join(profile.software_skills),
+        profile.degree,
+        profile.thesis_title,
+        profile.cv_extracted_text,
+    ]))
+
+
+def profile_vector(profile: UserProfile) -> np.ndarray:
+    """Dense 0/1 vector over VOCABULARY — the vocabulary is small."""
+    vector = np.zeros(len(VOCABULARY), dtype=np.float32)
+    for term in AEC_MATCHER.terms(profile_text(profile)):
+        vector[TERM_INDEX[term]] = 1.0
+        # A "BIM Koordinator" covers "BIM" too, though the longer match wins the scan
+        for word in term.split():
+            if word in TERM_INDEX:
+                vector[TERM_INDEX[word]] = 1.0
+    return vector
+
+
+class JobAdIndex:
+    """
+    CSR matrix of term weights, one row per job ad. Build it once for a set
+    of stored ads, then score any number of profiles against all of them.
+    """
+
+    def __init__(self, job_ad_texts: list[str]):
+        indptr = [0]
+        indices: list[int] = []
+        data: list[float] = []
+        for text in job_ad_texts:
+            for match in AEC_MATCHER.scan(text):
+                indices.append(TERM_INDEX[match.term])
+                data.append(_term_weight(match.count))
+            indptr.append(len(indices))
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float32)
+        self.n_ads = len(job_ad_texts)
+        # Row id of every stored value, for the per-row sums below
+        self._rows = np.repeat(np.arange(self.n_ads), np.diff(self.indptr))
+
+    def scores(self, profile_vec: np.ndarray) -> np.ndarray:
+        """Coverage 0–100 of every ad, in one pass over the stored values."""
+        covered = np.bincount(self._rows, weights=self.data * profile_vec[self.indices], minlength=self.n_ads)
+        total = np.bincount(self._rows, weights=self.data, minlength=self.n_ads)
+        # Ads without any known keyword get 0 instead of a division by zero
+        return np.divide(covered, total, out=np.zeros(self.n_ads), where=total > 0) * 100
+
+    def explain(self, row: int, profile_vec: np.ndarray) -> MatchScore:
+        """Score plus matched/missing terms for one ad."""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        weights = self.data[start:end]
+        terms = self.indices[start:end]
+        covered = profile_vec[terms]
+        total = float(weights.sum())
+        score = float((weights * covered).sum()) / total * 100 if total else 0.0
+
+        order = np.argsort(-weights, kind="stable")
+        matched = [VOCABULARY[t] for t in terms[order] if profile_vec[t]]
+        missing = [VOCABULARY[t] for t in terms[order] if not profile_vec[t]]
+        return MatchScore(score, matched, missing)
+
+
+def match_score(profile: UserProfile, job_ad_text: str = None) -> MatchScore:
+    """Coverage of one job ad (default: the profile's own) by the profile."""
+    index = JobAdIndex([job_ad_text if job_ad_text is not None else profile.job_ad_text])
+    return index.explain(0, profile_vector(profile))
+
+
+def score_job_ads(profile: UserProfile, job_ad_texts: list[str]) -> np.ndarray:
+    """Coverage 0–100 of each job ad by the profile, computed in one batch."""
+    return JobAdIndex(job_ad_texts).scores(profile_vector(profile))
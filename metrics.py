@@ -0,0 +1,267 @@
+# metrics.py
+# Lightweight in-process metrics: where do the seconds of a request go?
+#
+#   with timed("build_cv_prompt"):        # or @timed("...") on a function
+#       ...
+#
+# Every timed stage lands in
+#   - a histogram per stage (bewerbungsbot_stage_seconds{stage="..."}) in
+#     the process-wide REGISTRY, exposed in the Prometheus text format by
+#     render_prometheus() / serve() (METRICS_PORT in app.py), and
+#   - the Trace of the current request, if one was started (start_trace):
+#     the app's debug panel shows the last one, and finish_trace() logs it
+#     as one line.
+# Token counts come from Gemini's usage metadata (record_tokens).
+#
+# The current trace lives in a contextvar. Code that hands work to other
+# threads passes it along with contextvars.copy_context().run.
+
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds; from cached lookups up to a slow Gemini answer
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+INF_LABEL = 'le="+Inf"'
+
+
+def _label_text(label_names: tuple, label_values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.label_names), 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.label_names, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram per label combination, like a Prometheus client's."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple, label_names: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = label_names
+        self._series = {}  # label values → [counts per bucket + overflow, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def summary(self) -> dict[tuple, dict]:
+        """Per label combination: count, mean and bucket-estimated p50/p95."""
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        return {
+            key: {"count": count, "mean": total / count,
+                  "p50": self._quantile(counts, count, 0.5), "p95": self._quantile(counts, count, 0.95)}
+            for key, (counts, total, count) in series.items()
+        }
+
+    def _quantile(self, counts: list[int], count: int, q: float) -> float:
+        # Upper bound of the bucket holding the q-quantile — coarse, but cheap
+        rank, seen = q * count, 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound if bound != float("inf") else self.buckets[-1]
+        return self.buckets[-1]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_label_text(self.label_names, key, le)} {cumulative}")
+                lines.append(f"{self.name}_bucket{_label_text(self.label_names, key, INF_LABEL)} {count}")
+                lines.append(f"{self.name}_sum{_label_text(self.label_names, key)} {total!r}")
+                lines.append(f"{self.name}_count{_label_text(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name: str, help_text: str, label_names: tuple = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help_text, label_names))
+
+    def histogram(self, name: str, help_text: str, buckets: tuple, label_names: tuple = ()) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help_text, buckets, label_names))
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram(
+    "bewerbungsbot_stage_seconds", "Duration of one pipeline stage", STAGE_BUCKETS, ("stage",)
+)
+GEMINI_TOKENS = REGISTRY.counter(
+    "bewerbungsbot_gemini_tokens_total", "Tokens billed by Gemini, per kind", ("kind",)
+)
+GEMINI_REQUEST_TOKENS = REGISTRY.histogram(
+    "bewerbungsbot_gemini_request_tokens", "Tokens per Gemini call, per kind", TOKEN_BUCKETS, ("kind",)
+)
+
+
+# ─────────────────────────────────────────────
+# PER-REQUEST TRACE
+# ─────────────────────────────────────────────
+class Trace:
+    """Stages and tokens of one request, in completion order. Thread-safe."""
+
+    def __init__(self, name: str = "request"):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages = []   # (stage, seconds)
+        self.tokens = {"prompt": 0, "output": 0}
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.append((stage, seconds))
+
+    def add_tokens(self, prompt: int, output: int) -> None:
+        with self._lock:
+            self.tokens["prompt"] += prompt
+            self.tokens["output"] += output
+
+    def has(self, stage: str) -> bool:
+        return any(name == stage for name, _ in self.stages)
+
+    def summary(self) -> str:
+        parts = [f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in self.stages]
+        parts.append(f"tokens {self.tokens['prompt']}→{self.tokens['output']}")
+        return f"{self.name}: " + ", ".join(parts)
+
+
+_current_trace = contextvars.ContextVar("metrics_trace", default=None)
+
+
+def start_trace(name: str = "request") -> Trace:
+    """Starts a new trace for this thread's context (and contexts copied from it)."""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def finish_trace(trace: Trace) -> None:
+    """Logs the trace as one line, if anything was recorded."""
+    if trace.stages:
+        logger.info("%s — %.0f ms wall", trace.summary(), (time.perf_counter() - trace.started) * 1000)
+
+
+@contextmanager
+def timed(stage: str):
+    """Times the block (or the decorated function) as `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_SECONDS.observe(seconds, stage=stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_stage(stage, seconds)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """For durations measured elsewhere, e.g. time to first streamed chunk."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_stage(stage, seconds)
+
+
+def record_tokens(usage_metadata) -> None:
+    """Token counts of one Gemini call (response.usage_metadata; None is ignored)."""
+    if usage_metadata is None:
+        return
+    prompt = usage_metadata.prompt_token_count or 0
+    output = usage_metadata.candidates_token_count or 0
+    for kind, count in (("prompt", prompt), ("output", output)):
+        GEMINI_TOKENS.inc(count, kind=kind)
+        GEMINI_REQUEST_TOKENS.observe(count, kind=kind)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_tokens(prompt, output)
+
+
+# ─────────────────────────────────────────────
+# PROMETHEUS ENDPOINT
+# ─────────────────────────────────────────────
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serves GET /metrics from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Metrics on http://%s:%d/metrics", host, port)
+    return server
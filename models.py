@@ -55,3 +55,28 @@ class UserProfile(BaseModel):
 
 
 
+
+
+# ─────────────────────────────────────────────
+# Structured CV output — the response schema Gemini fills in JSON mode
+# (generator.generate_cv(..., structured=True)). Plain strings only: no
+# **markers**, no bullet characters; the layout is document_builder's job.
+# ─────────────────────────────────────────────
+class CVEntry(BaseModel):
+    start: str                              # MM/YYYY
+    end: Optional[str] = None               # MM/YYYY, "heute", or None for a single date
+    title: str                              # job title / degree / certificate
+    organization: Optional[str] = None      # company / university / institution
+    location: Optional[str] = None
+    bullets: list[str] = []                 # tasks and achievements
+    details: list[str] = []                 # e.g. "Abschlussarbeit: …", "Note: 1,3"
+
+
+class CVSection(BaseModel):
+    title: str                              # e.g. "BERUFSERFAHRUNG"
+    lines: list[str] = []                   # undated lines: "Geburtsdatum: …", "Deutsch – Muttersprache"
+    entries: list[CVEntry] = []             # dated two-column entries
+
+
+class GeneratedCV(BaseModel):
+    sections: list[CVSection]
@@ -0,0 +1,204 @@
+# ocr.py
+# OCR fallback for PDF pages without a text layer (scanned CVs, photographed
+# certificates). cv_extractor calls ocr_pages() only for the pages
+# pdfplumber found no text on; pages that have text are never rasterized.
+#
+#   1. the page is rendered with pypdfium2 (comes with pdfplumber) as
+#      grayscale at OCR_DPI — 300 dpi by default, Tesseract's sweet spot
+#      for 10–11 pt CV fonts; benchmarks/ocr_dpi.py measures time and
+#      accuracy per DPI. Oversized pages are scaled down to OCR_MAX_PIXELS.
+#   2. Tesseract (pytesseract) reads it with OCR_LANGUAGES (deu+eng)
+#   3. the text is cached by a hash of the page's content streams and
+#      images, so the same scan inside another upload isn't read again
+#
+# Several pages run in parallel on a process pool (OCR_WORKERS); each
+# Tesseract process is limited to one thread, so the pool sets the
+# parallelism. Every page's OCR time is logged and recorded as the
+# "ocr_page" stage in metrics.
+#
+# Optional: without pytesseract or the tesseract binary, ocr_available()
+# is False and scanned pages stay empty, as before.
+#   apt install tesseract-ocr tesseract-ocr-deu   +   pip install pytesseract
+
+import hashlib
+import io
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+
+from cache import LRUCache
+from metrics import record_stage
+
+logger = logging.getLogger(__name__)
+
+OCR_ENABLED = os.getenv("OCR_ENABLED", "1") == "1"
+OCR_DPI = int(os.getenv("OCR_DPI", 300))
+OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "deu+eng")
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", min(4, os.cpu_count() or 1)))
+# ~ A4 at 400 dpi; bigger pages (posters, A3 scans) are rendered at a lower dpi
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", 16_000_000))
+
+# Bump when rendering or Tesseract settings change, so cached texts are redone
+OCR_VERSION = 1
+
+_ocr_cache = LRUCache(
+    max_bytes=int(os.getenv("OCR_CACHE_MAX_BYTES", 8 * 1024 * 1024)),
+    disk_dir=os.getenv("OCR_CACHE_DIR") or None,
+)
+
+
+class PageOCR(NamedTuple):
+    page: int         # 1-based
+    text: str
+    seconds: float    # render + Tesseract; 0 for a cache hit
+    dpi: int
+    cached: bool
+
+
+@lru_cache(maxsize=1)
+def ocr_languages() -> str:
+    """
+    The OCR_LANGUAGES Tesseract actually has installed, joined with "+",
+    or "" if OCR can't run here (no pytesseract, no binary, no language).
+    """
+    if not OCR_ENABLED:
+        return ""
+    try:
+        import pytesseract
+        installed = set(pytesseract.get_languages(config=""))
+    except Exception as e:  # ImportError, TesseractNotFoundError, ...
+        logger.info("OCR not available: %s", e)
+        return ""
+    wanted = OCR_LANGUAGES.split("+")
+    missing = [lang for lang in wanted if lang not in installed]
+    if missing:
+        logger.warning("⚠️ Tesseract language packs missing: %s", ", ".join(missing))
+    return "+".join(lang for lang in wanted if lang in installed)
+
+
+def ocr_available() -> bool:
+    return bool(ocr_languages())
+
+
+def page_hashes(file_bytes: bytes, pages: list[int]) -> dict[int, str]:
+    """
+    Content hash per page (1-based): its content streams and the raw,
+    still-compressed data of the images and forms it draws — no decoding,
+    no rendering.
+    """
+    import pdfplumber
+    from pdfminer.pdftypes import PDFStream, resolve1
+
+    hashes = {}
+    with pdfplumber.open(io.BytesIO(file_bytes), pages=pages) as pdf:
+        for page in pdf.pages:
+            page_obj = page.page_obj
+            digest = hashlib.sha256(repr((page_obj.mediabox, page_obj.attrs.get("Rotate", 0))).encode())
+            for stream in page_obj.contents:
+                digest.update(resolve1(stream).get_rawdata() or b"")
+            xobjects = resolve1((page_obj.resources or {}).get("XObject")) or {}
+            for name in sorted(xobjects):
+                xobject = resolve1(xobjects[name])
+                if isinstance(xobject, PDFStream):
+                    digest.update(xobject.get_rawdata() or b"")
+            hashes[page.page_number] = digest.hexdigest()
+            page.close()
+    return hashes
+
+
+# ─────────────────────────────────────────────
+# RENDER + TESSERACT (runs in the worker processes)
+# ─────────────────────────────────────────────
+_worker_pdf_bytes = None
+
+
+def _init_worker(file_bytes: bytes) -> None:
+    # The PDF travels to each worker once, not once per page
+    global _worker_pdf_bytes
+    _worker_pdf_bytes = file_bytes
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _render_dpi(page_width_pt: float, page_height_pt: float, dpi: int) -> int:
+    pixels = (page_width_pt / 72 * dpi) * (page_height_pt / 72 * dpi)
+    if pixels <= OCR_MAX_PIXELS:
+        return dpi
+    return int(dpi * (OCR_MAX_PIXELS / pixels) ** 0.5)
+
+
+def ocr_page(file_bytes: bytes, page: int, dpi: int = OCR_DPI, languages: str = None) -> tuple[str, float, int]:
+    """Rasterizes one page (1-based) and reads it with Tesseract. Returns (text, seconds, dpi used)."""
+    import pypdfium2
+    import pytesseract
+
+    start = time.perf_counter()
+    document = pypdfium2.PdfDocument(file_bytes)
+    try:
+        pdf_page = document[page - 1]
+        dpi = _render_dpi(*pdf_page.get_size(), dpi)
+        image = pdf_page.render(scale=dpi / 72, grayscale=True).to_pil()
+        pdf_page.close()
+    finally:
+        document.close()
+    text = pytesseract.image_to_string(image, lang=languages or ocr_languages(), config=f"--dpi {dpi}")
+    return text.strip(), time.perf_counter() - start, dpi
+
+
+def _ocr_worker_page(page: int, dpi: int, languages: str) -> tuple[str, float, int]:
+    return ocr_page(_worker_pdf_bytes, page, dpi, languages)
+
+
+def _ocr_page_or_error(file_bytes: bytes, page: int, dpi: int, languages: str):
+    """ocr_page, or the exception it raised — the serial twin of future.exception()."""
+    try:
+        return ocr_page(file_bytes, page, dpi, languages)
+    except Exception as e:
+        return e
+
+
+# ─────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────
+def ocr_pages(file_bytes: bytes, pages: list[int], dpi: int = OCR_DPI, workers: int = OCR_WORKERS) -> list[PageOCR]:
+    """
+    OCR for the given pages (1-based), in the given order; cached pages
+    aren't rendered again. Empty list if OCR isn't available. A page whose
+    rendering or OCR fails is logged and comes back with empty text.
+    workers: >1 reads uncached pages on that many processes
+    """
+    languages = ocr_languages()
+    if not languages or not pages:
+        return []
+
+    hashes = page_hashes(file_bytes, pages)
+    keys = {page: f"ocr-v{OCR_VERSION}-{dpi}-{languages}-{hashes[page]}" for page in pages}
+    results = {}
+    for page in pages:
+        cached = _ocr_cache.get(keys[page])
+        if cached is not None:
+            results[page] = PageOCR(page, cached, 0.0, dpi, True)
+
+    todo = list(dict.fromkeys(page for page in pages if page not in results))
+    if len(todo) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), initializer=_init_worker,
+                                 initargs=(file_bytes,)) as pool:
+            futures = {page: pool.submit(_ocr_worker_page, page, dpi, languages) for page in todo}
+            done = {page: future.exception() or future.result() for page, future in futures.items()}
+    else:
+        done = {page: _ocr_page_or_error(file_bytes, page, dpi, languages) for page in todo}
+
+    for page, outcome in done.items():
+        if isinstance(outcome, BaseException):
+            # A damaged page or a Tesseract failure only costs that page
+            logger.warning("⚠️ OCR page %d failed: %s: %s", page, type(outcome).__name__, outcome)
+            results[page] = PageOCR(page, "", 0.0, dpi, False)
+            continue
+        text, seconds, used_dpi = outcome
+        _ocr_cache.set(keys[page], text)
+        record_stage("ocr_page", seconds)
+        logger.info("OCR page %d: %.2f s at %d dpi, %d chars", page, seconds, used_dpi, len(text))
+        results[page] = PageOCR(page, text, round(seconds, 3), used_dpi, False)
+    return [results[page] for page in pages]
@@ -1,35 +1,26 @@
 # parser.py
 # pdfplumber reads the embedded text layer of PDF (not OCR/computer vision)
 # It is the best library for layout-heavy German CVs with two-column tables
-# python-docx handles .docx files by iterating paragraph objects
+# .docx files go through the same streaming XML reader as cv_extractor
 
-import pdfplumber
-from docx import Document
+from cv_extractor import iter_docx_lines, iter_pdf_pages
 
-def extract_from_pdf(uploaded_file) -> str:
+def extract_from_pdf(uploaded_file, max_pages: int = None) -> str:
     """
     Takes a Streamlit UploadedFile object (PDF).
     Returns all text as a single string, pages joined by newline.
-    Generator expression used for memory efficiency - one page at a time.
+    Uses the shared single-pass engine in cv_extractor - one page at a time,
+    each page extracted once and released afterwards.
     """
-
-    with pdfplumber.open(uploaded_file) as pdf:
-        return "\n".join(
-            page.extract_text() for page in pdf.pages
-            if page.extract_text() is not None
-        )
+    return "\n".join(iter_pdf_pages(uploaded_file, max_pages=max_pages))
 
 def extract_from_docx(uploaded_file) -> str:
     """
     Takes a Streamlit UploadedFile object (DOCX).
-    Returns all paragraph text joined by newline.
+    Returns all text joined by newline, in reading order: headers,
+    paragraphs, table rows and text boxes (see cv_extractor.iter_docx_lines).
     """
-    doc = Document(uploaded_file)
-    return "\n".join(
-        paragraph.text
-        for paragraph in doc.paragraphs
-        if paragraph.text.strip() != ""
-    )
+    return "\n".join(iter_docx_lines(uploaded_file))
 
 def extract_document_text(uploaded_file) -> str:
     """
@@ -0,0 +1,284 @@
+# pdf_builder.py
+# Native PDF export: renders the same document model as document_builder
+# (see document_model.py) straight to PDF with fpdf2 — no Word, no
+# LibreOffice, no extra process per file.
+#
+# Layout mirrors the .docx: A4, DIN 5008 margins, two-column CV (date |
+# content), the same sizes, spacing and colors. Text is set in Helvetica,
+# the PDF standard font metric-compatible with Arial: nothing gets
+# embedded, and its width tables are turned into per-character dicts once
+# per process. Lines are broken here with those tables and placed with
+# FPDF.text(); fpdf2's own write()/multi_cell() line breaker re-measures
+# text character by character and would take most of the render time.
+# The standard fonts cover Windows-1252 — all German text plus "–", "•",
+# "„“" and "€"; anything else becomes "?".
+
+import io
+import os
+import re
+from typing import Union
+
+from fpdf import FPDF
+from fpdf.fonts import CORE_FONTS_CHARWIDTHS
+
+from cache import LRUCache, content_hash
+from metrics import timed
+from document_model import (
+    CVDocument, CoverLetterDocument, Paragraph, Span, document_hash, parse_cv_text, parse_cover_letter_text
+)
+
+# Bump whenever the layout below changes (see document_builder.TEMPLATE_VERSION)
+PDF_LAYOUT_VERSION = 2
+
+FONT = "Helvetica"
+DARK_BLUE = (0x1F, 0x35, 0x64)
+PLACEHOLDER_GREY = (0xCC, 0xCC, 0xCC)
+MM_PER_PT = 25.4 / 72
+LINE_SPACING = 1.15                         # Word's single spacing for Arial
+ASCENT = 0.905                              # baseline below the line top, in em
+
+# All in mm — the same numbers as templates/base.docx
+LEFT_MARGIN, TOP_MARGIN, RIGHT_MARGIN = 25.0, 25.0, 20.0
+CV_BOTTOM_MARGIN, LETTER_BOTTOM_MARGIN = 25.0, 20.0
+DATE_COLUMN_WIDTH = 1.8 * 25.4
+CONTENT_COLUMN_WIDTH = 4.2 * 25.4
+PHOTO_WIDTH, PHOTO_HEIGHT = 35.0, 45.0
+BULLET_INDENT = 4.5
+
+_rendered_pdfs = LRUCache(max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", 32 * 1024 * 1024)))
+
+WORD = re.compile(r"\S+\s*|\s+")
+
+
+def _char_widths(style: str) -> dict[str, float]:
+    # fpdf2 indexes the table by Windows-1252 byte; re-key it by character (em units)
+    table = CORE_FONTS_CHARWIDTHS["helvetica" + style]
+    widths = {}
+    for byte in range(256):
+        try:
+            widths[bytes([byte]).decode("cp1252")] = table[chr(byte)] / 1000
+        except UnicodeDecodeError:
+            continue
+    return widths
+
+
+_CHAR_WIDTHS = {False: _char_widths(""), True: _char_widths("B")}
+
+
+def _safe(text: str) -> str:
+    return text.encode("cp1252", "replace").decode("cp1252")
+
+
+def _pt(points: float) -> float:
+    return points * MM_PER_PT
+
+
+def _line_height(size: float) -> float:
+    return _pt(size * LINE_SPACING)
+
+
+def _new_pdf(bottom_margin: float, title: str, author: str) -> FPDF:
+    pdf = FPDF(orientation="portrait", unit="mm", format="A4")
+    pdf.core_fonts_encoding = "windows-1252"
+    pdf.set_margins(LEFT_MARGIN, TOP_MARGIN, RIGHT_MARGIN)
+    # Page breaks are placed by _write_spans, line by line
+    pdf.set_auto_page_break(False, margin=bottom_margin)
+    pdf.set_title(_safe(title))
+    pdf.set_author(_safe(author))
+    pdf.add_page()
+    return pdf
+
+
+def _text_width(text: str, bold: bool, size: float) -> float:
+    widths = _CHAR_WIDTHS[bold]
+    return sum(widths.get(char, 0.556) for char in text) * _pt(size)
+
+
+def _fitting_prefix(word: str, bold: bool, size: float, width: float) -> int:
+    """Length of the longest prefix of word that fits into width — at least one character."""
+    widths = _CHAR_WIDTHS[bold]
+    limit = width / _pt(size)
+    used = 0.0
+    for index, char in enumerate(word):
+        used += widths.get(char, 0.556)
+        if used > limit:
+            return max(index, 1)
+    return len(word)
+
+
+def _break_lines(spans: list[Span], size: float, width: float, bold: bool) -> list[list[tuple[str, bool]]]:
+    """
+    Greedy line breaking; returns lines of (text, bold) segments. A word
+    wider than the whole column (long compounds, URLs) is split hard.
+    """
+    lines, line, line_width = [], [], 0.0
+    for span in spans:
+        span_bold = span.bold or bold
+        for word in WORD.findall(_safe(span.text)):
+            word_width = _text_width(word.rstrip(), span_bold, size)
+            if line and line_width + word_width > width:
+                lines.append(line)
+                line, line_width = [], 0.0
+                word = word.lstrip()
+            while not line and word_width > width and word.strip():
+                cut = _fitting_prefix(word, span_bold, size, width)
+                lines.append([(word[:cut], span_bold)])
+                word = word[cut:]
+                word_width = _text_width(word.rstrip(), span_bold, size)
+            if line and line[-1][1] == span_bold:
+                line[-1] = (line[-1][0] + word, span_bold)
+            else:
+                line.append((word, span_bold))
+            line_width += _text_width(word, span_bold, size)
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _write_spans(pdf: FPDF, spans: list[Span], size: float, x: float, width: float,
+                 bold: bool = False, color: tuple = (0, 0, 0), space_after: float = 0) -> None:
+    """
+    Writes spans into the column [x, x + width] from the current y,
+    wrapping inside the column, and moves below the paragraph.
+    """
+    pdf.set_text_color(*color)
+    line_height = _line_height(size)
+    y = pdf.get_y()
+    for line in _break_lines(spans, size, width, bold):
+        if y + line_height > pdf.page_break_trigger:
+            pdf.add_page()
+            y = pdf.t_margin
+        segment_x = x
+        for text, segment_bold in line:
+            pdf.set_font(FONT, "B" if segment_bold else "", size)
+            pdf.text(segment_x, y + _pt(size) * ASCENT, text)
+            segment_x += _text_width(text, segment_bold, size)
+        y += line_height
+    pdf.set_y(y + _pt(space_after))
+
+
+def _write_cv_paragraph(pdf: FPDF, paragraph: Paragraph, x: float, width: float) -> None:
+    if paragraph.kind == "bullet":
+        y = pdf.get_y()
+        if y + _line_height(10) > pdf.page_break_trigger:
+            pdf.add_page()
+            y = pdf.get_y()
+        pdf.set_font(FONT, "", 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.text(x, y + _pt(10) * ASCENT, "•")
+        _write_spans(pdf, paragraph.spans, 10, x + BULLET_INDENT, width - BULLET_INDENT, space_after=2)
+    else:
+        _write_spans(pdf, paragraph.spans, 10, x, width, space_after=2)
+
+
+def _write_cv_header(pdf: FPDF, full_name: str, photo: bytes = None) -> None:
+    photo_x = pdf.w - RIGHT_MARGIN - PHOTO_WIDTH
+    _write_spans(pdf, [Span(text=full_name.upper())], 16, LEFT_MARGIN, photo_x - LEFT_MARGIN - 5,
+                 bold=True, color=DARK_BLUE)
+    header_bottom = pdf.get_y()
+
+    placeholder = "[Foto]"
+    if photo:
+        try:
+            pdf.image(io.BytesIO(photo), x=photo_x, y=TOP_MARGIN, w=PHOTO_WIDTH, h=PHOTO_HEIGHT)
+            header_bottom = max(header_bottom, TOP_MARGIN + PHOTO_HEIGHT)
+            placeholder = None
+        except Exception:
+            placeholder = "[Foto einfügen]"
+    if placeholder:
+        pdf.set_font(FONT, "", 8)
+        pdf.set_text_color(*PLACEHOLDER_GREY)
+        pdf.text(pdf.w - RIGHT_MARGIN - _text_width(_safe(placeholder), False, 8),
+                 TOP_MARGIN + _pt(8) * ASCENT, _safe(placeholder))
+
+    # Spacer paragraph after the header, as in the .docx
+    pdf.set_y(header_bottom + _line_height(10))
+
+
+@timed("render_cv_pdf")
+def render_cv_pdf(cv: Union[CVDocument, str], full_name: str, photo: bytes = None) -> bytes:
+    """
+    CV as PDF bytes.
+    cv: parsed CVDocument, or raw CV text (parsed here)
+    photo: image bytes, ideally from photo.prepare_photo
+    """
+    if isinstance(cv, str) or cv is None:
+        cv = parse_cv_text(cv)
+
+    pdf = _new_pdf(CV_BOTTOM_MARGIN, f"Lebenslauf {full_name}", full_name)
+    _write_cv_header(pdf, full_name, photo)
+
+    content_x = LEFT_MARGIN + DATE_COLUMN_WIDTH
+    for section in cv.sections:
+        if section.title:
+            pdf.set_y(pdf.get_y() + _pt(6))
+            _write_spans(pdf, [Span(text=section.title)], 11, LEFT_MARGIN, pdf.epw,
+                         bold=True, color=DARK_BLUE)
+
+        for item in section.items:
+            if isinstance(item, Paragraph):
+                _write_cv_paragraph(pdf, item, LEFT_MARGIN, pdf.epw)
+                continue
+
+            # Date and first content line stay on the same page
+            if pdf.get_y() + _line_height(10) > pdf.page_break_trigger:
+                pdf.add_page()
+            top, page = pdf.get_y(), pdf.page
+            _write_spans(pdf, [Span(text=item.date)], 10, LEFT_MARGIN, DATE_COLUMN_WIDTH - 2)
+            date_bottom = pdf.get_y()
+
+            pdf.set_y(top)
+            _write_spans(pdf, item.content, 10, content_x, CONTENT_COLUMN_WIDTH, space_after=2)
+            for detail in item.details:
+                _write_cv_paragraph(pdf, detail, content_x, CONTENT_COLUMN_WIDTH)
+            if pdf.page == page:
+                pdf.set_y(max(pdf.get_y(), date_bottom))
+
+    return bytes(pdf.output())
+
+
+@timed("render_cover_letter_pdf")
+def render_cover_letter_pdf(cover_letter: Union[CoverLetterDocument, str], full_name: str) -> bytes:
+    """
+    DIN 5008 cover letter as PDF bytes.
+    cover_letter: parsed CoverLetterDocument, or raw text (parsed here)
+    """
+    if isinstance(cover_letter, str) or cover_letter is None:
+        cover_letter = parse_cover_letter_text(cover_letter)
+
+    pdf = _new_pdf(LETTER_BOTTOM_MARGIN, f"Anschreiben {full_name}", full_name)
+    for paragraph in cover_letter.paragraphs:
+        if paragraph.kind == "blank":
+            pdf.set_y(pdf.get_y() + _line_height(10))
+        elif paragraph.kind == "subject":
+            pdf.set_y(pdf.get_y() + _pt(12))
+            _write_spans(pdf, paragraph.spans, 11, LEFT_MARGIN, pdf.epw, bold=True, space_after=6)
+        else:
+            _write_spans(pdf, paragraph.spans, 10.5, LEFT_MARGIN, pdf.epw, space_after=6)
+    return bytes(pdf.output())
+
+
+def cv_pdf_bytes(cv: Union[CVDocument, str], full_name: str, photo: bytes = None) -> bytes:
+    """render_cv_pdf, memoized like document_builder.cv_document_bytes."""
+    key = "|".join([
+        "cv-pdf", str(PDF_LAYOUT_VERSION), document_hash(cv),
+        content_hash(full_name.encode("utf-8")), content_hash(photo) if photo else "none",
+    ])
+    document = _rendered_pdfs.get(key)
+    if document is None:
+        document = render_cv_pdf(cv, full_name, photo=photo)
+        _rendered_pdfs.set(key, document)
+    return document
+
+
+def cover_letter_pdf_bytes(cover_letter: Union[CoverLetterDocument, str], full_name: str) -> bytes:
+    """render_cover_letter_pdf, memoized."""
+    key = "|".join([
+        "cl-pdf", str(PDF_LAYOUT_VERSION), document_hash(cover_letter),
+        content_hash(full_name.encode("utf-8")),
+    ])
+    document = _rendered_pdfs.get(key)
+    if document is None:
+        document = render_cover_letter_pdf(cover_letter, full_name)
+        _rendered_pdfs.set(key, document)
+    return document
@@ -0,0 +1,81 @@
+# photo.py
+# Profile photo for the CV header. An uploaded phone photo is often
+# 5–10 MB at 4000 px; the CV prints it at 3.5 × 4.5 cm. Here it is
+# prepared once per distinct upload:
+#   1. EXIF rotation applied, transparency flattened onto white
+#   2. cropped to the 35:45 passport aspect (centered, a bit above the
+#      middle, where the face usually is)
+#   3. downsampled to print resolution (300 dpi → 413 × 531 px)
+#   4. re-encoded as a compact JPEG
+# and kept in memory by content hash, so reruns and both builders reuse
+# the same few dozen KB instead of the original file.
+
+import io
+import os
+
+from PIL import Image, ImageOps
+
+from cache import LRUCache, content_hash
+
+PHOTO_WIDTH_CM, PHOTO_HEIGHT_CM = 3.5, 4.5
+PRINT_DPI = 300
+JPEG_QUALITY = 85
+
+# Target size in pixels at print resolution
+PHOTO_SIZE = (round(PHOTO_WIDTH_CM / 2.54 * PRINT_DPI), round(PHOTO_HEIGHT_CM / 2.54 * PRINT_DPI))
+
+# Vertical crop position: 0 = keep the top, 0.5 = centered
+CROP_CENTER_Y = 0.35
+
+_prepared_photos = LRUCache(max_bytes=int(os.getenv("PHOTO_CACHE_MAX_BYTES", 8 * 1024 * 1024)))
+
+
+def _crop_to_aspect(image: Image.Image) -> Image.Image:
+    width, height = image.size
+    target_ratio = PHOTO_SIZE[0] / PHOTO_SIZE[1]
+    if width / height > target_ratio:
+        crop_width = round(height * target_ratio)
+        left = (width - crop_width) // 2
+        return image.crop((left, 0, left + crop_width, height))
+    crop_height = round(width / target_ratio)
+    top = round((height - crop_height) * CROP_CENTER_Y)
+    return image.crop((0, top, width, top + crop_height))
+
+
+def _prepare(photo_bytes: bytes) -> bytes:
+    image = Image.open(io.BytesIO(photo_bytes))
+    # JPEG only: let the decoder scale down by 1/2, 1/4 or 1/8 right away
+    # instead of decoding all 12 megapixels first
+    image.draft("RGB", (PHOTO_SIZE[0] * 2, PHOTO_SIZE[1] * 2))
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    image = _crop_to_aspect(image)
+    image.thumbnail(PHOTO_SIZE, Image.LANCZOS)  # never upscales
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True, dpi=(PRINT_DPI, PRINT_DPI))
+    return buffer.getvalue()
+
+
+def prepare_photo(photo_bytes: bytes) -> bytes:
+    """
+    Cropped, print-sized JPEG of an uploaded photo, cached by content hash.
+    Raises ValueError if the bytes are not a readable image.
+    """
+    key = content_hash(photo_bytes)
+    prepared = _prepared_photos.get(key)
+    if prepared is None:
+        try:
+            prepared = _prepare(photo_bytes)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ValueError(f"⚠️ Foto konnte nicht gelesen werden: {e}") from e
+        _prepared_photos.set(key, prepared)
+    return prepared
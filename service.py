@@ -0,0 +1,347 @@
+# service.py
+# Headless generation service: extraction, generation and document
+# rendering behind HTTP, so generation workers scale independently of the
+# Streamlit sessions (which then only submit jobs and poll, see
+# service_client.py). Every request is a job:
+#
+#   POST /jobs {"kind": ..., ...}   → 202 {"id": ..., "status": "queued"}
+#   GET  /jobs/{id}                 → {"status": "queued" | "running" | "done" | "failed",
+#                                      "result": {...} | "error": "..."}
+#   GET  /health                    → queue depth, workers, job counts
+#   GET  /metrics                   → metrics.REGISTRY, Prometheus text format
+#
+# Job kinds (binary data is base64):
+#   extract       {filename, data}                        → {text}
+#   cv            {profile, regenerate?, structured?}     → {cv}
+#   cover_letter  {profile, regenerate?}                  → {cover_letter}
+#   application   {profile, regenerate?, structured?}     → {cv, cover_letter}
+#   render        {format: "docx" | "pdf", full_name, cv?, cover_letter?, photo?}
+#                                                         → {cv?, cover_letter?}
+# profile is a models.UserProfile, cv / cover_letter in render are
+# document_model documents; a structured cv result is a models.GeneratedCV.
+# Generation errors come back the way generator returns them: as a result
+# text starting with "❌".
+#
+# Jobs wait in a bounded asyncio queue (a full queue answers 503 with
+# Retry-After); SERVICE_WORKERS workers run them in a thread pool, so the
+# event loop keeps answering polls while Gemini calls block. Jobs live in
+# the memory of the process that accepted them: for more throughput, start
+# more processes on their own ports and list them all in the app's
+# BEWERBUNGSBOT_SERVICE_URL — not `uvicorn --workers`, whose processes
+# don't share jobs.
+#
+# Run:  python service.py [--host 127.0.0.1] [--port 8000]
+#       (or uvicorn service:app --port 8000)
+
+import argparse
+import asyncio
+import base64
+import binascii
+import contextvars
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from pydantic import ValidationError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+import metrics
+from models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", 8))
+SERVICE_QUEUE_SIZE = int(os.getenv("SERVICE_QUEUE_SIZE", 100))
+# Seconds a finished job's result stays available for polling
+SERVICE_JOB_TTL = float(os.getenv("SERVICE_JOB_TTL", 600))
+
+JOBS_TOTAL = metrics.REGISTRY.counter(
+    "bewerbungsbot_service_jobs_total", "Finished service jobs, per kind and status", ("kind", "status")
+)
+QUEUE_SECONDS = metrics.REGISTRY.histogram(
+    "bewerbungsbot_service_queue_seconds", "Time a job waited for a worker", metrics.STAGE_BUCKETS, ("kind",)
+)
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str, run):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.run = run          # no-argument callable doing the blocking work
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self) -> dict:
+        job = {"id": self.id, "kind": self.kind, "status": self.status}
+        if self.started is not None:
+            job["queued_ms"] = round((self.started - self.submitted) * 1000)
+        if self.finished is not None:
+            job["run_ms"] = round((self.finished - self.started) * 1000)
+        if self.status == "done":
+            job["result"] = self.result
+        elif self.status == "failed":
+            job["error"] = self.error
+        return job
+
+
+# ─────────────────────────────────────────────
+# JOB KINDS
+# Each parses and validates its payload right away (a bad request is a
+# 400, not a failed job) and returns the work as a callable. Pipeline
+# modules are imported inside, like in app.py.
+# ─────────────────────────────────────────────
+def _decode(payload: dict, field: str) -> bytes:
+    try:
+        return base64.b64decode(payload[field], validate=True)
+    except (binascii.Error, TypeError) as e:
+        raise ValueError(f"{field}: kein gültiges Base64 ({e})")
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _cv_result(cv):
+    return cv if isinstance(cv, str) else cv.model_dump()
+
+
+def _extract_job(payload: dict):
+    from cv_extractor import extract_text
+
+    file_bytes, filename = _decode(payload, "data"), str(payload["filename"])
+    return lambda: {"text": extract_text(file_bytes, filename)}
+
+
+def _cv_job(payload: dict):
+    from generator import generate_cv
+
+    profile = UserProfile.model_validate(payload["profile"])
+    regenerate, structured = bool(payload.get("regenerate")), bool(payload.get("structured"))
+    return lambda: {"cv": _cv_result(generate_cv(profile, regenerate=regenerate, structured=structured))}
+
+
+def _cover_letter_job(payload: dict):
+    from generator import generate_cover_letter
+
+    profile = UserProfile.model_validate(payload["profile"])
+    regenerate = bool(payload.get("regenerate"))
+    return lambda: {"cover_letter": generate_cover_letter(profile, regenerate=regenerate)}
+
+
+def _application_job(payload: dict):
+    from generator import generate_application
+
+    profile = UserProfile.model_validate(payload["profile"])
+    regenerate, structured = bool(payload.get("regenerate")), bool(payload.get("structured"))
+
+    def run():
+        cv, cover_letter = generate_application(profile, regenerate=regenerate, structured=structured)
+        return {"cv": _cv_result(cv), "cover_letter": cover_letter}
+    return run
+
+
+def _render_job(payload: dict):
+    from document_model import CoverLetterDocument, CVDocument
+
+    file_format = payload.get("format", "docx")
+    if file_format not in ("docx", "pdf"):
+        raise ValueError(f"format must be 'docx' or 'pdf', got: {file_format!r}")
+    full_name = str(payload["full_name"])
+    cv = CVDocument.model_validate(payload["cv"]) if payload.get("cv") is not None else None
+    cover_letter = (CoverLetterDocument.model_validate(payload["cover_letter"])
+                    if payload.get("cover_letter") is not None else None)
+    photo = _decode(payload, "photo") if payload.get("photo") else None
+    if cv is None and cover_letter is None:
+        raise ValueError("render braucht cv und/oder cover_letter")
+
+    def run():
+        if file_format == "pdf":
+            from pdf_builder import cover_letter_pdf_bytes, cv_pdf_bytes
+            cv_bytes = cv_pdf_bytes(cv, full_name, photo=photo) if cv else None
+            cl_bytes = cover_letter_pdf_bytes(cover_letter, full_name) if cover_letter else None
+        else:
+            from document_builder import create_application_documents, cover_letter_document_bytes, cv_document_bytes
+            if cv and cover_letter:
+                cv_bytes, cl_bytes = create_application_documents(cv, cover_letter, full_name, photo=photo)
+            else:
+                cv_bytes = cv_document_bytes(cv, full_name, photo=photo) if cv else None
+                cl_bytes = cover_letter_document_bytes(cover_letter, full_name) if cover_letter else None
+        result = {}
+        if cv_bytes is not None:
+            result["cv"] = _encode(cv_bytes)
+        if cl_bytes is not None:
+            result["cover_letter"] = _encode(cl_bytes)
+        return result
+    return run
+
+
+JOB_KINDS = {
+    "extract": _extract_job,
+    "cv": _cv_job,
+    "cover_letter": _cover_letter_job,
+    "application": _application_job,
+    "render": _render_job,
+}
+
+
+# ─────────────────────────────────────────────
+# QUEUE + WORKER POOL
+# ─────────────────────────────────────────────
+class JobQueue:
+    def __init__(self, workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+                 job_ttl: float = SERVICE_JOB_TTL):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.job_ttl = job_ttl
+        self.jobs = {}
+        self._queue = None
+        self._executor = None
+        self._tasks = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, job: Job) -> None:
+        self._evict_finished()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.queue_size} Aufträge in der Warteschlange")
+        self.jobs[job.id] = job
+
+    def stats(self) -> dict:
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        for job in self.jobs.values():
+            counts[job.status] += 1
+        return {"workers": self.workers, "queue_size": self.queue_size, "jobs": counts}
+
+    def _evict_finished(self) -> None:
+        cutoff = time.monotonic() - self.job_ttl
+        for job_id in [job.id for job in self.jobs.values() if job.finished is not None and job.finished < cutoff]:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status, job.started = "running", time.monotonic()
+            QUEUE_SECONDS.observe(job.started - job.submitted, kind=job.kind)
+            try:
+                job.result = await loop.run_in_executor(self._executor, contextvars.copy_context().run,
+                                                        _run_traced, job)
+                job.status = "done"
+            except Exception as e:
+                logger.exception("Job %s (%s) failed", job.id, job.kind)
+                job.status, job.error = "failed", f"❌ {type(e).__name__}: {e}"
+            finally:
+                job.finished = time.monotonic()
+                JOBS_TOTAL.inc(kind=job.kind, status=job.status)
+                self._queue.task_done()
+
+
+def _run_traced(job: Job) -> dict:
+    trace = metrics.start_trace(f"job {job.kind}")
+    try:
+        return job.run()
+    finally:
+        metrics.finish_trace(trace)
+
+
+# ─────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────
+async def submit_job(request: Request) -> JSONResponse:
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "❌ Body ist kein JSON"}, status_code=400)
+    kind = payload.get("kind") if isinstance(payload, dict) else None
+    if kind not in JOB_KINDS:
+        return JSONResponse({"error": f"❌ Unbekannte Auftragsart: {kind!r}, erlaubt: {sorted(JOB_KINDS)}"},
+                            status_code=400)
+    try:
+        job = Job(kind, JOB_KINDS[kind](payload))
+    except (KeyError, ValueError, ValidationError) as e:
+        return JSONResponse({"error": f"❌ Ungültiger Auftrag ({kind}): {e}"}, status_code=400)
+
+    try:
+        request.app.state.jobs.submit(job)
+    except QueueFullError as e:
+        return JSONResponse({"error": f"❌ Dienst ausgelastet: {e}"}, status_code=503, headers={"Retry-After": "5"})
+    return JSONResponse(job.to_dict(), status_code=202)
+
+
+async def get_job(request: Request) -> JSONResponse:
+    job = request.app.state.jobs.jobs.get(request.path_params["job_id"])
+    if job is None:
+        return JSONResponse({"error": "❌ Auftrag unbekannt oder abgelaufen"}, status_code=404)
+    return JSONResponse(job.to_dict())
+
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok", **request.app.state.jobs.stats()})
+
+
+async def prometheus(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(metrics.REGISTRY.render_prometheus(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def create_app(job_queue: JobQueue = None) -> Starlette:
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.jobs = job_queue or JobQueue()
+        await app.state.jobs.start()
+        yield
+        await app.state.jobs.stop()
+
+    return Starlette(
+        routes=[
+            Route("/jobs", submit_job, methods=["POST"]),
+            Route("/jobs/{job_id}", get_job, methods=["GET"]),
+            Route("/health", health, methods=["GET"]),
+            Route("/metrics", prometheus, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+app = create_app()
+
+
+def main():
+    import uvicorn
+
+    arg_parser = argparse.ArgumentParser(description="Headless BewerbungsBot generation service")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8000)
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# service_client.py
+# app.py's side of service.py: when BEWERBUNGSBOT_SERVICE_URL is set, the
+# app imports extraction, generation and rendering from here instead of
+# running them itself. Same names and signatures as the local functions,
+# so the script barely notices — each call submits a job and polls until
+# it is done.
+#
+# BEWERBUNGSBOT_SERVICE_URL may list several service processes
+# ("http://gen1:8000,http://gen2:8000"): jobs go round-robin to them, a
+# full queue moves on to the next, and a job is always polled where it
+# was submitted.
+#
+# The service doesn't stream, so the *_stream functions deliver the whole
+# text as one chunk once the job is done. Extracted texts and rendered
+# documents are memoized here as well, so Streamlit reruns don't go over
+# the network again.
+
+import base64
+import itertools
+import os
+import threading
+import time
+from typing import Union
+
+from cache import LRUCache, content_hash
+from models import GeneratedCV, UserProfile
+
+SERVICE_URLS = [url.strip().rstrip("/") for url in os.getenv("BEWERBUNGSBOT_SERVICE_URL", "").split(",")
+                if url.strip()]
+# Seconds to wait for one job, queueing included
+SERVICE_TIMEOUT = float(os.getenv("SERVICE_TIMEOUT", 300))
+POLL_INTERVAL_MIN = 0.1
+POLL_INTERVAL_MAX = 1.0
+
+_results = LRUCache(max_bytes=int(os.getenv("SERVICE_CLIENT_CACHE_MAX_BYTES", 32 * 1024 * 1024)))
+_next_url = itertools.cycle(range(max(len(SERVICE_URLS), 1)))
+_http = None
+_http_lock = threading.Lock()
+
+
+class ServiceError(RuntimeError):
+    pass
+
+
+def _client():
+    """One keep-alive HTTP client per process (httpx comes with google-genai)."""
+    global _http
+    if _http is None:
+        with _http_lock:
+            if _http is None:
+                import httpx
+                _http = httpx.Client(timeout=30)
+    return _http
+
+
+def _request(method: str, url: str, **kwargs) -> tuple[int, dict]:
+    """
+    (status code, JSON body). An unreachable or timed-out service and a
+    non-JSON answer (e.g. a proxy's 502 page) raise ServiceError, so callers
+    only ever have that one error to handle.
+    """
+    import httpx
+    try:
+        response = _client().request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        raise ServiceError(f"Dienst nicht erreichbar ({url}): {type(e).__name__}: {e}") from e
+    try:
+        return response.status_code, response.json()
+    except ValueError:
+        raise ServiceError(f"Dienst antwortet mit HTTP {response.status_code}: {response.text[:200]}") from None
+
+
+def _submit(kind: str, payload: dict) -> tuple[str, str]:
+    """Returns (service url, job id); tries every service before giving up on full or unreachable ones."""
+    if not SERVICE_URLS:
+        raise ServiceError("BEWERBUNGSBOT_SERVICE_URL ist nicht gesetzt")
+    last_error = None
+    for _ in SERVICE_URLS:
+        url = SERVICE_URLS[next(_next_url)]
+        try:
+            status_code, body = _request("POST", f"{url}/jobs", json={"kind": kind, **payload})
+        except ServiceError as e:
+            last_error = str(e)
+            continue
+        if status_code == 202:
+            return url, body["id"]
+        last_error = body.get("error", f"HTTP {status_code}")
+        if status_code != 503:
+            break
+    raise ServiceError(last_error)
+
+
+def run_job(kind: str, payload: dict, timeout: float = SERVICE_TIMEOUT) -> dict:
+    """Submits a job to service.py and waits for its result. Every failure is a ServiceError."""
+    url, job_id = _submit(kind, payload)
+    deadline = time.monotonic() + timeout
+    interval = POLL_INTERVAL_MIN
+    while True:
+        status_code, job = _request("GET", f"{url}/jobs/{job_id}")
+        if status_code != 200:
+            raise ServiceError(job.get("error", f"HTTP {status_code}"))
+        if job["status"] == "done":
+            return job["result"]
+        if job["status"] == "failed":
+            raise ServiceError(job["error"])
+        if time.monotonic() + interval > deadline:
+            raise ServiceError(f"Auftrag {kind} nach {timeout:.0f} s nicht fertig")
+        time.sleep(interval)
+        interval = min(interval * 1.5, POLL_INTERVAL_MAX)
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+# ─────────────────────────────────────────────
+# EXTRACTION (cv_extractor) — errors as "⚠️" text, like the local function
+# ─────────────────────────────────────────────
+def extract_cv_text(uploaded_file) -> str:
+    if uploaded_file is None:
+        return None
+    file_bytes = uploaded_file.read()
+    key = f"extract-{os.path.splitext(uploaded_file.name.lower())[1]}-{content_hash(file_bytes)}"
+    text = _results.get(key)
+    if text is None:
+        try:
+            text = run_job("extract", {"filename": uploaded_file.name, "data": _encode(file_bytes)})["text"]
+        except ServiceError as e:
+            # Not memoized: the next rerun asks the service again
+            return f"⚠️ Could not extract text: {e}"
+        _results.set(key, text)
+    return text
+
+
+# ─────────────────────────────────────────────
+# GENERATION (generator) — errors as "❌" text, like the local functions
+# ─────────────────────────────────────────────
+def _profile_payload(profile: UserProfile, regenerate: bool, **extra) -> dict:
+    return {"profile": profile.model_dump(), "regenerate": regenerate, **extra}
+
+
+def _cv_from_result(cv) -> Union[str, GeneratedCV]:
+    return cv if isinstance(cv, str) else GeneratedCV.model_validate(cv)
+
+
+def generate_cv(profile: UserProfile, regenerate: bool = False,
+                structured: bool = False) -> Union[str, GeneratedCV]:
+    try:
+        result = run_job("cv", _profile_payload(profile, regenerate, structured=structured))
+        return _cv_from_result(result["cv"])
+    except Exception as e:
+        return f"❌ Fehler bei der CV-Generierung: {str(e)}"
+
+
+def generate_cover_letter(profile: UserProfile, regenerate: bool = False) -> str:
+    try:
+        return run_job("cover_letter", _profile_payload(profile, regenerate))["cover_letter"]
+    except Exception as e:
+        return f"❌ Fehler beim Anschreiben: {str(e)}"
+
+
+def generate_application(profile: UserProfile, regenerate: bool = False,
+                         structured: bool = False) -> tuple[Union[str, GeneratedCV], str]:
+    try:
+        result = run_job("application", _profile_payload(profile, regenerate, structured=structured))
+        return _cv_from_result(result["cv"]), result["cover_letter"]
+    except Exception as e:
+        return f"❌ Fehler bei der CV-Generierung: {str(e)}", f"❌ Fehler beim Anschreiben: {str(e)}"
+
+
+def generate_cv_stream(profile: UserProfile, regenerate: bool = False):
+    yield generate_cv(profile, regenerate=regenerate)
+
+
+def generate_cover_letter_stream(profile: UserProfile, regenerate: bool = False):
+    yield generate_cover_letter(profile, regenerate=regenerate)
+
+
+def generate_application_stream(profile: UserProfile, regenerate: bool = False):
+    cv, cover_letter = generate_application(profile, regenerate=regenerate)
+    yield "cv", cv
+    yield "cover_letter", cover_letter
+
+
+# ─────────────────────────────────────────────
+# RENDERING (document_builder, pdf_builder) — a failed job raises
+# ServiceError; app.py shows it instead of the download buttons
+# ─────────────────────────────────────────────
+def _render(file_format: str, full_name: str, cv=None, cover_letter=None, photo: bytes = None) -> dict:
+    """{"cv": bytes, "cover_letter": bytes} for the documents given; each memoized on its own."""
+    from document_model import document_hash
+
+    name_hash = content_hash(full_name.encode("utf-8"))
+    keys = {}
+    if cv is not None:
+        keys["cv"] = "|".join([file_format, "cv", document_hash(cv), name_hash,
+                               content_hash(photo) if photo else "none"])
+    if cover_letter is not None:
+        keys["cover_letter"] = "|".join([file_format, "cl", document_hash(cover_letter), name_hash])
+    documents = {name: _results.get(key) for name, key in keys.items()}
+    missing = [name for name, document in documents.items() if document is None]
+    if not missing:
+        return documents
+
+    payload = {"format": file_format, "full_name": full_name}
+    if "cv" in missing:
+        payload["cv"] = cv.model_dump()
+        if photo:
+            payload["photo"] = _encode(photo)
+    if "cover_letter" in missing:
+        payload["cover_letter"] = cover_letter.model_dump()
+    for name, data in run_job("render", payload).items():
+        documents[name] = base64.b64decode(data)
+        _results.set(keys[name], documents[name])
+    return documents
+
+
+def cv_document_bytes(cv, full_name: str, photo: bytes = None) -> bytes:
+    return _render("docx", full_name, cv=cv, photo=photo)["cv"]
+
+
+def cover_letter_document_bytes(cover_letter, full_name: str) -> bytes:
+    return _render("docx", full_name, cover_letter=cover_letter)["cover_letter"]
+
+
+def create_application_documents(cv, cover_letter, full_name: str, photo: bytes = None) -> tuple[bytes, bytes]:
+    documents = _render("docx", full_name, cv=cv, cover_letter=cover_letter, photo=photo)
+    return documents["cv"], documents["cover_letter"]
+
+
+def cv_pdf_bytes(cv, full_name: str, photo: bytes = None) -> bytes:
+    return _render("pdf", full_name, cv=cv, photo=photo)["cv"]
+
+
+def cover_letter_pdf_bytes(cover_letter, full_name: str) -> bytes:
+    return _render("pdf", full_name, cover_letter=cover_letter)["cover_letter"]
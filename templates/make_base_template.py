@@ -0,0 +1,94 @@
+# templates/make_base_template.py
+# Writes templates/base.docx — the document both builders in
+# document_builder.py start from: A4 page with DIN 5008 margins, Arial as
+# the default font and the named styles the builders reference instead of
+# formatting every run by hand.
+#
+# base.docx is shipped with the repo, so the look can also be tweaked in
+# Word directly. Rerun this script after changing the styles below and bump
+# document_builder.TEMPLATE_VERSION.
+#
+# Usage:  python templates/make_base_template.py
+
+import os
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt, Cm, RGBColor
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "base.docx")
+
+DARK_BLUE = RGBColor(0x1F, 0x35, 0x64)
+
+# name: (base style, size pt, bold, color, space before pt, space after pt)
+PARAGRAPH_STYLES = {
+    "CV Name": ("Normal", 16, True, DARK_BLUE, 0, 0),
+    "CV Abschnitt": ("Normal", 11, True, DARK_BLUE, 6, 0),
+    "CV Datum": ("Normal", 10, False, None, 0, 2),
+    "CV Text": ("Normal", 10, False, None, 0, 2),
+    "CV Aufzählung": ("List Bullet", 10, False, None, 0, 2),
+    "Anschreiben Text": ("Normal", 10.5, False, None, 0, 6),
+    "Anschreiben Betreff": ("Normal", 11, True, None, 12, 6),
+}
+
+# name: (size pt, color)
+CHARACTER_STYLES = {
+    "Foto Platzhalter": (8, RGBColor(0xCC, 0xCC, 0xCC)),
+}
+
+TABLE_STYLE = "CV Tabelle"
+
+
+def _add_borderless_table_style(doc) -> None:
+    style = doc.styles.add_style(TABLE_STYLE, WD_STYLE_TYPE.TABLE)
+    tblPr = OxmlElement("w:tblPr")
+    tblBorders = OxmlElement("w:tblBorders")
+    for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
+        edge_el = OxmlElement(f"w:{edge}")
+        edge_el.set(qn("w:val"), "nil")
+        tblBorders.append(edge_el)
+    tblPr.append(tblBorders)
+    style.element.append(tblPr)
+
+
+def create_base_template() -> Document:
+    doc = Document()
+
+    # DIN 5008 margins (2.5cm all around except 2cm right), A4
+    for section in doc.sections:
+        section.top_margin = Cm(2.5)
+        section.bottom_margin = Cm(2.5)
+        section.left_margin = Cm(2.5)
+        section.right_margin = Cm(2.0)
+        section.page_height = Cm(29.7)
+        section.page_width = Cm(21.0)
+
+    normal = doc.styles["Normal"]
+    normal.font.name = "Arial"
+    normal.font.size = Pt(10)
+
+    for name, (base, size, bold, color, before, after) in PARAGRAPH_STYLES.items():
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = doc.styles[base]
+        style.quick_style = True
+        style.font.size = Pt(size)
+        style.font.bold = bold
+        if color is not None:
+            style.font.color.rgb = color
+        style.paragraph_format.space_before = Pt(before)
+        style.paragraph_format.space_after = Pt(after)
+
+    for name, (size, color) in CHARACTER_STYLES.items():
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+        style.font.size = Pt(size)
+        style.font.color.rgb = color
+
+    _add_borderless_table_style(doc)
+    return doc
+
+
+if __name__ == "__main__":
+    create_base_template().save(TEMPLATE_PATH)
+    print(f"✅ {TEMPLATE_PATH}")
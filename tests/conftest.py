@@ -0,0 +1,21 @@
+# tests/conftest.py
+# The modules live at the repo root, next to app.py — make them importable
+# no matter where pytest is started from.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gemini_client  # noqa: E402
+
+
+@pytest.fixture
+def fast_gemini(monkeypatch):
+    """Shared Gemini manager without backoff sleeps or circuit breaker, also for configure() calls."""
+    monkeypatch.setattr(gemini_client, "_shared", None)  # restored afterwards
+    monkeypatch.setenv("GEMINI_BACKOFF_BASE", "0")
+    monkeypatch.setenv("GEMINI_BREAKER_THRESHOLD", "0")
+    return gemini_client.configure()
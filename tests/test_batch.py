@@ -0,0 +1,142 @@
+# tests/test_batch.py
+# batch.py end to end against fake_gemini.FakeClient — no API key, no quota.
+
+import json
+import sys
+
+import pytest
+
+import batch
+import generator
+from fake_gemini import FakeClient
+
+BASE_PROFILE = {
+    "full_name": "Max Mustermann",
+    "date_of_birth": "01.01.1990",
+    "nationality": "deutsch",
+    "city": "Berlin",
+    "email": "max@example.de",
+    "phone": "+49 30 123456",
+    "university": "TU Dresden",
+    "degree": "M.Sc. Bauingenieurwesen",
+    "software_skills": ["Revit", "Navisworks"],
+    "target_job_title": "BIM Manager",
+    "target_company": "Musterbau GmbH",
+}
+
+JOB_ADS = {
+    "bim-manager": "Wir suchen einen BIM Manager (m/w/d) mit Revit und ISO 19650.",
+    "bim-koordinator": "BIM Koordinator für Kollisionsprüfung mit Navisworks und IFC.",
+}
+
+
+@pytest.fixture
+def jobs():
+    return [batch.BatchJob(id=job_id, job_ad_text=text) for job_id, text in JOB_ADS.items()]
+
+
+def _run(jobs, out_dir, client, **kwargs):
+    kwargs.setdefault("requests_per_minute", 0)
+    return batch.run_batch(BASE_PROFILE, jobs, str(out_dir), gemini_client=client,
+                           progress=lambda message: None, **kwargs)
+
+
+def test_manifest_records_status_score_and_tokens(fast_gemini, jobs, tmp_path):
+    _run(jobs, tmp_path, FakeClient())
+
+    manifest = json.loads((tmp_path / batch.MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert set(manifest["jobs"]) == set(JOB_ADS)
+    for entry in manifest["jobs"].values():
+        assert isinstance(entry["match_score"], float)
+        for document in batch.DOCUMENTS:
+            assert entry[document]["status"] == "done"
+            assert (tmp_path / entry[document]["file"]).is_file()
+            assert entry[document]["tokens"]["prompt"] > 0
+            assert entry[document]["tokens"]["output"] > 0
+
+
+def test_rerun_skips_existing_documents(fast_gemini, jobs, tmp_path):
+    _run(jobs, tmp_path, FakeClient())
+    first = json.loads((tmp_path / batch.MANIFEST_NAME).read_text(encoding="utf-8"))
+
+    client = FakeClient()
+    _run(jobs, tmp_path, client)
+
+    assert client.calls == 0
+    second = json.loads((tmp_path / batch.MANIFEST_NAME).read_text(encoding="utf-8"))
+    for job_id in JOB_ADS:
+        for document in batch.DOCUMENTS:
+            assert second["jobs"][job_id][document] == first["jobs"][job_id][document]
+
+
+def test_regenerate_redoes_existing_documents(fast_gemini, jobs, tmp_path):
+    _run(jobs, tmp_path, FakeClient())
+
+    client = FakeClient()
+    _run(jobs, tmp_path, client, regenerate=True)
+
+    assert client.calls == len(JOB_ADS) * len(batch.DOCUMENTS)
+
+
+def test_injected_429s_are_retried_and_counted(fast_gemini, jobs, tmp_path):
+    # One worker keeps the seeded error sequence in a fixed order
+    client = FakeClient(error_rate=0.5, seed=0)
+    results = _run(jobs, tmp_path, client, concurrency=1, max_retries=5)
+
+    entries = [results[job_id][document] for job_id in JOB_ADS for document in batch.DOCUMENTS]
+    assert all(entry["status"] == "done" for entry in entries)
+    assert sum(entry["attempts"] for entry in entries) == client.calls
+    assert any(entry["attempts"] > 1 for entry in entries)
+
+
+def test_exhausted_retries_mark_the_task_failed(fast_gemini, jobs, tmp_path):
+    client = FakeClient(error_rate=1.0)
+    job = jobs[0]
+    out_path = tmp_path / "Lebenslauf.docx"
+
+    entry = batch._run_task(job, "cv", batch.profile_for_job(BASE_PROFILE, job), str(out_path),
+                            batch.RateLimiter(0), max_retries=2, regenerate=False,
+                            gemini_client=client, photo=None)
+
+    assert entry["status"] == "failed"
+    assert "429" in entry["error"]
+    assert client.calls == 3
+    assert not out_path.exists()
+
+
+def _main(monkeypatch, *argv: str) -> int:
+    monkeypatch.setattr(sys, "argv", ["batch.py", *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main()
+    return exit_info.value.code
+
+
+def test_main_dry_run_resumes_and_never_counts_for_a_real_run(fast_gemini, tmp_path, monkeypatch, capsys):
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps(BASE_PROFILE), encoding="utf-8")
+    jobs_dir = tmp_path / "stellen"
+    jobs_dir.mkdir()
+    for job_id, text in JOB_ADS.items():
+        (jobs_dir / f"{job_id}.txt").write_text(text, encoding="utf-8")
+    out_dir = tmp_path / "bewerbungen"
+    args = ("--profile", str(profile_path), "--jobs", str(jobs_dir), "--out", str(out_dir), "--rpm", "0")
+    n_documents = len(JOB_ADS) * len(batch.DOCUMENTS)
+
+    assert _main(monkeypatch, *args, "--dry-run") == 0
+    dry_run_dir = out_dir / batch.DRY_RUN_DIR
+    assert len(list(dry_run_dir.glob("*/*.docx"))) == n_documents
+    assert not (out_dir / batch.MANIFEST_NAME).exists()
+
+    capsys.readouterr()
+    assert _main(monkeypatch, *args, "--dry-run") == 0
+    assert capsys.readouterr().out.count("exists, skipped") == n_documents
+
+    # The real run (the shared client, here a fake one) generates everything
+    client = FakeClient()
+    monkeypatch.setattr(generator, "client", client)
+    assert _main(monkeypatch, *args) == 0
+    assert "exists, skipped" not in capsys.readouterr().out
+    assert client.calls == n_documents
+    manifest = json.loads((out_dir / batch.MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert all(entry[document]["status"] == "done"
+               for entry in manifest["jobs"].values() for document in batch.DOCUMENTS)
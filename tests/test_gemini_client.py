@@ -0,0 +1,78 @@
+# tests/test_gemini_client.py
+# Concurrency slots of the shared manager must come back as soon as a
+# stream is abandoned, or other sessions wait until their deadline.
+
+import itertools
+import time
+
+import gemini_client
+import generator
+from fake_gemini import FakeClient, FakeResponse
+from models import UserProfile
+
+PROFILE = UserProfile(
+    full_name="Max Mustermann", date_of_birth="01.01.1990", nationality="deutsch", city="Berlin",
+    email="max@example.de", phone="+49 30 123456", university="TU Dresden",
+    degree="M.Sc. Bauingenieurwesen", target_job_title="BIM Manager",
+    target_company="Musterbau GmbH", job_ad_text="BIM Manager (m/w/d) mit Revit und ISO 19650",
+)
+
+
+class EndlessStreamClient:
+    """Streams a chunk every 10 ms until the stream is closed — an answer that never ends."""
+
+    def __init__(self):
+        self.models = self
+
+    def generate_content_stream(self, model: str, contents: str, config=None):
+        for i in itertools.count():
+            time.sleep(0.01)
+            yield FakeResponse(f"Absatz {i}. ")
+
+
+def _acquire_all_slots(manager, timeout: float) -> bool:
+    acquired = 0
+    try:
+        for _ in range(manager.settings.max_concurrency):
+            if not manager._slots.acquire(timeout=timeout):
+                return False
+            acquired += 1
+        return True
+    finally:
+        for _ in range(acquired):
+            manager._slots.release()
+
+
+def test_closed_stream_releases_its_slot(fast_gemini):
+    manager = gemini_client.configure(max_concurrency=2)
+    stream = manager.generate_content_stream(EndlessStreamClient(), model="m", contents="Anschreiben")
+    next(stream)
+    assert not _acquire_all_slots(manager, timeout=0)
+
+    stream.close()
+
+    assert _acquire_all_slots(manager, timeout=0)
+
+
+def test_abandoned_application_stream_stops_its_producers(fast_gemini, monkeypatch):
+    manager = gemini_client.configure(max_concurrency=2)
+    monkeypatch.setattr(generator, "client", EndlessStreamClient())
+
+    chunks = generator.generate_application_stream(PROFILE, regenerate=True)
+    next(chunks)
+    chunks.close()
+
+    assert _acquire_all_slots(manager, timeout=5)
+
+
+def test_bounded_queue_still_delivers_every_chunk(fast_gemini, monkeypatch):
+    gemini_client.configure(max_concurrency=2)
+    monkeypatch.setattr(generator, "client", FakeClient(stream_chunk_chars=2))
+
+    texts = {"cv": "", "cover_letter": ""}
+    for key, chunk in generator.generate_application_stream(PROFILE, regenerate=True):
+        texts[key] += chunk
+        time.sleep(0.001)  # slower than the producers
+
+    assert texts["cv"] == "".join(generator.generate_cv_stream(PROFILE, regenerate=True))
+    assert len(texts["cv"]) // 2 > generator.STREAM_QUEUE_SIZE
@@ -0,0 +1,42 @@
+# tests/test_ingest.py
+# ingest.py on a small folder of CVs, extracted in this process (workers=1).
+
+import io
+import json
+
+from docx import Document
+
+import ingest
+
+
+def _docx(text: str) -> bytes:
+    document = Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _lines(out_path) -> dict:
+    with open(out_path, encoding="utf-8") as f:
+        return {entry["source"]: entry for entry in map(json.loads, f)}
+
+
+def test_legacy_doc_is_skipped_not_failed(tmp_path):
+    folder = tmp_path / "cvs"
+    folder.mkdir()
+    (folder / "mustermann.docx").write_bytes(_docx("BIM Koordinator, Revit, ISO 19650"))
+    # Word 97 files start with the OLE2 compound file signature, not "PK"
+    (folder / "alt.doc").write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 512)
+    out_path = tmp_path / "cvs.jsonl"
+
+    counts = ingest.ingest(str(folder), str(out_path), workers=1, progress=lambda message: None)
+
+    assert counts == {"done": 1, "empty": 0, "failed": 0, "skipped": 1, "already": 0}
+    lines = _lines(out_path)
+    assert lines["alt.doc"]["status"] == "skipped"
+    assert lines["alt.doc"]["error"] == "Format nicht unterstützt"
+    assert "Revit" in lines["mustermann.docx"]["text"]
+
+    counts = ingest.ingest(str(folder), str(out_path), workers=1, progress=lambda message: None)
+    assert counts["already"] == 2
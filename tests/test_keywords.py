@@ -0,0 +1,40 @@
+# tests/test_keywords.py
+
+import pytest
+
+from keywords import AEC_KEYWORDS, AEC_MATCHER, METHOD, KeywordMatcher
+
+
+def test_acronyms_only_match_in_upper_case():
+    text = "Bitte log dich ein; die ids und acc-Zugänge kommen per Mail, 4d-Kino inklusive."
+
+    assert AEC_MATCHER.terms(text) == []
+
+
+def test_acronyms_match_as_written_in_job_ads():
+    text = "Prüfregeln als IDS, Modelle in LOG 300 auf ACC, 4D-Simulation, Vergabe nach VOB/B."
+
+    assert set(AEC_MATCHER.terms(text)) == {
+        "IDS", "LOIN", "BIM 360", "4D/5D-Planung", "Ausschreibung und Vergabe", "VOB",
+    }
+
+
+def test_other_terms_stay_case_insensitive():
+    assert set(AEC_MATCHER.terms("bim-koordination mit REVIT und navisworks")) == {
+        "BIM Koordinator", "Revit", "Navisworks",
+    }
+
+
+def test_every_variant_maps_back_to_its_own_term():
+    for term, spec in AEC_KEYWORDS.items():
+        for variant in [term, *spec["variants"]]:
+            matches = AEC_MATCHER.scan(variant)
+            assert [(m.term, m.positions) for m in matches] == [(term, [(0, len(variant))])], variant
+
+
+def test_a_variant_shared_by_two_terms_is_rejected():
+    with pytest.raises(ValueError, match="Modellprüfung"):
+        KeywordMatcher({
+            "Modellprüfung": {"category": METHOD, "variants": ["Qualitätssicherung"]},
+            "Qualitätsmanagement": {"category": METHOD, "variants": ["Qualitäts-Sicherung"]},
+        })
@@ -0,0 +1,115 @@
+# tests/test_ocr.py
+# The OCR fallback is optional and best effort: a page it can't read stays
+# empty instead of failing the whole extraction. Tesseract itself is faked.
+
+import io
+
+import pytest
+from fpdf import FPDF
+from PIL import Image
+
+import cv_extractor
+import ocr
+
+
+def _pdf(*pages: str) -> bytes:
+    """One page per string; "" is a page without a text layer."""
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=11)
+    for text in pages:
+        pdf.add_page()
+        if text:
+            pdf.cell(text=text)
+    return bytes(pdf.output())
+
+
+def _scanned_pdf(n_pages: int) -> bytes:
+    """Image-only pages, like a scanner's output."""
+    pdf = FPDF()
+    for page in range(n_pages):
+        scan = io.BytesIO()
+        Image.new("L", (60, 80), color=200 + page).save(scan, format="PNG")
+        pdf.add_page()
+        pdf.image(scan, x=0, y=0, w=210, h=297)
+    return bytes(pdf.output())
+
+
+@pytest.fixture
+def fake_tesseract(monkeypatch):
+    """OCR 'available'; page 2 fails like a damaged page, every other page reads 'OCR <n>'."""
+    def fake_ocr_page(file_bytes, page, dpi=ocr.OCR_DPI, languages=None):
+        if page == 2:
+            raise RuntimeError("pdfium: failed to render page")
+        return f"OCR {page}", 0.01, dpi
+
+    monkeypatch.setattr(ocr, "ocr_languages", lambda: "deu")
+    monkeypatch.setattr(ocr, "ocr_page", fake_ocr_page)
+    monkeypatch.setattr(ocr, "_ocr_cache", ocr.LRUCache(max_bytes=1024 * 1024))
+
+
+def test_failed_page_is_left_empty(fake_tesseract):
+    results = ocr.ocr_pages(_pdf("", "", ""), [1, 2, 3], workers=1)
+
+    assert [(result.page, result.text) for result in results] == [(1, "OCR 1"), (2, ""), (3, "OCR 3")]
+
+
+def test_failed_page_keeps_the_rest_of_the_pdf(fake_tesseract):
+    text = cv_extractor.extract_text_from_pdf(_pdf("Lebenslauf Max Mustermann", "", ""), ocr_workers=1)
+
+    assert text.splitlines() == ["Lebenslauf Max Mustermann", "OCR 3"]
+
+
+@pytest.mark.parametrize("with_ocr", [False, True])
+def test_pages_after_the_blank_streak_are_not_parsed(with_ocr, monkeypatch):
+    import pdfplumber.page
+
+    parsed = []
+    extract_text = pdfplumber.page.Page.extract_text
+
+    def counting_extract_text(page, *args, **kwargs):
+        parsed.append(page.page_number)
+        return extract_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_text", counting_extract_text)
+    monkeypatch.setattr(ocr, "ocr_languages", lambda: "deu" if with_ocr else "")
+    monkeypatch.setattr(ocr, "ocr_page", lambda file_bytes, page, dpi, languages: ("", 0.0, dpi))
+
+    text = cv_extractor.extract_text_from_pdf(
+        _pdf("Lebenslauf", "", "", "Zeugnis", "Zeugnis"), stop_after_blank_pages=2, ocr_workers=1
+    )
+
+    assert text == "Lebenslauf"
+    assert parsed == [1, 2, 3]
+
+
+def test_scanned_pdf_is_read_despite_the_blank_page_stop(fake_tesseract, monkeypatch):
+    monkeypatch.setattr(ocr, "ocr_page", lambda file_bytes, page, dpi, languages: (f"Scan {page}", 0.01, dpi))
+
+    text = cv_extractor.extract_text_from_pdf(_scanned_pdf(5), stop_after_blank_pages=2, ocr_workers=1)
+
+    assert text.splitlines() == ["Scan 1", "Scan 2", "Scan 3", "Scan 4", "Scan 5"]
+
+
+def test_blank_page_stop_still_applies_to_pages_ocr_cannot_read(fake_tesseract, monkeypatch):
+    # Pages 3 and 4 stay blank even after OCR (e.g. empty scanned backsides)
+    def fake_ocr_page(file_bytes, page, dpi, languages):
+        return ("" if page in (3, 4) else f"Scan {page}"), 0.01, dpi
+
+    monkeypatch.setattr(ocr, "ocr_page", fake_ocr_page)
+
+    text = cv_extractor.extract_text_from_pdf(_scanned_pdf(6), stop_after_blank_pages=2, ocr_workers=1)
+
+    assert text.splitlines() == ["Scan 1", "Scan 2"]
+
+
+def test_installing_ocr_invalidates_the_cached_warning(monkeypatch):
+    monkeypatch.setattr(cv_extractor, "_text_cache", cv_extractor.LRUCache(max_bytes=1024 * 1024))
+    monkeypatch.setattr(ocr, "_ocr_cache", ocr.LRUCache(max_bytes=1024 * 1024))
+    monkeypatch.setattr(ocr, "ocr_page", lambda file_bytes, page, dpi, languages: ("Scan", 0.01, dpi))
+    scanned = _scanned_pdf(1)
+
+    monkeypatch.setattr(ocr, "ocr_languages", lambda: "")
+    assert cv_extractor.extract_text(scanned, "cv.pdf").startswith("⚠️")
+
+    monkeypatch.setattr(ocr, "ocr_languages", lambda: "deu")
+    assert cv_extractor.extract_text(scanned, "cv.pdf") == "Scan"
@@ -0,0 +1,62 @@
+# tests/test_pdf_builder.py
+# Text must stay inside its column, even a word wider than the column.
+
+import io
+
+import pdfplumber
+
+import pdf_builder
+from document_model import parse_cover_letter_text, parse_cv_text
+
+LONG_WORD = "Grundstücksverkehrsgenehmigungszuständigkeitsübertragungsver"  # 60 characters
+MM = 72 / 25.4
+
+
+def _chars(pdf_bytes: bytes) -> list[dict]:
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return [char for page in pdf.pages for char in page.chars]
+
+
+def _text(chars: list[dict]) -> str:
+    return "".join(char["text"] for char in chars)
+
+
+def test_long_word_is_split_inside_the_cv_content_column():
+    assert len(LONG_WORD) == 60
+    cv = parse_cv_text(
+        "**BERUFSERFAHRUNG**\n"
+        f"01/2020 – 12/2021 | **BIM Koordinator**, Musterbau GmbH\n"
+        f"• Zuständig für {LONG_WORD} und https://example.de/{LONG_WORD}\n"
+    )
+    chars = _chars(pdf_builder.render_cv_pdf(cv, "Max Mustermann"))
+
+    content_left = (pdf_builder.LEFT_MARGIN + pdf_builder.DATE_COLUMN_WIDTH) * MM
+    content_right = content_left + pdf_builder.CONTENT_COLUMN_WIDTH * MM
+    body = [char for char in chars if char["top"] > (pdf_builder.TOP_MARGIN + 20) * MM]
+    content = [char for char in body if char["x0"] >= content_left - 0.5]
+    assert content
+    assert max(char["x1"] for char in content) <= content_right + 0.5
+    assert _text(content).count(LONG_WORD[:20]) == 2
+    # Nothing spills left into the date column either
+    date_column = [char for char in body if char["x0"] < content_left - 0.5]
+    assert LONG_WORD[:5] not in _text(date_column)
+
+
+def test_long_word_is_split_inside_the_letter_margins():
+    letter = parse_cover_letter_text(f"Sehr geehrte Damen und Herren,\n\n{LONG_WORD * 3}\n")
+    chars = _chars(pdf_builder.render_cover_letter_pdf(letter, "Max Mustermann"))
+
+    right = (210 - pdf_builder.RIGHT_MARGIN) * MM
+    assert max(char["x1"] for char in chars) <= right + 0.5
+    assert min(char["x0"] for char in chars) >= pdf_builder.LEFT_MARGIN * MM - 0.5
+    assert (LONG_WORD * 3) in _text(chars)
+
+
+def test_break_lines_splits_only_what_doesnt_fit():
+    lines = pdf_builder._break_lines(parse_cover_letter_text(f"kurz {LONG_WORD} kurz").paragraphs[0].spans,
+                                     10, 40.0, False)
+
+    texts = ["".join(text for text, _ in line) for line in lines]
+    assert texts[0].strip() == "kurz"
+    assert "".join(texts).replace(" ", "") == f"kurz{LONG_WORD}kurz"
+    assert all(pdf_builder._text_width(text.rstrip(), False, 10) <= 40.0 for text in texts)
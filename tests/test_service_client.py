@@ -0,0 +1,74 @@
+# tests/test_service_client.py
+# The thin client must turn a down or misbehaving service into ServiceError
+# (rendering) or "⚠️" text (extraction) — never into a raw httpx/JSON error.
+
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import service_client
+from document_model import parse_cover_letter_text
+
+
+class _BadGateway(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = b"<html>502 Bad Gateway</html>"
+        self.send_response(502)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def bad_gateway():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BadGateway)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def unreachable():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BadGateway)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.server_close()  # nothing listens on this port any more
+    return url
+
+
+def _upload(name: str, data: bytes):
+    uploaded = io.BytesIO(data)
+    uploaded.name = name
+    return uploaded
+
+
+@pytest.mark.parametrize("service", ["unreachable", "bad_gateway"])
+def test_extraction_failure_is_warning_text(service, request, monkeypatch):
+    monkeypatch.setattr(service_client, "SERVICE_URLS", [request.getfixturevalue(service)])
+
+    text = service_client.extract_cv_text(_upload("cv.pdf", f"%PDF {service}".encode()))
+
+    assert text.startswith("⚠️")
+
+
+@pytest.mark.parametrize("service", ["unreachable", "bad_gateway"])
+def test_render_failure_is_service_error(service, request, monkeypatch):
+    monkeypatch.setattr(service_client, "SERVICE_URLS", [request.getfixturevalue(service)])
+    cover_letter = parse_cover_letter_text(f"Sehr geehrte Damen und Herren,\n\n{service}")
+
+    with pytest.raises(service_client.ServiceError):
+        service_client.cover_letter_document_bytes(cover_letter, "Max Mustermann")
+
+
+def test_unreachable_service_falls_through_to_the_next(unreachable, bad_gateway, monkeypatch):
+    monkeypatch.setattr(service_client, "SERVICE_URLS", [unreachable, bad_gateway])
+    monkeypatch.setattr(service_client, "_next_url", iter([0, 1]))
+
+    with pytest.raises(service_client.ServiceError, match="HTTP 502"):
+        service_client.run_job("extract", {})